@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+"""
+Benchmarks the quote aware tokenizer against the space splitter it replaced and shlex.
+
+Run from the repository root: python scripts/benchmark_tokenizer.py
+"""
+import shlex
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from slash_slack.tokenizer import _tokenize  # noqa: E402
+
+CASES = {
+    "short": "deploy api production 3",
+    "apostrophe": "remind me that it's bob's turn to deploy",
+    "quoted": "ticket create \"Login page is broken\" high 'web team'",
+    "smart quotes": "ticket create “Login page is broken” high ‘web team’",
+    "escaped": 'echo a\\ b \\"c\\" "d \\"e\\""',
+    "1000 numbers": " ".join(str(i) for i in range(1000)),
+    "100 quoted": " ".join(f'"arg {i}"' for i in range(100)),
+}
+
+
+def _split(text: str):
+    return [arg for arg in text.split(" ") if arg != ""]
+
+
+def _shlex(text: str):
+    try:
+        return shlex.split(text)
+    except ValueError:
+        return None
+
+
+def _time(func, text: str) -> float:
+    timer = timeit.Timer(lambda: func(text))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=5, number=number)) / number * 1e6
+
+
+def main():
+    print(f"{'case':<14} {'split (us)':>12} {'_tokenize (us)':>15} {'shlex (us)':>12}")
+    for name, text in CASES.items():
+        print(
+            f"{name:<14} {_time(_split, text):>12.2f} {_time(_tokenize, text):>15.2f} {_time(_shlex, text):>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
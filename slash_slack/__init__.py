@@ -1,3 +1,13 @@
-from .arg_functions import Enum, Flag, Float, Int, String, UnknownLengthList
+from .arg_functions import (
+    Enum,
+    Flag,
+    Float,
+    Int,
+    Option,
+    Regex,
+    String,
+    UnknownLengthList,
+)
+from .dependencies import Depends
 from .slash_slack import SlashSlack
 from .slash_slack_request import SlashSlackRequest
@@ -0,0 +1,197 @@
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import uuid
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import Any, Dict, Optional
+
+from slash_slack.tracing import Tracer
+
+_ACKNOWLEDGE_SPAN = "slash_slack.acknowledge"
+_EXECUTE_SPAN = "slash_slack.execute"
+_INTERACTIVITY_SPAN = "slash_slack.interactivity"
+_RECORD_ATTRIBUTES = {
+    "command",
+    "slash_command",
+    "user_id",
+    "team_id",
+    "outcome",
+    "status_code",
+}
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler which drops records instead of blocking or raising when the queue is full.
+    """
+
+    dropped: int = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _AccessLogEntry:
+    """
+    The access log record of a single request. Stage durations are in milliseconds.
+    """
+
+    __slots__ = ("request_id", "timestamp", "fields", "stages", "error")
+
+    def __init__(self):
+        self.request_id = uuid.uuid4().hex
+        self.timestamp = datetime.now(timezone.utc).isoformat()
+        self.fields: Dict[str, Any] = {}
+        self.stages: Dict[str, float] = {}
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        record = {
+            "request_id": self.request_id,
+            "timestamp": self.timestamp,
+            **self.fields,
+            "stages": self.stages,
+        }
+        if "function_execution" in self.stages:
+            record["execution_ms"] = self.stages["function_execution"]
+        if "delivery" in self.stages:
+            record["delivery_ms"] = self.stages["delivery"]
+        if self.error is not None:
+            record["error"] = self.error
+        return record
+
+
+class _AccessLogSpan:
+    __slots__ = ("name", "entry", "start")
+
+    def __init__(self, name: str, entry: _AccessLogEntry):
+        self.name = name
+        self.entry = entry
+        self.start = perf_counter()
+
+
+class AccessLog(Tracer):
+    """
+    Structured access log with one JSON record per request.
+
+    Each record has a `request_id`, the command, user and team ids, the outcome of the request, the acknowledgement latency (`ack_ms`),
+    the duration of every stage of the request (`stages`) and, for executed commands, the `execution_ms` and `delivery_ms`.
+    Records of executed commands are written once the response has been delivered, or once the execution was cancelled
+    (EX: while it was queued when the app shut down). Interactivity requests have a record of their own.
+
+    Records are handed to a queue and written by a background thread so that writing to `handler` never blocks the event loop.
+    The thread runs while the app is running, from `start` to `stop`.
+    When more than `max_queue_size` records are waiting to be written new records are dropped.
+    By default records are written to stdout. Each access log has a private logger named `logger_name`,
+    so several access logs (EX: one per app of a `host.SlashSlackHost`) only write to their own handler.
+
+    `sample_rates` maps command names to the fraction (0.0 - 1.0) of requests which are logged, commands not in `sample_rates` use `default_sample_rate`.
+    Requests which errored are always logged.
+    """
+
+    logger: logging.Logger
+    handler: logging.Handler
+    sample_rates: Dict[str, float]
+    default_sample_rate: float
+
+    def __init__(
+        self,
+        handler: Optional[logging.Handler] = None,
+        logger_name: str = "slash_slack.access",
+        sample_rates: Optional[Dict[str, float]] = None,
+        default_sample_rate: float = 1.0,
+        max_queue_size: int = 10000,
+    ):
+        self.handler = (
+            handler if handler is not None else logging.StreamHandler(sys.stdout)
+        )
+        self.sample_rates = sample_rates if sample_rates is not None else {}
+        self.default_sample_rate = default_sample_rate
+        self._queue: queue.Queue = queue.Queue(max_queue_size)
+        self._queue_handler = _DroppingQueueHandler(self._queue)
+        self._listener = logging.handlers.QueueListener(
+            self._queue, self.handler, respect_handler_level=True
+        )
+        self._listener_started = False
+        # Not registered with `logging.getLogger`, so it is not shared with other access logs.
+        self.logger = logging.Logger(logger_name, logging.INFO)
+        self.logger.addHandler(self._queue_handler)
+
+    @property
+    def dropped(self) -> int:
+        """
+        The number of records which were dropped because the queue was full.
+        """
+        return self._queue_handler.dropped
+
+    def start(self):
+        """
+        Starts the background writer thread. Called when the app starts.
+        """
+        if not self._listener_started:
+            self._listener.start()
+            self._listener_started = True
+
+    def stop(self):
+        """
+        Writes all queued records and stops the background writer thread. Called when the app shuts down.
+        """
+        if self._listener_started:
+            self._listener.stop()
+            self._listener_started = False
+
+    def start_span(
+        self,
+        name: str,
+        parent: Any = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> _AccessLogSpan:
+        entry = parent.entry if parent is not None else _AccessLogEntry()
+        span = _AccessLogSpan(name, entry)
+        if attributes:
+            self.set_attributes(span, attributes)
+        return span
+
+    def set_attributes(self, span: _AccessLogSpan, attributes: Dict[str, Any]):
+        for key, value in attributes.items():
+            if key in _RECORD_ATTRIBUTES:
+                span.entry.fields[key] = value
+
+    def end_span(self, span: _AccessLogSpan, error: Optional[BaseException] = None):
+        duration = round((perf_counter() - span.start) * 1000, 3)
+        entry = span.entry
+        if error is not None and entry.error is None:
+            entry.error = repr(error)
+            status_code = getattr(error, "status_code", None)
+            if status_code is not None:
+                entry.fields["status_code"] = status_code
+        if span.name == _ACKNOWLEDGE_SPAN:
+            entry.fields["ack_ms"] = duration
+            if entry.fields.get("outcome") != "scheduled" or error is not None:
+                self._emit(entry)
+        elif span.name == _EXECUTE_SPAN:
+            entry.fields["execute_ms"] = duration
+            self._emit(entry)
+        elif span.name == _INTERACTIVITY_SPAN:
+            entry.fields["ack_ms"] = duration
+            self._emit(entry)
+        else:
+            entry.stages[span.name] = round(
+                entry.stages.get(span.name, 0) + duration, 3
+            )
+
+    def _emit(self, entry: _AccessLogEntry):
+        if entry.error is None:
+            sample_rate = self.sample_rates.get(
+                entry.fields.get("command"), self.default_sample_rate
+            )
+            if sample_rate < 1.0 and random.random() >= sample_rate:
+                return
+        self.logger.info(json.dumps(entry.to_dict(), default=str))
@@ -1,4 +1,4 @@
-from typing import Any, Optional, Set
+from typing import Any, Optional, Pattern, Set, Union
 
 import slash_slack.arg_types as arg_types
 
@@ -29,17 +29,44 @@ def String(
     minimum_length: Optional[int] = None,
     maximum_length: Optional[int] = None,
     help: Optional[str] = None,
+    regex: Union[None, str, Pattern] = None,
 ) -> Any:
     """
     Input arg schema string type.
 
     If the only arg is of String type, then the string will contain the full body of the command.
+
+    If `regex` is given the whole string must match it.
     """
     return arg_types.StringType(
-        minimum_length=minimum_length, maximum_length=maximum_length, help=help
+        minimum_length=minimum_length,
+        maximum_length=maximum_length,
+        help=help,
+        regex=regex,
     )
 
 
+def Regex(
+    pattern: Union[str, Pattern],
+    groups: bool = False,
+    flags: int = 0,
+    help: Optional[str] = None,
+) -> Any:
+    """
+    Input arg type. Will validate that the whole input value matches the regex pattern.
+    The pattern is compiled once when the command is defined.
+
+    If `groups` is True the value is a dict of the named groups of the match instead of the matched text.
+
+    EX (ticket = Regex(r"(?P<project>[A-Z]+)-(?P<number>[0-9]+)", groups=True)):
+
+    command ABC-123
+
+    ticket = {'project': 'ABC', 'number': '123'}
+    """
+    return arg_types.RegexType(pattern=pattern, groups=groups, flags=flags, help=help)
+
+
 def Enum(values: Set[str], help: Optional[str] = None) -> Any:
     """
     Input arg enum type. Will validate that the input value is one of the given values.
@@ -48,7 +75,7 @@ def Enum(values: Set[str], help: Optional[str] = None) -> Any:
 
 
 def UnknownLengthList(
-    arg_type: arg_types.BaseArgType, help: Optional[str] = None
+    arg_type: arg_types.BaseArgType, help: Optional[str] = None, array: bool = False
 ) -> Any:
     """
     Input arg type. Will grow to encompass N # of space delimited args.
@@ -60,8 +87,11 @@ def UnknownLengthList(
     command a b c d
 
     l = ['a', 'b', 'c', 'd']
+
+    If `array` is True an Int or Float list is parsed in bulk into a compact array instead of a list
+    (a numpy array if numpy is installed, otherwise an `array.array`).
     """
-    return arg_types.UnknownLengthListType(arg_type=arg_type, help=help)
+    return arg_types.UnknownLengthListType(arg_type=arg_type, help=help, array=array)
 
 
 def Flag(help: Optional[str] = None) -> Any:
@@ -69,3 +99,25 @@ def Flag(help: Optional[str] = None) -> Any:
     Input flag arg. The value of which will be true or false depending on if `--<arg_name>` is found in the command body.
     """
     return arg_types.FlagType(help=help)
+
+
+def Option(
+    arg_type: Optional[arg_types.BaseArgType] = None,
+    default: Any = None,
+    help: Optional[str] = None,
+) -> Any:
+    """
+    Input named option. The value is given anywhere within the command body as `--<arg_name>=<value>` or `--<arg_name> <value>`
+    and parsed with `arg_type` (String by default). If the option is not given the value is `default`.
+
+    EX (limit = Option(Int(), default=10)):
+
+    command --limit=50
+
+    limit = 50
+    """
+    return arg_types.OptionType(
+        arg_type=arg_type if arg_type is not None else arg_types.StringType(),
+        default=default,
+        help=help,
+    )
@@ -1,5 +1,11 @@
+import array
+import re
 from abc import ABC, abstractmethod
-from typing import Any, Optional, Set
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Pattern, Set, Union
+
+from slash_slack.exceptions import InvalidArrayArgTypeException
+from slash_slack.tokenizer import _tokenize
 
 
 class BaseArgType(ABC):
@@ -18,6 +24,22 @@ class BaseArgType(ABC):
         pass
 
 
+@lru_cache(maxsize=None)
+def _compile_pattern(pattern: str, flags: int = 0) -> Pattern:
+    """
+    Compiles a regex pattern once. Arg types using the same pattern share the compiled matcher.
+    """
+    return re.compile(pattern, flags)
+
+
+def _get_pattern(pattern: Union[str, Pattern], flags: int = 0) -> Pattern:
+    if isinstance(pattern, re.Pattern):
+        if flags:
+            raise ValueError("cannot process flags argument with a compiled pattern")
+        return pattern
+    return _compile_pattern(pattern, flags)
+
+
 class FloatType(BaseArgType):
     help: Optional[str] = None
     minimum: Optional[float] = None
@@ -106,18 +128,19 @@ class StringType(BaseArgType):
     help: Optional[str] = None
     minimum_length: Optional[int] = None
     maximum_length: Optional[int] = None
-
-    # regex: Optional[str] = None
+    regex: Optional[Pattern] = None
 
     def __init__(
         self,
         help: Optional[str] = None,
         minimum_length: Optional[int] = None,
         maximum_length: Optional[int] = None,
+        regex: Union[None, str, Pattern] = None,
     ):
         self.help = help
         self.minimum_length = minimum_length
         self.maximum_length = maximum_length
+        self.regex = _get_pattern(regex) if regex is not None else None
 
     def parse(self, value):
         if value is None:
@@ -134,6 +157,8 @@ class StringType(BaseArgType):
             self.minimum_length is not None and len(parsed_value) < self.minimum_length
         ):
             return None
+        if self.regex is not None and self.regex.fullmatch(parsed_value) is None:
+            return None
         return parsed_value
 
     def help_repr(self) -> str:
@@ -144,12 +169,47 @@ class StringType(BaseArgType):
             qualifiers = f" (length > {self.minimum_length})"
         elif self.minimum_length is not None:
             qualifiers = f" ({self.maximum_length} > length)"
+        if self.regex is not None:
+            qualifiers = f"{qualifiers} (matches `{self.regex.pattern}`)"
         return f"string{qualifiers}"
 
     def global_help_repr(self, name: str) -> str:
         return f"{name}:text"
 
 
+class RegexType(BaseArgType):
+    help: Optional[str] = None
+    regex: Pattern
+    groups: bool = False
+
+    def __init__(
+        self,
+        pattern: Union[str, Pattern],
+        help: Optional[str] = None,
+        groups: bool = False,
+        flags: int = 0,
+    ):
+        self.help = help
+        self.regex = _get_pattern(pattern, flags)
+        self.groups = groups
+
+    def parse(self, value):
+        if not isinstance(value, str):
+            return None
+        match = self.regex.fullmatch(value)
+        if match is None:
+            return None
+        if self.groups:
+            return match.groupdict()
+        return value
+
+    def help_repr(self) -> str:
+        return f"text (matches `{self.regex.pattern}`)"
+
+    def global_help_repr(self, name: str) -> str:
+        return f"{name}:text"
+
+
 class EnumType(BaseArgType):
     help: Optional[str] = None
     values: Set[str]
@@ -175,24 +235,90 @@ class EnumType(BaseArgType):
         return f"{name}:{'|'.join(self.values)}"
 
 
+def _get_array_constructor() -> Callable[[List[str], str], Any]:
+    """
+    Returns a function which converts a list of numeric strings into a compact array of the given kind (`int` or `float`).
+    numpy arrays are used if numpy is installed, otherwise `array.array` from the standard library.
+    Raises ValueError or OverflowError for invalid values.
+    """
+    try:
+        import numpy
+
+        dtypes = {"int": numpy.int64, "float": numpy.float64}
+        return lambda values, kind: numpy.array(values, dtype=dtypes[kind])
+    except ImportError:
+        pass
+    typecodes = {"int": ("q", int), "float": ("d", float)}
+
+    def make_array(values: List[str], kind: str):
+        typecode, convert = typecodes[kind]
+        return array.array(typecode, map(convert, values))
+
+    return make_array
+
+
 class UnknownLengthListType(BaseArgType):
     help: Optional[str] = None
     arg_type: BaseArgType
+    array: bool = False
 
-    def __init__(self, arg_type: BaseArgType, help: Optional[str] = None):
+    def __init__(
+        self, arg_type: BaseArgType, help: Optional[str] = None, array: bool = False
+    ):
         self.arg_type = arg_type
         self.help = help
+        self.array = array
+        self._array_kind: Optional[str] = None
+        if array:
+            if isinstance(arg_type, IntType):
+                self._array_kind = "int"
+            elif isinstance(arg_type, FloatType):
+                self._array_kind = "float"
+            else:
+                raise InvalidArrayArgTypeException(
+                    f"Only Int and Float UnknownLengthLists can be parsed into arrays, not {type(arg_type).__name__}."
+                )
+            self._make_array = _get_array_constructor()
 
     def parse(self, value):
-        l = []
         if isinstance(value, str):
-            value = [a for a in value.split(" ") if a != ""]
+            value = _tokenize(value)
+        if self._array_kind is not None:
+            return self._parse_array(value)
+        l = []
+        parse = self.arg_type.parse
         for arg in value:
-            l.append(self.arg_type.parse(arg))
-        if None in l:
-            return None
+            parsed = parse(arg)
+            if parsed is None:
+                return None
+            l.append(parsed)
         return l
 
+    def _parse_array(self, value: List[str]):
+        """
+        Converts all of the values in a single call, then checks the bounds of the whole array.
+        """
+        try:
+            parsed = self._make_array(value, self._array_kind)
+        except (ValueError, OverflowError, TypeError):
+            return None
+        if len(parsed) == 0:
+            return parsed
+        minimum = getattr(self.arg_type, "minimum", None)
+        maximum = getattr(self.arg_type, "maximum", None)
+        if minimum is None and maximum is None:
+            return parsed
+        if isinstance(parsed, array.array):
+            smallest, largest = min(parsed), max(parsed)
+        else:
+            # numpy arrays reduce without iterating in Python.
+            smallest, largest = parsed.min(), parsed.max()
+        if (minimum is not None and smallest < minimum) or (
+            maximum is not None and largest > maximum
+        ):
+            return None
+        return parsed
+
     def help_repr(self) -> str:
         return f"{self.arg_type.help_repr()} [...]"
 
@@ -208,3 +334,22 @@ class FlagType:
 
     def global_help_repr(self, name: str) -> str:
         return f"[--{name}]"
+
+
+class OptionType:
+    help: Optional[str] = None
+    arg_type: BaseArgType
+    default: Any = None
+
+    def __init__(
+        self,
+        arg_type: BaseArgType,
+        default: Any = None,
+        help: Optional[str] = None,
+    ):
+        self.arg_type = arg_type
+        self.default = default
+        self.help = help
+
+    def global_help_repr(self, name: str) -> str:
+        return f"[--{name}={self.arg_type.global_help_repr(name).split(':', 1)[-1]}]"
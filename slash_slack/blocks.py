@@ -1,4 +1,9 @@
-from typing import List, Optional, Union
+from collections.abc import Iterator
+from typing import Iterable, List, Optional, Union
+
+# https://api.slack.com/reference/block-kit/blocks
+_MAX_BLOCKS_PER_MESSAGE = 50
+_MAX_SECTION_TEXT_LENGTH = 3000
 
 
 def _make_mrkdown_block(mrkdown: str):
@@ -27,41 +32,93 @@ def _make_header_block(heading: str):
     }
 
 
+def _split_mrkdown(mrkdown: str):
+    """
+    Lazily splits the mrkdown into chunks which fit within a single section block.
+    Splits are made on the last newline (or space) within the limit when possible.
+    """
+    is_first_chunk = True
+    while len(mrkdown) > _MAX_SECTION_TEXT_LENGTH:
+        separator = "\n"
+        split_at = mrkdown.rfind(separator, 1, _MAX_SECTION_TEXT_LENGTH + 1)
+        if split_at == -1:
+            separator = " "
+            split_at = mrkdown.rfind(separator, 1, _MAX_SECTION_TEXT_LENGTH + 1)
+        if split_at == -1:
+            separator = ""
+            split_at = _MAX_SECTION_TEXT_LENGTH
+        yield mrkdown[:split_at]
+        is_first_chunk = False
+        mrkdown = mrkdown[split_at:].lstrip(separator)
+    if mrkdown or is_first_chunk:
+        yield mrkdown
+
+
+def _make_mrkdown_blocks(mrkdown: str):
+    """
+    Wraps the mrkdown in as many block kit blocks as are needed to stay within the section text limit.
+    """
+    for chunk in _split_mrkdown(mrkdown):
+        yield _make_mrkdown_block(chunk)
+
+
+def _is_block_sequence(blocks) -> bool:
+    return isinstance(blocks, (list, tuple, Iterator))
+
+
+def _iter_blocks(
+    blocks: Union[None, str, dict, Iterable[Union[str, dict]]],
+):
+    """
+    Lazily generates block kit blocks from a variety of input types.
+
+    str -> mrkdown sections.
+
+    dict -> the dict as is.
+
+    list/tuple/generator -> the blocks of each item.
+
+        str -> mrkdown sections
+
+        dict -> the dict as is
+    """
+    if isinstance(blocks, dict):
+        yield blocks
+
+    elif _is_block_sequence(blocks):
+        for block in blocks:
+            if isinstance(block, str):
+                yield from _make_mrkdown_blocks(block)
+            if isinstance(block, dict):
+                yield block
+    else:
+        yield from _make_mrkdown_blocks(str(blocks))
+
+
 def _make_block_message(
-    blocks: Union[None, str, dict, List[Union[str, dict]]],
+    blocks: Union[None, str, dict, Iterable[Union[str, dict]]],
     header: Optional[str] = None,
     visible_in_channel: bool = True,
 ):
     """
     Generates slack block kit messages from a variety of input types.
 
-    str -> Wrap the str in a mrkdown section and in a top level response.
+    str -> Wrap the str in mrkdown sections and in a top level response.
 
     dict -> Wrap the dict in a top level response.
 
-    list -> Wrap the altered contents in a top level response.
+    list/tuple/generator -> Wrap the altered contents in a top level response.
 
-        str -> Wrap the str in a mrkdown section
+        str -> Wrap the str in mrkdown sections
 
         dict -> add to top level response as is
+
+    Long strings are split into multiple sections. To split large outputs into multiple messages use `_iter_block_messages`.
     """
-    output_blocks: List[dict] = []
     if blocks is None or blocks == "":
         return {}
 
-    if isinstance(blocks, dict):
-        output_blocks = [blocks]
-
-    elif isinstance(blocks, list):
-        formatted_blocks = []
-        for block in blocks:
-            if isinstance(block, str):
-                formatted_blocks.append(_make_mrkdown_block(block))
-            if isinstance(block, dict):
-                formatted_blocks.append(block)
-        output_blocks = formatted_blocks
-    else:
-        output_blocks = [_make_mrkdown_block(str(blocks))]
+    output_blocks: List[dict] = list(_iter_blocks(blocks))
 
     if header:
         output_blocks = [_make_header_block(header)] + output_blocks
@@ -69,3 +126,34 @@ def _make_block_message(
         "blocks": output_blocks,
         "response_type": "in_channel" if visible_in_channel else "ephemeral",
     }
+
+
+def _iter_block_messages(
+    blocks: Union[None, str, dict, Iterable[Union[str, dict]]],
+    header: Optional[str] = None,
+    visible_in_channel: bool = True,
+):
+    """
+    Lazily generates slack block kit messages which each stay within the slack block limit.
+
+    Accepts the same input types as `_make_block_message`. Blocks are consumed from the input
+    only as messages are generated so large lists and generators are never fully materialized.
+    """
+    if blocks is None or blocks == "":
+        yield {}
+        return
+
+    response_type = "in_channel" if visible_in_channel else "ephemeral"
+    output_blocks: List[dict] = []
+    if header:
+        output_blocks.append(_make_header_block(header))
+    has_yielded = False
+    for block in _iter_blocks(blocks):
+        if len(output_blocks) == _MAX_BLOCKS_PER_MESSAGE:
+            yield {"blocks": output_blocks, "response_type": response_type}
+            has_yielded = True
+            output_blocks = []
+        output_blocks.append(block)
+
+    if output_blocks or not has_yielded:
+        yield {"blocks": output_blocks, "response_type": response_type}
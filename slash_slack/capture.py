@@ -0,0 +1,135 @@
+import json
+import queue
+import threading
+from typing import Any, Dict, Iterator, Mapping, Optional, Sequence
+from urllib.parse import parse_qsl, urlencode
+
+REDACTED = "REDACTED"
+_DEFAULT_REDACT_FIELDS = ("token", "response_url")
+_DEFAULT_REDACT_HEADERS = (
+    "x-slack-signature",
+    "authorization",
+    "cookie",
+    "proxy-authorization",
+)
+_STOP = object()
+
+
+class CapturedRequest:
+    """
+    A request read from a traffic capture. `timestamp` is the unix time the request arrived.
+    """
+
+    __slots__ = ("timestamp", "headers", "body")
+
+    def __init__(self, timestamp: float, headers: Dict[str, str], body: str):
+        self.timestamp = timestamp
+        self.headers = headers
+        self.body = body
+
+    @property
+    def params(self) -> Dict[str, str]:
+        return dict(parse_qsl(self.body, keep_blank_values=True))
+
+
+class TrafficRecorder:
+    """
+    Records the raw body, headers and arrival time of every request to the SlashSlack endpoint.
+
+    Records are appended to `path` as compact JSON lines (`{"ts":...,"headers":{...},"body":"..."}`) which can be
+    replayed with `mock-slack replay`. The values of the form fields in `redact_fields` and of the headers in
+    `redact_headers` are replaced with `REDACTED` before they are written.
+
+    Requests are handed to a queue and redacted and written by a background thread so that recording never blocks the event loop.
+    When more than `max_queue_size` requests are waiting to be written new requests are dropped.
+    """
+
+    path: str
+    redact_fields: Sequence[str]
+    redact_headers: Sequence[str]
+    dropped: int
+
+    def __init__(
+        self,
+        path: str,
+        redact_fields: Sequence[str] = _DEFAULT_REDACT_FIELDS,
+        redact_headers: Sequence[str] = _DEFAULT_REDACT_HEADERS,
+        max_queue_size: int = 10000,
+    ):
+        self.path = path
+        self.redact_fields = redact_fields
+        self.redact_headers = redact_headers
+        self.dropped = 0
+        self._redact_fields = frozenset(redact_fields)
+        self._redact_headers = frozenset(header.lower() for header in redact_headers)
+        self._queue: queue.Queue = queue.Queue(max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """
+        Starts the background writer thread. Called when the app starts, requests recorded before are written once it runs.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._write, name="slash_slack.capture", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """
+        Writes all queued requests and stops the background writer thread. Called when the app shuts down.
+        """
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+
+    def record(self, timestamp: float, headers: Mapping[str, str], body: bytes):
+        try:
+            self._queue.put_nowait((timestamp, headers, body))
+        except queue.Full:
+            self.dropped += 1
+
+    def _redact(self, timestamp: float, headers: Mapping[str, str], body: bytes) -> str:
+        fields = [
+            (key, REDACTED if key in self._redact_fields else value)
+            for key, value in parse_qsl(
+                body.decode(errors="replace"), keep_blank_values=True
+            )
+        ]
+        return json.dumps(
+            {
+                "ts": timestamp,
+                "headers": {
+                    key.lower(): (
+                        REDACTED if key.lower() in self._redact_headers else value
+                    )
+                    for key, value in headers.items()
+                },
+                "body": urlencode(fields),
+            },
+            separators=(",", ":"),
+        )
+
+    def _write(self):
+        with open(self.path, "a", encoding="utf-8") as f:
+            while True:
+                item: Any = self._queue.get()
+                if item is _STOP:
+                    break
+                f.write(self._redact(*item))
+                f.write("\n")
+                if self._queue.empty():
+                    f.flush()
+
+
+def _read_capture(path: str) -> Iterator[CapturedRequest]:
+    """
+    Reads the requests of a traffic capture in the order they arrived.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            yield CapturedRequest(record["ts"], record["headers"], record["body"])
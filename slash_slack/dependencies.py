@@ -0,0 +1,208 @@
+import asyncio
+import inspect
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from slash_slack.exceptions import InvalidDependencyException
+from slash_slack.slash_slack_request import SlashSlackRequest
+
+REQUEST = "request"
+APP = "app"
+SCOPES = (REQUEST, APP)
+
+_FUNCTION = "function"
+_COROUTINE = "coroutine"
+_GENERATOR = "generator"
+_ASYNC_GENERATOR = "async_generator"
+_MISSING = object()
+
+
+class Dependency:
+    """
+    A provider declared as the default value of a command function parameter, EX: `db: Pool = Depends(get_pool)`.
+
+    The provider can be a sync or async function returning the value, or a sync or async generator yielding it.
+    The code after the `yield` of a generator is run to close the value.
+    The parameters of the provider can themselves be dependencies or the `SlashSlackRequest`.
+
+    `scope`:
+        `request`: The value is created for each command invocation and closed after its response was delivered,
+            so a command can yield its results lazily from it.
+            Within one invocation each provider is called once, even if it is depended on more than once.
+        `app`: The value is created once when the app starts and closed when the app shuts down.
+            App scoped providers can only depend on other app scoped providers.
+
+    The provider signature is parsed once when the dependency is declared.
+    """
+
+    provider: Callable
+    scope: str
+    name: str
+    kind: str
+    request_arg: Optional[str] = None
+    dependencies: List[Tuple[str, "Dependency"]]
+
+    def __init__(self, provider: Callable, scope: str = REQUEST):
+        if scope not in SCOPES:
+            raise InvalidDependencyException(
+                f"Invalid scope ({scope}) for dependency. Must be one of {SCOPES}."
+            )
+        self.provider = provider
+        self.scope = scope
+        self.name = getattr(provider, "__name__", repr(provider))
+        if inspect.isasyncgenfunction(provider):
+            self.kind = _ASYNC_GENERATOR
+            self._context_manager = asynccontextmanager(provider)
+        elif inspect.isgeneratorfunction(provider):
+            self.kind = _GENERATOR
+            self._context_manager = contextmanager(provider)
+        elif inspect.iscoroutinefunction(provider):
+            self.kind = _COROUTINE
+        else:
+            self.kind = _FUNCTION
+        self.request_arg, self.dependencies = _parse_provider_params(provider)
+        if scope == APP:
+            if self.request_arg is not None:
+                raise InvalidDependencyException(
+                    f"App scoped dependency {self.name} can not depend on the SlashSlackRequest."
+                )
+            for name, dependency in self.dependencies:
+                if dependency.scope != APP:
+                    raise InvalidDependencyException(
+                        f"App scoped dependency {self.name} can not depend on the request scoped dependency {dependency.name} ({name})."
+                    )
+
+    async def create(self, kwargs: Dict[str, Any], exit_stack: AsyncExitStack) -> Any:
+        """
+        Calls the provider. Generators are entered on `exit_stack` so they are closed with it.
+        """
+        if self.kind == _ASYNC_GENERATOR:
+            return await exit_stack.enter_async_context(self._context_manager(**kwargs))
+        if self.kind == _GENERATOR:
+            return exit_stack.enter_context(self._context_manager(**kwargs))
+        if self.kind == _COROUTINE:
+            return await self.provider(**kwargs)
+        return self.provider(**kwargs)
+
+
+def Depends(provider: Callable, scope: str = REQUEST) -> Any:
+    """
+    Declares a command function parameter which is provided by `provider`. See `Dependency`.
+    """
+    return Dependency(provider, scope=scope)
+
+
+def _parse_provider_params(
+    provider: Callable,
+) -> Tuple[Optional[str], List[Tuple[str, Dependency]]]:
+    """
+    Returns the name of the SlashSlackRequest parameter and the dependency parameters of a provider.
+    Parameters with any other default value are left to their default.
+    """
+    request_arg = None
+    dependencies = []
+    for param in inspect.signature(provider).parameters.values():
+        if param.annotation is SlashSlackRequest:
+            request_arg = param.name
+        elif isinstance(param.default, Dependency):
+            dependencies.append((param.name, param.default))
+        elif param.default is param.empty:
+            raise InvalidDependencyException(
+                f"Dependency provider {getattr(provider, '__name__', provider)} has a parameter ({param.name}) which is not a dependency or the SlashSlackRequest."
+            )
+    return request_arg, dependencies
+
+
+def _iter_dependencies(dependencies: Iterable[Dependency]) -> Iterable[Dependency]:
+    """
+    Yields the dependencies and all of their sub dependencies, sub dependencies first.
+    """
+    for dependency in dependencies:
+        yield from _iter_dependencies(d for _, d in dependency.dependencies)
+        yield dependency
+
+
+class _DependencyContainer:
+    """
+    Holds the app scoped dependency values of a SlashSlack app and resolves the dependencies of command invocations.
+
+    App scoped values are keyed by provider, so every `Depends` of the same provider shares one value.
+    They are created when the app starts, or on first use if a provider is registered after the app started.
+    A container can be shared by several apps (see `host.SlashSlackHost`), the values are closed when the last of them shuts down.
+    """
+
+    def __init__(self):
+        self.app_dependencies: Dict[Callable, Dependency] = {}
+        self._values: Dict[Callable, Any] = {}
+        self._exit_stack: Optional[AsyncExitStack] = None
+        self._lock = asyncio.Lock()
+        self._starts = 0
+
+    def register(self, dependencies: Iterable[Dependency]):
+        for dependency in _iter_dependencies(dependencies):
+            if dependency.scope == APP:
+                self.app_dependencies.setdefault(dependency.provider, dependency)
+
+    async def start(self):
+        """
+        Creates the values of all registered app scoped dependencies. Called when the app starts.
+        """
+        self._starts += 1
+        for dependency in list(self.app_dependencies.values()):
+            await self._get_app_value(dependency)
+
+    async def stop(self):
+        """
+        Closes the app scoped values in the reverse order they were created. Called when the app shuts down.
+        """
+        self._starts = max(self._starts - 1, 0)
+        if self._starts > 0:
+            return
+        exit_stack, self._exit_stack = self._exit_stack, None
+        self._values.clear()
+        if exit_stack is not None:
+            await exit_stack.aclose()
+
+    async def resolve(
+        self,
+        dependency: Dependency,
+        slash_slack_request: SlashSlackRequest,
+        cache: Dict[Callable, Any],
+        exit_stack: AsyncExitStack,
+    ) -> Any:
+        """
+        Returns the value of a dependency for one command invocation.
+        Request scoped values are cached in `cache` and closed with `exit_stack`.
+        """
+        if dependency.scope == APP:
+            return await self._get_app_value(dependency)
+        value = cache.get(dependency.provider, _MISSING)
+        if value is not _MISSING:
+            return value
+        kwargs = {}
+        if dependency.request_arg is not None:
+            kwargs[dependency.request_arg] = slash_slack_request
+        for name, sub_dependency in dependency.dependencies:
+            kwargs[name] = await self.resolve(
+                sub_dependency, slash_slack_request, cache, exit_stack
+            )
+        value = await dependency.create(kwargs, exit_stack)
+        cache[dependency.provider] = value
+        return value
+
+    async def _get_app_value(self, dependency: Dependency) -> Any:
+        value = self._values.get(dependency.provider, _MISSING)
+        if value is not _MISSING:
+            return value
+        kwargs = {
+            name: await self._get_app_value(sub_dependency)
+            for name, sub_dependency in dependency.dependencies
+        }
+        async with self._lock:
+            value = self._values.get(dependency.provider, _MISSING)
+            if value is _MISSING:
+                if self._exit_stack is None:
+                    self._exit_stack = AsyncExitStack()
+                value = await dependency.create(kwargs, self._exit_stack)
+                self._values[dependency.provider] = value
+        return value
@@ -0,0 +1,105 @@
+import asyncio
+from contextvars import ContextVar
+from time import monotonic
+from typing import Any, Callable, Coroutine, Dict, List, Optional
+
+QUEUED = "queued"
+EXECUTING = "executing"
+DELIVERING = "delivering"
+
+_current_execution: ContextVar[Optional["_Execution"]] = ContextVar(
+    "slash_slack_execution", default=None
+)
+
+
+class _Execution:
+    """
+    An in-flight command execution or response delivery.
+    """
+
+    __slots__ = ("command", "user_id", "stage", "started")
+
+    def __init__(self, command: str, user_id: str, stage: str = EXECUTING):
+        self.command = command
+        self.user_id = user_id
+        self.stage = stage
+        self.started = monotonic()
+
+    def report(self) -> dict:
+        return {
+            "command": self.command,
+            "user_id": self.user_id,
+            "stage": self.stage,
+            "age": monotonic() - self.started,
+        }
+
+
+def _set_stage(stage: str):
+    """
+    Sets the stage of the execution running in the current task, if it is tracked.
+    """
+    execution = _current_execution.get()
+    if execution is not None:
+        execution.stage = stage
+
+
+class _ExecutionTracker:
+    """
+    Tracks the in-flight command executions and response deliveries of an app so they can be drained on shutdown.
+
+    Each execution runs in its own task. The background task which started it awaits it shielded, so if the server
+    cancels the request when it shuts down the execution keeps running until it is drained.
+    """
+
+    draining: bool
+
+    def __init__(self):
+        self.draining = False
+        self._tasks: Dict[asyncio.Task, _Execution] = {}
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def count(self, stage: str) -> int:
+        """
+        Returns the number of in-flight executions in `stage`.
+        """
+        return sum(1 for execution in self._tasks.values() if execution.stage == stage)
+
+    async def run(
+        self,
+        execution: _Execution,
+        func: Callable[..., Coroutine[Any, Any, Any]],
+        *args,
+        **kwargs,
+    ):
+        """
+        Runs `func(*args, **kwargs)` as a tracked execution and waits for it to finish.
+        """
+        task = asyncio.ensure_future(self._run(execution, func, args, kwargs))
+        self._tasks[task] = execution
+        task.add_done_callback(self._discard)
+        await asyncio.shield(task)
+
+    async def _run(self, execution: _Execution, func: Callable, args, kwargs):
+        _current_execution.set(execution)
+        await func(*args, **kwargs)
+
+    def _discard(self, task: asyncio.Task):
+        self._tasks.pop(task, None)
+
+    async def drain(self, timeout: float) -> List[_Execution]:
+        """
+        Stops new work from being accepted and waits up to `timeout` seconds for the in-flight executions to finish.
+        Executions still running after the timeout are cancelled and returned.
+        """
+        self.draining = True
+        if not self._tasks:
+            return []
+        _, pending = await asyncio.wait(list(self._tasks), timeout=timeout)
+        abandoned = [self._tasks[task] for task in pending if task in self._tasks]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+        return abandoned
@@ -38,3 +38,57 @@ class InvalidAnnotationException(SlashSlackException):
     """
     Exception raised when a command function has a parameter with an invalid annotation.
     """
+
+
+class InvalidBeforeRequestFunctionPhaseException(SlashSlackException):
+    """
+    Exception raised when a before request function is registered with an invalid phase.
+    """
+
+
+class InvalidMiddlewareException(SlashSlackException):
+    """
+    Exception raised when a middleware is not an async function or is registered with an invalid phase.
+    """
+
+
+class InvalidArrayArgTypeException(SlashSlackException):
+    """
+    Exception raised when an UnknownLengthList of a non numeric arg type is parsed into an array.
+    """
+
+
+class InvalidDependencyException(SlashSlackException):
+    """
+    Exception raised when a dependency has an invalid scope or provider.
+    """
+
+
+class InvalidPageSizeException(SlashSlackException):
+    """
+    Exception raised when a paginated result has a page size which does not fit in a single message.
+    """
+
+
+class DuplicateUrlPathException(SlashSlackException):
+    """
+    Exception raised when two SlashSlack apps with the same path are added to a SlashSlackHost.
+    """
+
+
+class InvalidCommandException(SlashSlackException):
+    """
+    Exception raised when a command can not be routed to, or has a flag or option shadowed by a global flag.
+    """
+
+
+class AppFrozenException(SlashSlackException):
+    """
+    Exception raised when a command, middleware or before request function is registered after the app was frozen.
+    """
+
+
+class InvalidPriorityException(SlashSlackException):
+    """
+    Exception raised when a command has an invalid priority or a scheduler has invalid weights.
+    """
@@ -0,0 +1,116 @@
+import asyncio
+from collections import deque
+from time import monotonic
+from typing import Deque, List, Optional, Tuple
+
+from slash_slack.drain import DELIVERING, EXECUTING, _ExecutionTracker
+from slash_slack.scheduler import PriorityScheduler
+
+
+class HealthCheck:
+    """
+    Serves a liveness endpoint at `<url_path>/health/live` and a readiness endpoint at `<url_path>/health/ready`
+    for load balancer health checks. Both are GET requests without authentication.
+
+    The liveness endpoint always responds with a 200 while the event loop is running.
+    The readiness endpoint responds with a 200 when the app is ready for more requests, and with a 503 when it is saturated
+    or shutting down, so the instance can be taken out of rotation before acknowledgements miss Slack's 3 second deadline.
+    Both respond with a JSON report of the measurements and of the reasons the app is not ready.
+
+    The app is not ready when:
+        The event loop lag (the largest delay of the last `window` wake ups of a task sleeping for `interval` seconds)
+            is more than `max_loop_lag` seconds.
+        More than `max_in_flight` commands are executing.
+        More than `max_queued` commands are waiting in the queues of the scheduler.
+        More than `max_delivery_backlog` responses are waiting to be delivered.
+        The app is shutting down.
+    A limit of None is not checked.
+    """
+
+    max_loop_lag: Optional[float]
+    max_in_flight: Optional[int] = None
+    max_queued: Optional[int] = None
+    max_delivery_backlog: Optional[int] = None
+    interval: float
+    window: int
+
+    def __init__(
+        self,
+        max_loop_lag: Optional[float] = 0.5,
+        max_in_flight: Optional[int] = None,
+        max_queued: Optional[int] = None,
+        max_delivery_backlog: Optional[int] = None,
+        interval: float = 0.5,
+        window: int = 10,
+    ):
+        self.max_loop_lag = max_loop_lag
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.max_delivery_backlog = max_delivery_backlog
+        self.interval = interval
+        self.window = window
+        self._lags: Deque[float] = deque(maxlen=window)
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._task is None:
+            self._lags.clear()
+            self._task = asyncio.ensure_future(self._measure_loop_lag())
+
+    async def stop(self):
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _measure_loop_lag(self):
+        while True:
+            start = monotonic()
+            await asyncio.sleep(self.interval)
+            self._lags.append(max(monotonic() - start - self.interval, 0.0))
+
+    @property
+    def loop_lag(self) -> float:
+        """
+        The largest event loop lag (in seconds) of the last `window` measurements.
+        """
+        return max(self._lags, default=0.0)
+
+    def check(
+        self,
+        executions: _ExecutionTracker,
+        scheduler: Optional[PriorityScheduler] = None,
+    ) -> Tuple[bool, dict]:
+        """
+        Returns whether the app is ready and the readiness report. Must be called from the event loop.
+        """
+        loop_lag = self.loop_lag
+        executing, delivering = executions.count(EXECUTING), executions.count(
+            DELIVERING
+        )
+        queued = scheduler.queued() if scheduler is not None else {}
+        total_queued = sum(queued.values())
+        reasons: List[str] = []
+        if executions.draining:
+            reasons.append("shutting down")
+        if self.max_loop_lag is not None and loop_lag > self.max_loop_lag:
+            reasons.append(f"event loop lag {loop_lag:.3f}s > {self.max_loop_lag:.3f}s")
+        if self.max_in_flight is not None and executing > self.max_in_flight:
+            reasons.append(f"{executing} commands executing > {self.max_in_flight}")
+        if self.max_queued is not None and total_queued > self.max_queued:
+            reasons.append(f"{total_queued} commands queued > {self.max_queued}")
+        if (
+            self.max_delivery_backlog is not None
+            and delivering > self.max_delivery_backlog
+        ):
+            reasons.append(
+                f"{delivering} responses waiting to be delivered > {self.max_delivery_backlog}"
+            )
+        return not reasons, {
+            "ready": not reasons,
+            "reasons": reasons,
+            "loop_lag": loop_lag,
+            "executing": executing,
+            "queued": queued,
+            "delivering": delivering,
+        }
@@ -0,0 +1,114 @@
+import asyncio
+import inspect
+import logging
+from time import perf_counter
+from typing import Any, Callable, Optional, Sequence
+
+from fastapi.concurrency import run_in_threadpool
+
+from slash_slack.slash_slack_request import SlashSlackRequest
+from slash_slack.tracing import Tracer, _trace
+
+logger = logging.getLogger("slash_slack")
+
+BEFORE_ACK = "before_ack"
+AFTER_ACK = "after_ack"
+BEFORE_EXECUTE = "before_execute"
+PHASES = (BEFORE_ACK, AFTER_ACK, BEFORE_EXECUTE)
+
+
+class BeforeRequestFunction:
+    """
+    A registered before request function. Whether the function is async is determined once at registration.
+
+    Async functions are awaited on the event loop, sync functions are run in the thread pool.
+    If the function takes longer than `timeout` seconds it is abandoned (a sync function will keep running in its thread).
+    Errors and timeouts are logged and counted, they never prevent the request from being handled.
+    """
+
+    func: Callable
+    name: str
+    is_async: bool
+    phase: str
+    timeout: Optional[float] = None
+    calls: int
+    errors: int
+    timeouts: int
+    total_duration: float
+    max_duration: float
+
+    def __init__(self, func: Callable, phase: str, timeout: Optional[float] = None):
+        self.func = func
+        self.name = getattr(func, "__name__", repr(func))
+        self.is_async = inspect.iscoroutinefunction(func)
+        self.phase = phase
+        self.timeout = timeout
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.total_duration = 0.0
+        self.max_duration = 0.0
+
+    async def __call__(
+        self,
+        slash_slack_request: SlashSlackRequest,
+        tracer: Optional[Tracer] = None,
+        trace_parent: Any = None,
+    ):
+        start = perf_counter()
+        try:
+            with _trace(
+                tracer, "before_request_function", trace_parent, {"function": self.name}
+            ):
+                if self.is_async:
+                    call = self.func(slash_slack_request)
+                else:
+                    call = run_in_threadpool(self.func, slash_slack_request)
+                if self.timeout is None:
+                    await call
+                else:
+                    await asyncio.wait_for(call, self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logger.warning(
+                f"Before request function {self.name} exceeded its time budget of {self.timeout}s."
+            )
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Before request function {self.name} raised an error: {e}")
+        finally:
+            duration = perf_counter() - start
+            self.calls += 1
+            self.total_duration += duration
+            if duration > self.max_duration:
+                self.max_duration = duration
+
+    def stats(self) -> dict:
+        return {
+            "function": self.name,
+            "phase": self.phase,
+            "is_async": self.is_async,
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "total_duration": self.total_duration,
+            "avg_duration": self.total_duration / self.calls if self.calls else 0.0,
+            "max_duration": self.max_duration,
+        }
+
+
+async def _run_before_request_functions(
+    functions: Sequence[BeforeRequestFunction],
+    slash_slack_request: SlashSlackRequest,
+    tracer: Optional[Tracer] = None,
+    trace_parent: Any = None,
+):
+    """
+    Runs all of the given before request functions concurrently.
+    """
+    if len(functions) == 1:
+        await functions[0](slash_slack_request, tracer, trace_parent)
+        return
+    await asyncio.gather(
+        *(func(slash_slack_request, tracer, trace_parent) for func in functions)
+    )
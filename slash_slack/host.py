@@ -0,0 +1,97 @@
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Dict, List, Optional, Sequence
+
+from fastapi import FastAPI
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from slash_slack.dependencies import _DependencyContainer
+from slash_slack.exceptions import DuplicateUrlPathException
+from slash_slack.http_client import HttpClient
+from slash_slack.pagination import PageCache
+from slash_slack.slash_slack import SlashSlack
+
+
+class SlashSlackHost:
+    """
+    Serves multiple SlashSlack apps from a single ASGI app (and process).
+
+    Each app keeps its own `url_path` and signing secret, so each Slack app (or workspace) is configured with its own request URL.
+    The apps share one `http_client.HttpClient` connection pool, one `pagination.PageCache`,
+    and their app scoped dependencies (one value per provider across all of the apps).
+    Commands of every app run on the event loop of the host (sync commands included), and sync before request
+    functions and warmups use the process wide thread pool, which is already shared.
+
+    Requests are routed to the app which owns the path with a single dict lookup, however many apps are added.
+    The startup and shutdown of every app run with the host app.
+    """
+
+    apps: List[SlashSlack]
+    app: FastAPI
+    http_client: HttpClient
+    page_cache: PageCache
+
+    def __init__(
+        self,
+        apps: Sequence[SlashSlack] = (),
+        http_client: Optional[HttpClient] = None,
+        page_cache: Optional[PageCache] = None,
+    ):
+        self.apps = []
+        self.http_client = http_client if http_client is not None else HttpClient()
+        self.page_cache = page_cache if page_cache is not None else PageCache()
+        self._dependencies = _DependencyContainer()
+        self._routes: Dict[str, ASGIApp] = {}
+        self.app = FastAPI(
+            title="SlashSlackHost", openapi_url=None, lifespan=self._lifespan
+        )
+        self.app.mount("/", self._dispatch)
+        for app in apps:
+            self.add(app)
+
+    def add(self, slash: SlashSlack):
+        """
+        Adds a SlashSlack app to the host. Must be called before the host app starts.
+        """
+        paths = [
+            route.path
+            for route in slash.get_fast_api().routes
+            if isinstance(getattr(route, "path", None), str)
+        ]
+        for path in paths:
+            if path in self._routes:
+                raise DuplicateUrlPathException(
+                    f"The path {path} is already served by another SlashSlack app."
+                )
+        slash._use_shared_resources(
+            self.http_client, self.page_cache, self._dependencies
+        )
+        for path in paths:
+            self._routes[path] = slash.get_fast_api()
+        self.apps.append(slash)
+
+    def get_fast_api(self):
+        """
+        Get the ASGI app serving all of the SlashSlack apps which should be exported to be run by a wsgi worker (uvicorn).
+        """
+        return self.app
+
+    @asynccontextmanager
+    async def _lifespan(self, app: FastAPI):
+        async with AsyncExitStack() as exit_stack:
+            for slash in self.apps:
+                await exit_stack.enter_async_context(slash._lifespan(slash.app))
+            yield
+
+    async def _dispatch(self, scope: Scope, receive: Receive, send: Send):
+        path = scope["path"]
+        root_path = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path) :]
+        app = self._routes.get(path)
+        if app is None:
+            await JSONResponse({"detail": "Not Found"}, status_code=404)(
+                scope, receive, send
+            )
+            return
+        await app(scope, receive, send)
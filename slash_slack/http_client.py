@@ -0,0 +1,43 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import aiohttp
+
+
+class HttpClient:
+    """
+    Shares one `aiohttp.ClientSession`, and so one connection pool, between all of the responses sent by an app
+    (or by all of the apps of a `host.SlashSlackHost`).
+
+    The session is opened when the app starts and closed when the last app using it shuts down.
+    Before the app has started a new session is used for each response.
+    `limit` is the maximum number of simultaneous connections, 0 for no limit.
+    """
+
+    limit: int
+
+    def __init__(self, limit: int = 100):
+        self.limit = limit
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._starts = 0
+
+    async def start(self):
+        self._starts += 1
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.limit)
+            )
+
+    async def stop(self):
+        self._starts = max(self._starts - 1, 0)
+        if self._starts == 0 and self._session is not None:
+            session, self._session = self._session, None
+            await session.close()
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[aiohttp.ClientSession]:
+        if self._session is not None:
+            yield self._session
+            return
+        async with aiohttp.ClientSession() as session:
+            yield session
@@ -0,0 +1,199 @@
+import tracemalloc
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+_TRACEMALLOC_FILTERS = (tracemalloc.Filter(False, tracemalloc.__file__),)
+
+
+def _format_statistics(statistics: List[tracemalloc.StatisticDiff]) -> List[dict]:
+    return [
+        {
+            "traceback": [
+                f"{frame.filename}:{frame.lineno}" for frame in stat.traceback
+            ],
+            "size_diff": stat.size_diff,
+            "count_diff": stat.count_diff,
+        }
+        for stat in statistics
+    ]
+
+
+class CommandMemoryStats:
+    """
+    Rolling memory statistics for a single command.
+
+    `peaks` and `retained` hold the peak and retained allocation deltas (in bytes) of the last `window` invocations.
+    """
+
+    invocations: int
+    peaks: Deque[int]
+    retained: Deque[int]
+    top_allocation_sites: List[dict]
+
+    def __init__(self, window: int):
+        self.invocations = 0
+        self.peaks = deque(maxlen=window)
+        self.retained = deque(maxlen=window)
+        self.top_allocation_sites = []
+
+    def record(self, peak: int, retained: int):
+        self.invocations += 1
+        self.peaks.append(peak)
+        self.retained.append(retained)
+
+    def to_dict(self) -> dict:
+        return {
+            "invocations": self.invocations,
+            "peak_max": max(self.peaks, default=0),
+            "peak_avg": sum(self.peaks) / len(self.peaks) if self.peaks else 0,
+            "retained_max": max(self.retained, default=0),
+            "retained_avg": (
+                sum(self.retained) / len(self.retained) if self.retained else 0
+            ),
+            "retained_total": sum(self.retained),
+            "top_allocation_sites": self.top_allocation_sites,
+        }
+
+
+class MemoryTracker:
+    """
+    Records the memory allocated by each command execution using tracemalloc.
+
+    For every execution the peak allocation delta and the retained allocation delta are recorded in rolling stats.
+    When `snapshots` is True a tracemalloc snapshot is taken before and after every execution and the `top_n`
+    allocation sites which grew the most are kept for each command. Snapshots block the event loop while they are taken,
+    so they are disabled by default and only intended for debugging.
+
+    The stats are served as JSON from `<url_path>/admin/memory`. Requests to this endpoint must include the
+    header `Authorization: Bearer <admin_token>` (unless the SlashSlack app is in dev mode).
+
+    The tracemalloc peak is process wide and is reset at the start of each measurement, so only one execution is measured
+    at a time. Executions which start while another one is measured are not measured, they are counted in `skipped`.
+    tracemalloc measures the whole process, so a measurement still includes the allocations of anything running concurrently.
+    """
+
+    window: int
+    top_n: int
+    snapshots: bool
+    traceback_limit: int
+    admin_token: Optional[str] = None
+    commands: Dict[str, CommandMemoryStats]
+    skipped: int
+
+    def __init__(
+        self,
+        admin_token: Optional[str] = None,
+        window: int = 100,
+        top_n: int = 10,
+        snapshots: bool = False,
+        traceback_limit: int = 1,
+    ):
+        self.admin_token = admin_token
+        self.window = window
+        self.top_n = top_n
+        self.snapshots = snapshots
+        self.traceback_limit = traceback_limit
+        self.commands = {}
+        self.skipped = 0
+        self._started_tracing = False
+        self._measuring = False
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.traceback_limit)
+            self._started_tracing = True
+
+    def stop(self):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def before_execution(self) -> Optional[Tuple[int, Optional[tracemalloc.Snapshot]]]:
+        """
+        Returns the state needed to measure an execution, or None if tracemalloc is not tracing
+        or another execution is being measured.
+        """
+        if not tracemalloc.is_tracing():
+            return None
+        if self._measuring:
+            self.skipped += 1
+            return None
+        self._measuring = True
+        snapshot = None
+        if self.snapshots:
+            snapshot = tracemalloc.take_snapshot().filter_traces(_TRACEMALLOC_FILTERS)
+        current, _ = tracemalloc.get_traced_memory()
+        if hasattr(tracemalloc, "reset_peak"):
+            # Python < 3.9 can only report the peak since tracing started.
+            tracemalloc.reset_peak()
+        return current, snapshot
+
+    def after_execution(
+        self,
+        command: str,
+        state: Optional[Tuple[int, Optional[tracemalloc.Snapshot]]],
+    ):
+        if state is None:
+            return
+        self._measuring = False
+        if not tracemalloc.is_tracing():
+            return
+        before, before_snapshot = state
+        current, peak = tracemalloc.get_traced_memory()
+        stats = self.commands.get(command)
+        if stats is None:
+            stats = CommandMemoryStats(self.window)
+            self.commands[command] = stats
+        stats.record(peak=peak - before, retained=current - before)
+        if before_snapshot is not None:
+            after_snapshot = tracemalloc.take_snapshot().filter_traces(
+                _TRACEMALLOC_FILTERS
+            )
+            stats.top_allocation_sites = _format_statistics(
+                after_snapshot.compare_to(before_snapshot, "traceback")[: self.top_n]
+            )
+
+    def report(self) -> dict:
+        """
+        Returns the stats of every command and the current top allocation sites of the process.
+        """
+        report = self._stats_report()
+        report["top_allocation_sites"] = self._top_allocation_sites()
+        return report
+
+    async def report_async(self) -> dict:
+        """
+        Same as `report`, but takes the snapshot of the top allocation sites in the thread pool.
+        The command stats are copied on the event loop first, where executions record them.
+        """
+        report = self._stats_report()
+        report["top_allocation_sites"] = await run_in_threadpool(
+            self._top_allocation_sites
+        )
+        return report
+
+    def _stats_report(self) -> dict:
+        return {
+            "tracing": tracemalloc.is_tracing(),
+            "skipped": self.skipped,
+            "commands": {
+                command: stats.to_dict() for command, stats in self.commands.items()
+            },
+        }
+
+    def _top_allocation_sites(self) -> List[dict]:
+        if not tracemalloc.is_tracing():
+            return []
+        snapshot = tracemalloc.take_snapshot().filter_traces(_TRACEMALLOC_FILTERS)
+        return [
+            {
+                "traceback": [
+                    f"{frame.filename}:{frame.lineno}" for frame in stat.traceback
+                ],
+                "size": stat.size,
+                "count": stat.count,
+            }
+            for stat in snapshot.statistics("traceback")[: self.top_n]
+        ]
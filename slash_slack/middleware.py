@@ -0,0 +1,96 @@
+from contextlib import AsyncExitStack
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set
+
+from fastapi import BackgroundTasks
+
+from slash_slack.slash_slack_request import SlashSlackRequest
+
+ACK = "ack"
+EXECUTE = "execute"
+MIDDLEWARE_PHASES = (ACK, EXECUTE)
+
+
+class AckContext:
+    """
+    Passed through the `ack` middleware chain for every valid request.
+
+    `state` can be used to share values between middlewares.
+    """
+
+    slash_slack_request: SlashSlackRequest
+    background_tasks: BackgroundTasks
+    trace_span: Any
+    state: Dict[str, Any]
+
+    def __init__(
+        self,
+        slash_slack_request: SlashSlackRequest,
+        background_tasks: BackgroundTasks,
+        trace_span: Any = None,
+    ):
+        self.slash_slack_request = slash_slack_request
+        self.background_tasks = background_tasks
+        self.trace_span = trace_span
+        self.state = {}
+
+
+class ExecutionContext:
+    """
+    Passed through the `execute` middleware chain for every command execution.
+
+    `command` is the `SlashSlackCommand` being executed and `args` are its parsed args.
+    `state` can be used to share values between middlewares.
+    `exit_stack` closes the request scoped dependencies once the response was delivered.
+    """
+
+    command: Any
+    args: List[Any]
+    flags: Set[str]
+    global_flags: Set[str]
+    slash_slack_request: SlashSlackRequest
+    exit_stack: Optional[AsyncExitStack]
+    state: Dict[str, Any]
+
+    def __init__(
+        self,
+        command: Any,
+        args: List[Any],
+        flags: Set[str],
+        global_flags: Set[str],
+        slash_slack_request: SlashSlackRequest,
+        exit_stack: Optional[AsyncExitStack] = None,
+    ):
+        self.command = command
+        self.args = args
+        self.flags = flags
+        self.global_flags = global_flags
+        self.slash_slack_request = slash_slack_request
+        self.exit_stack = exit_stack
+        self.state = {}
+
+
+Middleware = Callable[[Any, Callable[[Any], Awaitable[Any]]], Awaitable[Any]]
+
+
+def _bind(middleware: Middleware, call_next: Callable[[Any], Awaitable[Any]]):
+    async def bound(context):
+        return await middleware(context, call_next)
+
+    return bound
+
+
+def _compile_middleware(
+    middlewares: Sequence[Middleware],
+    handler: Callable[[Any], Awaitable[Any]],
+) -> Optional[Callable[[Any], Awaitable[Any]]]:
+    """
+    Compiles the middlewares into a single call chain ending in `handler`.
+    Each middleware is pre-bound to the next link so calling the chain does not iterate over the middlewares.
+    Returns None when there are no middlewares.
+    """
+    if len(middlewares) == 0:
+        return None
+    chain = handler
+    for middleware in reversed(middlewares):
+        chain = _bind(middleware, chain)
+    return chain
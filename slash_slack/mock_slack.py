@@ -2,12 +2,24 @@
 import argparse
 import asyncio
 import json
+import math
+import random
+import socket
+import struct
+import sys
 import urllib.parse
 import webbrowser
 from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatch
 from http.server import BaseHTTPRequestHandler, HTTPServer
+from time import perf_counter, time
+from typing import Callable, Dict, List, Optional, Sequence, TextIO, Tuple
 
 import aiohttp
+from aiohttp import web
+
+from slash_slack.capture import _read_capture
+from slash_slack.signature_verifier import SignatureVerifier
 
 _CALLBACK_SERVER_PORT = 9863
 _BASE_PARAMS = {
@@ -46,22 +58,167 @@ class CallbackHandler(BaseHTTPRequestHandler):
         return
 
 
-def _parse_args():
-    parser = argparse.ArgumentParser()
+def _add_server_args(parser: argparse.ArgumentParser, default=None):
     parser.add_argument(
         "--port",
-        default=9002,
+        default=9002 if default is None else default,
         type=int,
         help="The port which the SlashSlack server is running.",
     )
     parser.add_argument(
         "--path",
-        default="/slash_slack",
+        default="/slash_slack" if default is None else default,
         help="The path which the SlashSlack server is listening.",
     )
+    parser.add_argument(
+        "--host",
+        default="localhost" if default is None else default,
+        help="The host which the SlashSlack server is running.",
+    )
+
+
+def _add_callback_args(parser: argparse.ArgumentParser, default=None):
+    parser.add_argument(
+        "--callback-host",
+        default="localhost" if default is None else default,
+        help="The host the callback server listens on.",
+    )
+    parser.add_argument(
+        "--callback-port",
+        default=0 if default is None else default,
+        type=int,
+        help="The port the callback server listens on. 0 uses an ephemeral port.",
+    )
+    parser.add_argument(
+        "--callback-latency",
+        action="append",
+        type=_parse_latency,
+        default=[] if default is None else default,
+        help="Delay callback responses. DIST[@PATH_GLOB] where DIST is fixed:MS, uniform:MIN_MS:MAX_MS, normal:MEAN_MS:STDDEV_MS or exp:MEAN_MS "
+        "(EX: uniform:10:200@/callback/1*). Can be given multiple times, the first matching latency is used.",
+    )
+    parser.add_argument(
+        "--callback-fault",
+        action="append",
+        type=_parse_fault,
+        default=[] if default is None else default,
+        help="Fail a percentage of callbacks. KIND:PERCENT[@PATH_GLOB] where KIND is an HTTP status (EX: 429, 500, 503), "
+        "reset (the connection is reset) or timeout (no response is sent) (EX: 429:10, reset:1@/callback/2*). "
+        "Can be given multiple times, the first matching fault is used.",
+    )
+    parser.add_argument(
+        "--callback-retry-after",
+        default=1 if default is None else default,
+        type=int,
+        help="The Retry-After header (seconds) of 429 faults.",
+    )
+    parser.add_argument(
+        "--callback-hang",
+        default=60 if default is None else default,
+        type=float,
+        help="Seconds the connection is held open by timeout faults before it is closed.",
+    )
+    parser.add_argument(
+        "--callback-seed",
+        default=None if default is None else default,
+        type=int,
+        help="Seed for the latency and fault randomness.",
+    )
+
+
+def _add_client_args(parser: argparse.ArgumentParser, default=None):
+    _add_callback_args(parser, default=default)
+    parser.add_argument(
+        "--secret",
+        default=default,
+        help="The signing secret used to sign requests. Requests are unsigned if not given.",
+    )
+    parser.add_argument(
+        "--callback-timeout",
+        default=30 if default is None else default,
+        type=float,
+        help="The maximum seconds to wait for response_url deliveries after the last request is acknowledged.",
+    )
+    parser.add_argument(
+        "--callback-idle-timeout",
+        default=5 if default is None else default,
+        type=float,
+        help="Stop waiting for response_url deliveries once none has been received for this many seconds.",
+    )
+
+
+def _add_load_args(parser: argparse.ArgumentParser, concurrency: int):
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        default=concurrency,
+        type=int,
+        help="The maximum number of requests in flight.",
+    )
+    _add_client_args(parser, default=argparse.SUPPRESS)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
 
-    args = parser.parse_args()
-    return args.port, args.path
+
+def _parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Mock slack client for SlashSlack servers. Without a subcommand, messages are read interactively."
+    )
+    _add_server_args(parser)
+    _add_client_args(parser)
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Read command texts from stdin and write acknowledgements and response_url deliveries to stdout as JSON lines instead of opening a browser.",
+    )
+    subparsers = parser.add_subparsers(dest="mode")
+
+    bench = subparsers.add_parser(
+        "bench",
+        help="Send concurrent signed requests and report ack and end to end latency.",
+    )
+    _add_server_args(bench, default=argparse.SUPPRESS)
+    bench.add_argument(
+        "--corpus",
+        help="A file with one command text per line. Requests cycle through the lines.",
+    )
+    bench.add_argument(
+        "--text",
+        action="append",
+        default=[],
+        help="A command text to send. Can be given multiple times.",
+    )
+    bench.add_argument(
+        "-n", "--requests", default=100, type=int, help="The number of requests."
+    )
+    bench.add_argument(
+        "--rate",
+        default=0,
+        type=float,
+        help="The target request rate per second. 0 sends as fast as possible.",
+    )
+    _add_load_args(bench, concurrency=10)
+
+    replay = subparsers.add_parser(
+        "replay",
+        help="Replay a traffic capture recorded by a TrafficRecorder.",
+    )
+    _add_server_args(replay, default=argparse.SUPPRESS)
+    replay.add_argument("capture", help="The traffic capture file.")
+    replay.add_argument(
+        "--speed",
+        default=1.0,
+        type=float,
+        help="The replay speed relative to the captured arrival times (EX: 2 replays twice as fast). 0 replays as fast as possible.",
+    )
+    _add_load_args(replay, concurrency=1000)
+
+    callback_server = subparsers.add_parser(
+        "callback-server",
+        help="Run a response_url receiver which writes every delivery to stdout as a JSON line.",
+    )
+    _add_callback_args(callback_server, default=argparse.SUPPRESS)
+
+    return parser.parse_args(argv)
 
 
 _CALLBACK_SERVER_PORT = 9863
@@ -98,10 +255,10 @@ def _run_callback_server(server: HTTPServer):
         pass
 
 
-async def _send_message(port: int, path: str, data: dict):
+async def _send_message(host: str, port: int, path: str, data: dict):
     async with aiohttp.ClientSession() as session:
         async with session.post(
-            f"http://localhost:{port}{path}",
+            f"http://{host}:{port}{path}",
             data=data,
         ) as resp:
             if resp.status != 200:
@@ -114,8 +271,27 @@ async def _send_message(port: int, path: str, data: dict):
 
 
 def main():
+    args = _parse_args()
+    if args.mode == "bench":
+        asyncio.run(_bench(args))
+        return
+    if args.mode == "replay":
+        asyncio.run(_replay(args))
+        return
+    if args.mode == "callback-server":
+        try:
+            asyncio.run(_serve_callbacks(args))
+        except KeyboardInterrupt:
+            pass
+        return
+    if args.headless:
+        asyncio.run(_headless(args))
+        return
+    _interactive(args.host, args.port, args.path)
+
+
+def _interactive(host: str, port: int, path: str):
     with ThreadPoolExecutor() as th:
-        port, path = _parse_args()
         tasks = []
         server = HTTPServer(("localhost", _CALLBACK_SERVER_PORT), CallbackHandler)
         tasks.append(th.submit(_run_callback_server, server))
@@ -125,10 +301,535 @@ def main():
             while True:
                 msg = input("MSG: ")
                 t_params["text"] = msg
-                asyncio.run(_send_message(port, path, t_params))
+                asyncio.run(_send_message(host, port, path, t_params))
         except KeyboardInterrupt:
             pass
 
 
+async def _serve_callbacks(args, stream: TextIO = sys.stdout):
+    """
+    Runs the callback server until cancelled. The first line written is the response_url prefix.
+    """
+    server = _callback_server(args, stream=stream)
+    await server.start()
+    _write_json_line(
+        stream, {"type": "listening", "response_url": server.response_url("")}
+    )
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+async def _headless(
+    args, stdin: TextIO = sys.stdin, stdout: TextIO = sys.stdout
+) -> Dict[str, List[float]]:
+    """
+    Sends one request for every line of stdin, each with a unique response_url.
+    The acknowledgement and every response_url delivery is written to stdout as a JSON line tagged with the request_id.
+    Returns after stdin is closed and the outstanding deliveries are received.
+    """
+    verifier = SignatureVerifier(args.secret) if args.secret else None
+    server = _callback_server(args, stream=stdout)
+    await server.start()
+    url = f"http://{args.host}:{args.port}{args.path}"
+    loop = asyncio.get_running_loop()
+    acked: List[str] = []
+
+    async def send(request_id: str, text: str, session: aiohttp.ClientSession):
+        body = urllib.parse.urlencode(
+            {
+                **_BASE_PARAMS,
+                "text": text,
+                "response_url": server.response_url(request_id),
+            }
+        )
+        sent = perf_counter()
+        try:
+            async with session.post(
+                url, data=body, headers=_sign(verifier, body)
+            ) as resp:
+                content = await resp.read()
+                status = resp.status
+        except aiohttp.ClientError as e:
+            _write_json_line(
+                stdout, {"type": "error", "request_id": request_id, "error": repr(e)}
+            )
+            return
+        _write_json_line(
+            stdout,
+            {
+                "type": "ack",
+                "request_id": request_id,
+                "text": text,
+                "status": status,
+                "ack_ms": _to_ms(perf_counter() - sent),
+                "payload": _decode_payload(content),
+            },
+        )
+        if status < 300:
+            acked.append(request_id)
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            tasks = []
+            while True:
+                line = await loop.run_in_executor(None, stdin.readline)
+                if line == "":
+                    break
+                text = line.rstrip("\n")
+                if text.strip() == "":
+                    continue
+                tasks.append(asyncio.create_task(send(str(len(tasks)), text, session)))
+            await asyncio.gather(*tasks)
+        await server.wait_for(acked, args.callback_timeout, args.callback_idle_timeout)
+    finally:
+        await server.stop()
+    return server.deliveries
+
+
+def _percentile(values: List[float], percentile: float) -> Optional[float]:
+    """
+    Nearest rank percentile of the values.
+    """
+    if len(values) == 0:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(percentile / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def _summarize_latencies(values: List[float]) -> dict:
+    return {
+        "count": len(values),
+        "p50_ms": _to_ms(_percentile(values, 50)),
+        "p95_ms": _to_ms(_percentile(values, 95)),
+        "p99_ms": _to_ms(_percentile(values, 99)),
+        "max_ms": _to_ms(max(values, default=None)),
+    }
+
+
+def _to_ms(value: Optional[float]) -> Optional[float]:
+    if value is None:
+        return None
+    return round(value * 1000, 3)
+
+
+class _Latency:
+    """
+    A latency distribution (in seconds) applied to callbacks whose path matches `path` (a glob, None matches every path).
+    """
+
+    __slots__ = ("spec", "sample", "path")
+
+    def __init__(
+        self,
+        spec: str,
+        sample: Callable[[random.Random], float],
+        path: Optional[str] = None,
+    ):
+        self.spec = spec
+        self.sample = sample
+        self.path = path
+
+
+class _Fault:
+    """
+    A fault injected into `probability` of the callbacks whose path matches `path` (a glob, None matches every path).
+    `kind` is an HTTP status code, `reset` or `timeout`.
+    """
+
+    __slots__ = ("kind", "probability", "path")
+
+    def __init__(self, kind: str, probability: float, path: Optional[str] = None):
+        self.kind = kind
+        self.probability = probability
+        self.path = path
+
+
+_FAULT_KINDS = ("reset", "timeout")
+
+
+def _split_path(spec: str) -> Tuple[str, Optional[str]]:
+    spec, _, path = spec.partition("@")
+    return spec, path if path else None
+
+
+def _parse_latency(spec: str) -> _Latency:
+    distribution, path = _split_path(spec)
+    name, *params = distribution.split(":")
+    try:
+        values = [float(p) / 1000 for p in params]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid latency {spec}.")
+    samplers = {
+        ("fixed", 1): lambda r: values[0],
+        ("uniform", 2): lambda r: r.uniform(values[0], values[1]),
+        ("normal", 2): lambda r: max(r.gauss(values[0], values[1]), 0),
+        ("exp", 1): lambda r: r.expovariate(1 / values[0]) if values[0] > 0 else 0,
+    }
+    sample = samplers.get((name, len(values)))
+    if sample is None:
+        raise argparse.ArgumentTypeError(
+            f"Invalid latency {spec}. Must be fixed:MS, uniform:MIN_MS:MAX_MS, normal:MEAN_MS:STDDEV_MS or exp:MEAN_MS."
+        )
+    return _Latency(spec, sample, path)
+
+
+def _parse_fault(spec: str) -> _Fault:
+    fault, path = _split_path(spec)
+    kind, _, percent = fault.partition(":")
+    if kind not in _FAULT_KINDS and not (kind.isdigit() and len(kind) == 3):
+        raise argparse.ArgumentTypeError(
+            f"Invalid fault {spec}. The kind must be an HTTP status, reset or timeout."
+        )
+    try:
+        probability = float(percent) / 100
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Invalid fault {spec}. Must be KIND:PERCENT[@PATH_GLOB]."
+        )
+    return _Fault(kind, probability, path)
+
+
+def _matches(path: str, pattern: Optional[str]) -> bool:
+    return pattern is None or fnmatch(path, pattern)
+
+
+class _CallbackServer:
+    """
+    asyncio callback receiver standing in for slack's response_url endpoint.
+
+    Every request is given a unique response_url (`/callback/<request_id>`) so each delivery can be correlated with its request.
+    The arrival time of every delivery is recorded with `perf_counter`.
+    If `stream` is given every delivery is written to it as a JSON line.
+
+    To exercise slow or failing response_urls callbacks can be delayed by `latencies` and failed by `faults`.
+    The first latency and the first fault matching the path of a callback are used. Failed callbacks are counted in `faults_injected`
+    and are not recorded as deliveries. `reset` faults reset the connection, `timeout` faults hold the connection open
+    for `hang` seconds without responding, and 429 faults include a `Retry-After` header of `retry_after` seconds.
+    """
+
+    host: str
+    port: int
+    deliveries: Dict[str, List[float]]
+    faults_injected: Dict[str, int]
+    stream: Optional[TextIO] = None
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 0,
+        stream: Optional[TextIO] = None,
+        latencies: Sequence[_Latency] = (),
+        faults: Sequence[_Fault] = (),
+        retry_after: int = 1,
+        hang: float = 60,
+        seed: Optional[int] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.stream = stream
+        self.latencies = latencies
+        self.faults = faults
+        self.retry_after = retry_after
+        self.hang = hang
+        self.deliveries = {}
+        self.faults_injected = {}
+        self._random = random.Random(seed)
+        self._last_delivery = perf_counter()
+        self._delivered = asyncio.Event()
+        self._runner: Optional[web.AppRunner] = None
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/callback/{request_id}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def response_url(self, request_id: str) -> str:
+        return f"http://{self.host}:{self.port}/callback/{request_id}"
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        request_id = request.match_info["request_id"]
+        body = await request.read()
+        for latency in self.latencies:
+            if _matches(request.path, latency.path):
+                await asyncio.sleep(latency.sample(self._random))
+                break
+        for fault in self.faults:
+            if (
+                _matches(request.path, fault.path)
+                and self._random.random() < fault.probability
+            ):
+                return await self._inject(request, request_id, fault)
+        received = perf_counter()
+        self.deliveries.setdefault(request_id, []).append(received)
+        self._last_delivery = received
+        self._delivered.set()
+        if self.stream is not None:
+            _write_json_line(
+                self.stream,
+                {
+                    "type": "delivery",
+                    "request_id": request_id,
+                    "received_at": time(),
+                    "payload": _decode_payload(body),
+                },
+            )
+        return web.Response(status=200)
+
+    async def _inject(
+        self, request: web.Request, request_id: str, fault: _Fault
+    ) -> web.StreamResponse:
+        self.faults_injected[fault.kind] = self.faults_injected.get(fault.kind, 0) + 1
+        if self.stream is not None:
+            _write_json_line(
+                self.stream,
+                {
+                    "type": "fault",
+                    "request_id": request_id,
+                    "received_at": time(),
+                    "fault": fault.kind,
+                },
+            )
+        if fault.kind == "timeout":
+            await asyncio.sleep(self.hang)
+        if fault.kind in _FAULT_KINDS:
+            transport = request.transport
+            if transport is not None:
+                sock = transport.get_extra_info("socket")
+                if sock is not None:
+                    # Closing with a zero linger time sends a RST instead of a FIN.
+                    sock.setsockopt(
+                        socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0)
+                    )
+                transport.abort()
+            return web.Response(status=500)
+        headers = {}
+        if fault.kind == "429":
+            headers["Retry-After"] = str(self.retry_after)
+        return web.Response(status=int(fault.kind), headers=headers)
+
+    async def wait_for(
+        self,
+        request_ids: List[str],
+        timeout: float,
+        idle_timeout: Optional[float] = None,
+    ):
+        """
+        Waits until every request has received at least one delivery, the timeout expires,
+        or no delivery has been received for `idle_timeout` seconds.
+
+        Requests answered immediately (EX: help) never receive a delivery, the idle timeout stops waiting for them.
+        """
+        now = perf_counter()
+        deadline = now + timeout
+        self._last_delivery = max(self._last_delivery, now)
+        pending = [r for r in request_ids if r not in self.deliveries]
+        while len(pending) > 0:
+            until = deadline
+            if idle_timeout is not None:
+                until = min(until, self._last_delivery + idle_timeout)
+            remaining = until - perf_counter()
+            if remaining <= 0:
+                return
+            self._delivered.clear()
+            try:
+                await asyncio.wait_for(self._delivered.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+            pending = [r for r in pending if r not in self.deliveries]
+
+
+def _callback_server(args, stream: Optional[TextIO] = None) -> _CallbackServer:
+    return _CallbackServer(
+        args.callback_host,
+        args.callback_port,
+        stream=stream,
+        latencies=args.callback_latency,
+        faults=args.callback_fault,
+        retry_after=args.callback_retry_after,
+        hang=args.callback_hang,
+        seed=args.callback_seed,
+    )
+
+
+def _decode_payload(body: bytes):
+    if len(body) == 0:
+        return None
+    try:
+        return json.loads(body)
+    except ValueError:
+        return body.decode(errors="replace")
+
+
+def _write_json_line(stream: TextIO, record: dict):
+    stream.write(json.dumps(record))
+    stream.write("\n")
+    stream.flush()
+
+
+def _load_corpus(corpus: Optional[str], texts: List[str]) -> List[str]:
+    lines = list(texts)
+    if corpus is not None:
+        with open(corpus) as f:
+            lines.extend(line.rstrip("\n") for line in f if line.strip())
+    return lines
+
+
+def _sign(verifier: Optional[SignatureVerifier], body: str) -> Dict[str, str]:
+    headers = {"Content-Type": "application/x-www-form-urlencoded"}
+    if verifier is None:
+        return headers
+    timestamp = str(int(time()))
+    signature = verifier.generate_signature(timestamp=timestamp, body=body)
+    headers["X-Slack-Request-Timestamp"] = timestamp
+    headers["X-Slack-Signature"] = signature
+    return headers
+
+
+async def _bench(args) -> dict:
+    corpus = _load_corpus(args.corpus, args.text)
+    if len(corpus) == 0:
+        print("A --corpus file or at least one --text is required.", file=sys.stderr)
+        sys.exit(2)
+    schedule = [
+        (
+            i / args.rate if args.rate > 0 else None,
+            {**_BASE_PARAMS, "text": corpus[i % len(corpus)]},
+        )
+        for i in range(args.requests)
+    ]
+    return await _run_load(args, schedule)
+
+
+async def _replay(args) -> dict:
+    captured = sorted(_read_capture(args.capture), key=lambda r: r.timestamp)
+    if len(captured) == 0:
+        print(f"The capture {args.capture} is empty.", file=sys.stderr)
+        sys.exit(2)
+    first = captured[0].timestamp
+    schedule = [
+        (
+            (request.timestamp - first) / args.speed if args.speed > 0 else None,
+            request.params,
+        )
+        for request in captured
+    ]
+    return await _run_load(args, schedule)
+
+
+async def _run_load(
+    args, schedule: List[Tuple[Optional[float], Dict[str, str]]]
+) -> dict:
+    """
+    Sends each request of the schedule at its offset (seconds from the start, None to send immediately)
+    with a unique response_url and reports the ack and end to end latencies.
+    """
+    verifier = SignatureVerifier(args.secret) if args.secret else None
+    server = _callback_server(args)
+    await server.start()
+    url = f"http://{args.host}:{args.port}{args.path}"
+    semaphore = asyncio.Semaphore(args.concurrency)
+    sent: Dict[str, float] = {}
+    send_lags: List[float] = []
+    ack_latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    acked: List[str] = []
+    errors = 0
+
+    async def send(i: int, session: aiohttp.ClientSession):
+        nonlocal errors
+        offset, params = schedule[i]
+        if offset is not None:
+            await asyncio.sleep(max(start + offset - perf_counter(), 0))
+        request_id = str(i)
+        body = urllib.parse.urlencode(
+            {**params, "response_url": server.response_url(request_id)}
+        )
+        async with semaphore:
+            sent[request_id] = perf_counter()
+            if offset is not None:
+                send_lags.append(sent[request_id] - start - offset)
+            try:
+                async with session.post(
+                    url, data=body, headers=_sign(verifier, body)
+                ) as resp:
+                    await resp.read()
+                    status = resp.status
+            except aiohttp.ClientError:
+                errors += 1
+                return
+            ack_latencies.append(perf_counter() - sent[request_id])
+        statuses[status] = statuses.get(status, 0) + 1
+        if status < 300:
+            acked.append(request_id)
+
+    try:
+        async with aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=args.concurrency)
+        ) as session:
+            start = perf_counter()
+            await asyncio.gather(*(send(i, session) for i in range(len(schedule))))
+            duration = perf_counter() - start
+        await server.wait_for(acked, args.callback_timeout, args.callback_idle_timeout)
+    finally:
+        await server.stop()
+
+    end_to_end = [
+        server.deliveries[request_id][0] - sent[request_id]
+        for request_id in acked
+        if request_id in server.deliveries
+    ]
+    report = {
+        "requests": len(schedule),
+        "errors": errors,
+        "statuses": statuses,
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(len(ack_latencies) / duration, 3) if duration else None,
+        "send_lag": _summarize_latencies(send_lags),
+        "ack_latency": _summarize_latencies(ack_latencies),
+        "end_to_end_latency": _summarize_latencies(end_to_end),
+        "callbacks_received": len(end_to_end),
+        "callback_faults": server.faults_injected,
+    }
+    if args.json:
+        print(json.dumps(report))
+    else:
+        _print_report(report)
+    return report
+
+
+def _print_report(report: dict):
+    def latency_line(name: str, latencies: dict) -> str:
+        return (
+            f"{name} (ms): p50 {latencies['p50_ms']}  p95 {latencies['p95_ms']}  "
+            f"p99 {latencies['p99_ms']}  max {latencies['max_ms']}"
+        )
+
+    print(
+        f"Requests: {report['requests']}  Errors: {report['errors']}  Statuses: {report['statuses']}"
+    )
+    print(
+        f"Duration: {report['duration_s']}s  Throughput: {report['throughput_rps']} req/s"
+    )
+    if report["send_lag"]["count"]:
+        print(latency_line("Send lag behind schedule", report["send_lag"]))
+    print(latency_line("Ack latency", report["ack_latency"]))
+    print(latency_line("End to end latency", report["end_to_end_latency"]))
+    print(f"Callbacks received: {report['callbacks_received']}")
+    if report["callback_faults"]:
+        print(f"Callback faults injected: {report['callback_faults']}")
+
+
 if __name__ == "__main__":
     main()
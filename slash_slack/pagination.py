@@ -0,0 +1,195 @@
+import itertools
+import secrets
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Callable, Iterable, List, Optional, Tuple, Union
+
+from slash_slack.blocks import (
+    _MAX_BLOCKS_PER_MESSAGE,
+    _iter_blocks,
+    _make_header_block,
+)
+from slash_slack.exceptions import InvalidPageSizeException
+
+PAGE_ACTION_ID_PREFIX = "slash_slack.page"
+PREVIOUS_PAGE_ACTION_ID = f"{PAGE_ACTION_ID_PREFIX}.previous"
+NEXT_PAGE_ACTION_ID = f"{PAGE_ACTION_ID_PREFIX}.next"
+# The header, page context and buttons take up to 3 blocks of each page message.
+_MAX_PAGE_BLOCKS = _MAX_BLOCKS_PER_MESSAGE - 3
+
+
+class Paginated:
+    """
+    Return from a command function to send a long result one page at a time.
+
+    Each item (str or block kit dict) is one entry of a page. The items are materialized once when the command returns,
+    only the first page is sent with Previous/Next buttons. Later pages are served from the app's `PageCache`
+    by the interactivity endpoint (`{url_path}/interactivity`) without running the command again.
+    """
+
+    items: List[Union[str, dict]]
+    page_size: int
+    header: Optional[str] = None
+
+    def __init__(
+        self,
+        items: Iterable[Union[str, dict]],
+        page_size: int = 10,
+        header: Optional[str] = None,
+    ):
+        if not 0 < page_size <= _MAX_PAGE_BLOCKS:
+            raise InvalidPageSizeException(
+                f"Invalid page size ({page_size}). Must be between 1 and {_MAX_PAGE_BLOCKS}."
+            )
+        self.items = list(items)
+        self.page_size = page_size
+        self.header = header
+
+    @property
+    def page_count(self) -> int:
+        return max(1, -(-len(self.items) // self.page_size))
+
+    def page(self, number: int) -> List[Union[str, dict]]:
+        """
+        Returns the items of a page. Pages are numbered from 1.
+        """
+        start = (number - 1) * self.page_size
+        return self.items[start : start + self.page_size]
+
+
+class PageCache:
+    """
+    A bounded cache of paginated results keyed by an opaque token.
+
+    Results expire `ttl` seconds after they are added. When more than `max_size` results are cached the oldest is evicted.
+    As every result lives for the same `ttl` the oldest results are always the first to expire,
+    so expired results are purged from the front of the cache when results are added.
+    """
+
+    max_size: int
+    ttl: float
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        ttl: float = 60 * 60,
+        clock: Callable[[], float] = monotonic,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def put(self, value: Any) -> str:
+        """
+        Caches the value and returns its token.
+        """
+        now = self.clock()
+        self._purge(now)
+        while len(self._entries) >= self.max_size:
+            self._entries.popitem(last=False)
+        token = secrets.token_urlsafe(16)
+        self._entries[token] = (now + self.ttl, value)
+        return token
+
+    def get(self, token: str) -> Optional[Any]:
+        """
+        Returns the cached value, or None if the token is unknown or has expired.
+        """
+        entry = self._entries.get(token)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self.clock():
+            del self._entries[token]
+            return None
+        return value
+
+    def _purge(self, now: float):
+        while self._entries:
+            token, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at > now:
+                break
+            del self._entries[token]
+
+
+class _CachedPages:
+    """
+    A paginated result as stored in the `PageCache`.
+    """
+
+    __slots__ = ("paginated", "visible_in_channel")
+
+    def __init__(self, paginated: Paginated, visible_in_channel: bool):
+        self.paginated = paginated
+        self.visible_in_channel = visible_in_channel
+
+
+def _make_page_button(text: str, action_id: str, token: str, page: int) -> dict:
+    return {
+        "type": "button",
+        "text": {"type": "plain_text", "text": text},
+        "action_id": action_id,
+        "value": f"{token}:{page}",
+    }
+
+
+def _make_page_message(
+    paginated: Paginated,
+    page: int,
+    token: Optional[str],
+    visible_in_channel: bool,
+) -> dict:
+    """
+    Generates the block kit message of a page. Pages other than the last have a Next button, pages other than the first a Previous button.
+    """
+    page_count = paginated.page_count
+    page = min(max(page, 1), page_count)
+    blocks: List[dict] = []
+    if paginated.header:
+        blocks.append(_make_header_block(paginated.header))
+    # Items which are long strings can span multiple blocks, the page is truncated to stay within the block limit.
+    blocks.extend(
+        itertools.islice(_iter_blocks(paginated.page(page)), _MAX_PAGE_BLOCKS)
+    )
+    if token is not None and page_count > 1:
+        blocks.append(
+            {
+                "type": "context",
+                "elements": [
+                    {"type": "mrkdwn", "text": f"Page {page} of {page_count}"}
+                ],
+            }
+        )
+        buttons = []
+        if page > 1:
+            buttons.append(
+                _make_page_button("Previous", PREVIOUS_PAGE_ACTION_ID, token, page - 1)
+            )
+        if page < page_count:
+            buttons.append(
+                _make_page_button("Next", NEXT_PAGE_ACTION_ID, token, page + 1)
+            )
+        blocks.append({"type": "actions", "elements": buttons})
+    return {
+        "blocks": blocks,
+        "response_type": "in_channel" if visible_in_channel else "ephemeral",
+    }
+
+
+def _parse_page_action(payload: dict) -> Optional[Tuple[str, int]]:
+    """
+    Returns the token and page of a page button click from an interactivity payload, or None for any other interaction.
+    """
+    if payload.get("type") != "block_actions":
+        return None
+    for action in payload.get("actions", ()):
+        if not str(action.get("action_id", "")).startswith(PAGE_ACTION_ID_PREFIX):
+            continue
+        token, _, page = str(action.get("value", "")).rpartition(":")
+        if token and page.isdigit():
+            return token, int(page)
+    return None
@@ -0,0 +1,156 @@
+import cProfile
+import io
+import itertools
+import logging
+import os
+import pstats
+import re
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from slash_slack.blocks import _iter_blocks, _make_mrkdown_block
+from slash_slack.pagination import Paginated
+
+logger = logging.getLogger("slash_slack")
+
+_UNSAFE_FILENAME_CHARACTERS = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+class _ProfiledCoroutine:
+    """
+    Awaitable which drives a coroutine with the profiler enabled only while the coroutine itself is running.
+    Other tasks which run on the event loop while the coroutine is suspended are not profiled.
+    """
+
+    def __init__(self, coroutine, profile: cProfile.Profile):
+        self.coroutine = coroutine
+        self.profile = profile
+
+    def __await__(self):
+        value: Any = None
+        error: Optional[BaseException] = None
+        while True:
+            self.profile.enable()
+            try:
+                if error is None:
+                    yielded = self.coroutine.send(value)
+                else:
+                    yielded = self.coroutine.throw(error)
+            except StopIteration as e:
+                return e.value
+            finally:
+                self.profile.disable()
+            try:
+                value = yield yielded
+                error = None
+            except GeneratorExit:
+                self.coroutine.close()
+                raise
+            except BaseException as e:
+                value = None
+                error = e
+
+
+class _ProfiledPaginated:
+    """
+    A paginated response with the profile summary, which is sent as a separate message after the first page.
+    """
+
+    __slots__ = ("paginated", "summary_blocks")
+
+    def __init__(self, paginated: Paginated, summary_blocks: List[dict]):
+        self.paginated = paginated
+        self.summary_blocks = summary_blocks
+
+
+class Profiler:
+    """
+    Profiles command invocations which are run with the `--profile` global flag.
+
+    Only users whose Slack user id is in `user_ids` are allowed to profile commands.
+    The top `top_n` functions (by cumulative time) are attached to the command response.
+    If `directory` is given, the complete profile is also written to a `.pstats` file in that directory.
+    """
+
+    user_ids: set
+    directory: Optional[str] = None
+    top_n: int = 20
+
+    def __init__(
+        self,
+        user_ids: Iterable[str],
+        directory: Optional[str] = None,
+        top_n: int = 20,
+    ):
+        self.user_ids = set(user_ids)
+        self.directory = directory
+        self.top_n = top_n
+
+    def is_authorized(self, user_id: str) -> bool:
+        return user_id in self.user_ids
+
+    async def run(
+        self,
+        command: str,
+        func: Callable,
+        is_async: bool,
+        f_args: List[Any],
+        user_id: str,
+    ):
+        """
+        Runs the command function under cProfile and returns the response with the profile summary appended.
+        Generator responses are consumed while profiling so that their work is included in the profile.
+        A `Paginated` response is kept as is, its summary is sent after the first page.
+        """
+        profile = cProfile.Profile()
+        if is_async:
+            response = await _ProfiledCoroutine(func(*f_args), profile)
+        else:
+            profile.enable()
+            try:
+                response = func(*f_args)
+            finally:
+                profile.disable()
+        if isinstance(response, Iterator):
+            profile.enable()
+            try:
+                response = list(response)
+            finally:
+                profile.disable()
+
+        summary_blocks = []
+        if self.directory is not None:
+            # Written in the thread pool, so the disk I/O does not block the event loop.
+            path = await run_in_threadpool(self._dump, profile, command, user_id)
+            summary_blocks.append(_make_mrkdown_block(f"Profile written to `{path}`"))
+        if self.top_n > 0:
+            summary_blocks.append(
+                _make_mrkdown_block(f"```\n{self._summarize(profile)}\n```")
+            )
+        if isinstance(response, Paginated):
+            return _ProfiledPaginated(response, summary_blocks)
+        if response is None or response == "":
+            return summary_blocks
+        return itertools.chain(_iter_blocks(response), summary_blocks)
+
+    def _summarize(self, profile: cProfile.Profile) -> str:
+        stream = io.StringIO()
+        stats = pstats.Stats(profile, stream=stream)
+        stats.strip_dirs().sort_stats("cumulative").print_stats(self.top_n)
+        summary = stream.getvalue().strip()
+        # Slack rejects sections with more than 3000 characters (the code fence takes 8).
+        return summary[:2992]
+
+    def _dump(self, profile: cProfile.Profile, command: str, user_id: str) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        filename = _UNSAFE_FILENAME_CHARACTERS.sub(
+            "_",
+            f"{command}-{user_id}-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%f')}",
+        )
+        path = os.path.join(self.directory, f"{filename}.pstats")
+        profile.dump_stats(path)
+        logger.info(f"Wrote profile of {command} to {path}")
+        return path
@@ -0,0 +1,125 @@
+import asyncio
+from collections import deque
+from typing import Any, Callable, Coroutine, Deque, Dict, Optional
+
+from slash_slack.drain import EXECUTING, QUEUED, _set_stage
+from slash_slack.exceptions import InvalidPriorityException
+
+HIGH = "high"
+NORMAL = "normal"
+LOW = "low"
+PRIORITIES = (HIGH, NORMAL, LOW)
+
+DEFAULT_CONCURRENCY = 100
+DEFAULT_WEIGHTS = {HIGH: 6, NORMAL: 3, LOW: 1}
+
+
+class PriorityScheduler:
+    """
+    Limits the number of command executions running at once to `concurrency`. Executions over the limit wait in
+    a queue per priority class (`high`, `normal` or `low`, see `SlashSlack.command`).
+
+    When an execution finishes its slot is handed to a waiting execution chosen by smooth weighted round robin:
+    while every queue has waiting executions they are dequeued in proportion to `weights` (6:3:1 by default),
+    so high priority commands wait the least and low priority commands are never starved.
+    A queue which empties loses its accumulated credit, so it can not burst ahead when it fills again.
+    """
+
+    concurrency: int
+    weights: Dict[str, int]
+
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        weights: Optional[Dict[str, int]] = None,
+    ):
+        weights = dict(weights) if weights is not None else dict(DEFAULT_WEIGHTS)
+        if set(weights) != set(PRIORITIES) or any(
+            not isinstance(weight, int) or weight < 1 for weight in weights.values()
+        ):
+            raise InvalidPriorityException(
+                f"The scheduler weights ({weights}) must have a positive int weight for each of {PRIORITIES}."
+            )
+        self.concurrency = concurrency
+        self.weights = weights
+        self.running = 0
+        self._queues: Dict[str, Deque[asyncio.Future]] = {
+            priority: deque() for priority in PRIORITIES
+        }
+        self._credits = {priority: 0 for priority in PRIORITIES}
+
+    def queued(self) -> Dict[str, int]:
+        """
+        Returns the number of executions waiting in each priority class.
+        """
+        return {priority: len(queue) for priority, queue in self._queues.items()}
+
+    async def run(
+        self,
+        priority: str,
+        func: Callable[..., Coroutine[Any, Any, Any]],
+        *args,
+        **kwargs,
+    ):
+        """
+        Waits for a slot in the `priority` class and runs `func(*args, **kwargs)`.
+        """
+        await self.acquire(priority)
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            self.release()
+
+    async def acquire(self, priority: str):
+        """
+        Waits for a slot in the `priority` class. Every acquired slot must be given back with `release`.
+        """
+        if self.running < self.concurrency and not any(self._queues.values()):
+            self.running += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        queue = self._queues[priority]
+        queue.append(future)
+        _set_stage(QUEUED)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.cancelled():
+                # A release may have already skipped it.
+                if future in queue:
+                    queue.remove(future)
+            else:
+                # The slot was handed over as the waiter was cancelled.
+                self.release()
+            raise
+        _set_stage(EXECUTING)
+
+    def release(self):
+        """
+        Hands the slot to the next waiting execution, or frees it when none is waiting.
+        """
+        while True:
+            future = self._next_waiter()
+            if future is None:
+                self.running -= 1
+                return
+            if not future.done():
+                future.set_result(None)
+                return
+
+    def _next_waiter(self) -> Optional[asyncio.Future]:
+        total = 0
+        chosen = None
+        for priority in PRIORITIES:
+            if not self._queues[priority]:
+                self._credits[priority] = 0
+                continue
+            weight = self.weights[priority]
+            self._credits[priority] += weight
+            total += weight
+            if chosen is None or self._credits[priority] > self._credits[chosen]:
+                chosen = priority
+        if chosen is None:
+            return None
+        self._credits[chosen] -= total
+        return self._queues[chosen].popleft()
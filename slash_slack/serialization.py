@@ -0,0 +1,71 @@
+import json
+from typing import Any, Callable
+
+from fastapi import Response
+
+from slash_slack.blocks import _make_block_message
+
+JSONEncoder = Callable[[Any], bytes]
+
+_TEXT_PLACEHOLDER = "__slash_slack_text_placeholder__"
+
+
+def _stdlib_json_encoder(obj: Any) -> bytes:
+    """
+    Encodes the object into compact utf-8 JSON using the standard library.
+    """
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _get_default_json_encoder() -> JSONEncoder:
+    """
+    Returns the fastest available JSON encoder. orjson and msgspec are used if they are installed,
+    otherwise the standard library is used.
+    """
+    try:
+        import orjson
+
+        return orjson.dumps
+    except ImportError:
+        pass
+    try:
+        import msgspec
+
+        return msgspec.json.Encoder().encode
+    except ImportError:
+        pass
+    return _stdlib_json_encoder
+
+
+def _json_response(body: bytes, status_code: int = 200) -> Response:
+    """
+    Wraps already serialized JSON in a response.
+
+    A new response is created for every request as FastAPI attaches background tasks to the response object.
+    """
+    return Response(
+        content=body, status_code=status_code, media_type="application/json"
+    )
+
+
+class PreSerializedMessage:
+    """
+    A single mrkdwn section block message which is serialized once.
+    The text is serialized on its own and spliced into the pre-serialized message when rendered.
+    """
+
+    prefix: bytes
+    suffix: bytes
+    json_encoder: JSONEncoder
+
+    def __init__(self, json_encoder: JSONEncoder, visible_in_channel: bool = False):
+        self.json_encoder = json_encoder
+        serialized = json_encoder(
+            _make_block_message(
+                _TEXT_PLACEHOLDER, visible_in_channel=visible_in_channel
+            )
+        )
+        self.prefix, self.suffix = serialized.split(json_encoder(_TEXT_PLACEHOLDER), 1)
+
+    def render(self, text: str) -> bytes:
+        return self.prefix + self.json_encoder(text) + self.suffix
@@ -50,7 +50,7 @@ class SignatureVerifier:
         if timestamp is None or signature is None:
             return False
 
-        if abs(self.clock.now() - int(timestamp)) > 60 * 5:
+        if not self.is_valid_timestamp(timestamp):
             return False
 
         calculated_signature = self.generate_signature(timestamp=timestamp, body=body)
@@ -58,6 +58,27 @@ class SignatureVerifier:
             return False
         return hmac.compare_digest(calculated_signature, signature)
 
+    def is_valid_timestamp(self, timestamp: str) -> bool:
+        """Verifies the request timestamp is within 5 minutes of the current time"""
+        try:
+            return abs(self.clock.now() - int(timestamp)) <= 60 * 5
+        except ValueError:
+            return False
+
+    def new_hash(self, timestamp: str) -> "hmac.HMAC":
+        """Starts an incremental signature for a request body.
+        The body is added with `update` as it is read, then checked with `is_valid_hash`.
+        """
+        return hmac.new(
+            str.encode(self.signing_secret),
+            str.encode(f"v0:{timestamp}:"),
+            hashlib.sha256,
+        )
+
+    def is_valid_hash(self, request_hash: "hmac.HMAC", signature: str) -> bool:
+        """Verifies if the given signature matches an incremental signature"""
+        return hmac.compare_digest(f"v0={request_hash.hexdigest()}", signature)
+
     def generate_signature(
         self, *, timestamp: str, body: Union[str, bytes]
     ) -> Optional[str]:
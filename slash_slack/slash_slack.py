@@ -1,11 +1,28 @@
+import hmac
 import inspect
+import json
 import logging
-import re
-from typing import Any, Callable, Coroutine, Dict, List, Optional, Set, Tuple, Union
+from contextlib import asynccontextmanager
+from time import perf_counter, time
+from types import MappingProxyType
+from typing import (
+    AbstractSet,
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 from urllib.parse import parse_qsl
 
 from fastapi import BackgroundTasks, FastAPI, HTTPException, Request, Response
-from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
 from pydantic import ValidationError
 
 from slash_slack.arg_types import (
@@ -13,24 +30,73 @@ from slash_slack.arg_types import (
     FlagType,
     FloatType,
     IntType,
+    OptionType,
     StringType,
     UnknownLengthListType,
 )
 from slash_slack.blocks import _make_block_message
+from slash_slack.capture import TrafficRecorder
+from slash_slack.dependencies import Dependency, _DependencyContainer
+from slash_slack.drain import DELIVERING, _Execution, _ExecutionTracker
 from slash_slack.exceptions import (
+    AppFrozenException,
     DuplicateCommandException,
     InvalidAnnotationException,
+    InvalidBeforeRequestFunctionPhaseException,
+    InvalidCommandException,
+    InvalidMiddlewareException,
+    InvalidPriorityException,
     InvalidDefaultValueException,
     MultipleSlashSlackRequestParametersException,
     NoSigningSecretException,
     ParamAfterUnknownLengthListException,
 )
+from slash_slack.access_log import AccessLog
+from slash_slack.health import HealthCheck
+from slash_slack.hooks import (
+    AFTER_ACK,
+    BEFORE_ACK,
+    BEFORE_EXECUTE,
+    PHASES,
+    BeforeRequestFunction,
+    _run_before_request_functions,
+)
+from slash_slack.http_client import HttpClient
+from slash_slack.memory import MemoryTracker
+from slash_slack.middleware import (
+    ACK,
+    EXECUTE,
+    MIDDLEWARE_PHASES,
+    AckContext,
+    Middleware,
+    _compile_middleware,
+)
+from slash_slack.pagination import (
+    PageCache,
+    _CachedPages,
+    _make_page_message,
+    _parse_page_action,
+)
+from slash_slack.profiling import Profiler
+from slash_slack.scheduler import NORMAL, PRIORITIES, PriorityScheduler
+from slash_slack.serialization import (
+    JSONEncoder,
+    PreSerializedMessage,
+    _get_default_json_encoder,
+    _json_response,
+)
 from slash_slack.signature_verifier import SignatureVerifier
-from slash_slack.slash_slack_command import SlashSlackCommand
+from slash_slack.slash_slack_command import SlashSlackCommand, _call_command
 from slash_slack.slash_slack_request import SlashSlackRequest
+from slash_slack.tokenizer import _tokenize_spans
+from slash_slack.tracing import Tracer, _combine_tracers, _set_attributes, _trace
+from slash_slack.watchdog import LoopWatchdog
 
 logger = logging.getLogger("slash_slack")
 
+DEFAULT_MAX_BODY_SIZE = 64 * 1024
+DEFAULT_DRAIN_TIMEOUT = 20.0
+
 
 class SlashSlack:
     """
@@ -42,11 +108,27 @@ class SlashSlack:
     description: str
     contact: Optional[str] = None
     app: FastAPI
-    commands: Dict[str, SlashSlackCommand]
+    commands: Mapping[str, SlashSlackCommand]
     dev: bool
     signature_verifier: SignatureVerifier
-    before_request_functions: List[Callable]
+    before_request_functions: List[BeforeRequestFunction]
+    middlewares: Dict[str, List[Middleware]]
     acknowledge_response: Optional[dict] = None
+    json_encoder: JSONEncoder
+    tracer: Optional[Tracer] = None
+    profiler: Optional[Profiler] = None
+    memory_tracker: Optional[MemoryTracker] = None
+    access_log: Optional[AccessLog] = None
+    traffic_recorder: Optional[TrafficRecorder] = None
+    max_body_size: Optional[int] = DEFAULT_MAX_BODY_SIZE
+    page_cache: PageCache
+    http_client: HttpClient
+    drain_timeout: float = DEFAULT_DRAIN_TIMEOUT
+    slash_commands: Tuple[str, ...] = ()
+    health_check: Optional[HealthCheck] = None
+    watchdog: Optional[LoopWatchdog] = None
+    scheduler: PriorityScheduler
+    frozen: bool = False
 
     def __init__(
         self,
@@ -56,6 +138,20 @@ class SlashSlack:
         description: str = "",
         contact: Optional[str] = None,
         acknowledge_response: Union[None, str, dict] = None,
+        json_encoder: Optional[JSONEncoder] = None,
+        tracer: Optional[Tracer] = None,
+        profiler: Optional[Profiler] = None,
+        memory_tracker: Optional[MemoryTracker] = None,
+        access_log: Optional[AccessLog] = None,
+        traffic_recorder: Optional[TrafficRecorder] = None,
+        max_body_size: Optional[int] = DEFAULT_MAX_BODY_SIZE,
+        page_cache: Optional[PageCache] = None,
+        http_client: Optional[HttpClient] = None,
+        drain_timeout: float = DEFAULT_DRAIN_TIMEOUT,
+        slash_commands: Sequence[str] = (),
+        health_check: Optional[HealthCheck] = None,
+        watchdog: Optional[LoopWatchdog] = None,
+        scheduler: Optional[PriorityScheduler] = None,
     ):
         """
         Create a Slash Slack app.
@@ -63,19 +159,94 @@ class SlashSlack:
 
         To respond to the initial request with a non-blank response pass in a value for `acknowledge_response`
         The value will be passed into `blocks._make_block_message` and should be formatted as such.
+
+        `json_encoder` is used to serialize responses and must return `bytes`.
+        By default orjson or msgspec is used if installed, otherwise the standard library json module.
+
+        To trace the stages of each request pass in a `tracing.Tracer` (EX: `tracing.OpenTelemetryTracer()`) as `tracer`.
+
+        To allow admins to profile commands with the `--profile` global flag pass in a `profiling.Profiler` as `profiler`.
+
+        To record the memory allocated by each command pass in a `memory.MemoryTracker` as `memory_tracker`.
+
+        To write a structured access log record for each request pass in an `access_log.AccessLog` as `access_log`.
+
+        To capture the traffic to the endpoint for `mock-slack replay` pass in a `capture.TrafficRecorder` as `traffic_recorder`.
+
+        Request bodies larger than `max_body_size` bytes are rejected with a 413 as soon as the limit is exceeded.
+        Pass None to disable the limit.
+
+        Commands which return a `pagination.Paginated` result are cached in `page_cache` (by default a `pagination.PageCache()`)
+        and their later pages are served by the interactivity endpoint `{url_path}/interactivity`.
+
+        Responses are sent with the connection pool of `http_client` (by default an `http_client.HttpClient()`).
+
+        When the app shuts down new requests are answered with a "restarting" message, and the running commands and
+        pending deliveries are given up to `drain_timeout` seconds to finish. Anything still running is cancelled and logged.
+
+        The app is frozen when it starts (see `freeze`). The help for the slash command names in `slash_commands`
+        (EX: `["/deploy"]`) is serialized when the app is frozen, the help for any other name on its first use.
+
+        To serve liveness and readiness endpoints for a load balancer pass in a `health.HealthCheck` as `health_check`.
+
+        To detect and attribute stalls of the event loop pass in a `watchdog.LoopWatchdog` as `watchdog`.
+
+        Command executions are limited and ordered by their priority with `scheduler` (by default a `scheduler.PriorityScheduler()`).
         """
         self.url_path = url_path
         self.description = description
-        self.app = FastAPI(title="SlashSlack", openapi_url=None)
+        self.app = FastAPI(
+            title="SlashSlack", openapi_url=None, lifespan=self._lifespan
+        )
         self.commands = {}
         self.dev = dev
         self.contact = contact
+        self.tracer = tracer
+        self.access_log = access_log
+        self.traffic_recorder = traffic_recorder
+        self.max_body_size = max_body_size
+        self.page_cache = page_cache if page_cache is not None else PageCache()
+        self.http_client = http_client if http_client is not None else HttpClient()
+        self.drain_timeout = drain_timeout
+        self.slash_commands = tuple(slash_commands)
+        self.health_check = health_check
+        self.watchdog = watchdog
+        self.scheduler = scheduler if scheduler is not None else PriorityScheduler()
+        self._executions = _ExecutionTracker()
+        self._tracer = _combine_tracers(tracer, access_log)
+        self.profiler = profiler
+        self.memory_tracker = memory_tracker
+        if profiler is not None:
+            self.global_flags = SlashSlack.global_flags | {"profile"}
+        self.json_encoder = (
+            json_encoder if json_encoder is not None else _get_default_json_encoder()
+        )
+        self._acknowledge_response_body: Optional[bytes] = None
         if acknowledge_response is not None:
             self.acknowledge_response = _make_block_message(
                 acknowledge_response, visible_in_channel=False
             )
+            self._acknowledge_response_body = self.json_encoder(
+                self.acknowledge_response
+            )
+        self._ephemeral_message = PreSerializedMessage(self.json_encoder)
+        self._unable_to_respond_body = self.json_encoder(
+            _make_block_message(self._unable_to_respond(), visible_in_channel=False)
+        )
+        self._global_help_cache: Dict[Tuple[str, bool], bytes] = {}
+        # Command -> serialized acknowledge response (None for a blank 201), built when the app is frozen.
+        self._acknowledge_bodies: Optional[Dict[str, Optional[bytes]]] = None
+        # The option names of every command, their values are skipped when looking for the command name.
+        self._option_names: Set[str] = set()
 
         self.before_request_functions = []
+        self._before_request_functions: Dict[str, Tuple[BeforeRequestFunction, ...]] = {
+            phase: () for phase in PHASES
+        }
+        self.middlewares = {phase: [] for phase in MIDDLEWARE_PHASES}
+        self._ack_middleware: Optional[Callable] = None
+        self._execute_middleware: Optional[Callable] = None
+        self._dependencies = _DependencyContainer()
 
         if self.dev:
             logger.info("Running in DEV MODE. Signature verification is disabled.")
@@ -88,24 +259,277 @@ class SlashSlack:
 
         @self.app.post(self.url_path)
         async def slash_slack(request: Request, background_tasks: BackgroundTasks):
-            request_body = await request.body()
-            if not self.dev:
+            with _trace(self._tracer, "slash_slack.acknowledge") as trace_span:
+                return await self._acknowledge(request, background_tasks, trace_span)
+
+        @self.app.post(f"{self.url_path}/interactivity")
+        async def interactivity(request: Request, background_tasks: BackgroundTasks):
+            with _trace(self._tracer, "slash_slack.interactivity") as trace_span:
+                return await self._interact(request, background_tasks, trace_span)
+
+        if self.health_check is not None:
+
+            @self.app.get(f"{self.url_path}/health/live")
+            async def liveness():
+                return _json_response(self.json_encoder({"live": True}))
+
+            @self.app.get(f"{self.url_path}/health/ready")
+            async def readiness():
+                ready, report = self.health_check.check(
+                    self._executions, self.scheduler
+                )
+                return _json_response(
+                    self.json_encoder(report), status_code=200 if ready else 503
+                )
+
+        if self.memory_tracker is not None:
+
+            @self.app.get(f"{self.url_path}/admin/memory")
+            async def memory(request: Request):
+                if not self._is_admin_request(request, self.memory_tracker.admin_token):
+                    raise HTTPException(status_code=403, detail="Forbidden.")
+                return _json_response(
+                    self.json_encoder(await self.memory_tracker.report_async())
+                )
+
+    @asynccontextmanager
+    async def _lifespan(self, app: FastAPI):
+        """
+        Freezes the app, then starts and stops the resources used by this app with the FastAPI app.
+        """
+        self.freeze()
+        if self.memory_tracker is not None:
+            self.memory_tracker.start()
+        if self.access_log is not None:
+            self.access_log.start()
+        if self.traffic_recorder is not None:
+            self.traffic_recorder.start()
+        try:
+            await self.http_client.start()
+            await self._dependencies.start()
+            await self._warmup()
+            if self.health_check is not None:
+                await self.health_check.start()
+            if self.watchdog is not None:
+                await self.watchdog.start()
+            yield
+        finally:
+            await self._drain()
+            if self.watchdog is not None:
+                await self.watchdog.stop()
+            if self.health_check is not None:
+                await self.health_check.stop()
+            await self._dependencies.stop()
+            await self.http_client.stop()
+            if self.memory_tracker is not None:
+                self.memory_tracker.stop()
+            if self.access_log is not None:
+                self.access_log.stop()
+            if self.traffic_recorder is not None:
+                self.traffic_recorder.stop()
+
+    def freeze(self):
+        """
+        Finalizes the command set so that nothing is initialized lazily while handling requests.
+        Called when the app starts, calling it again does nothing.
+
+        Validates every command, compiles the middleware chains, generates the static part of each command help,
+        registers the functions which stalls of the event loop are attributed to with the `watchdog`,
+        serializes the help for `slash_commands` and the acknowledge response of each command,
+        and makes `commands` read only. Registering a command, middleware or before request function
+        afterwards raises an `AppFrozenException`.
+        """
+        if self.frozen:
+            return
+        for command in self.commands.values():
+            self._validate_command(command)
+        self._compile_middleware()
+        for command in self.commands.values():
+            command.freeze()
+        if self.watchdog is not None:
+            self._register_watchdog_functions()
+        self._acknowledge_bodies = {
+            name: (
+                command._acknowledge_response_body
+                if command._acknowledge_response_body is not None
+                else self._acknowledge_response_body
+            )
+            for name, command in self.commands.items()
+        }
+        self.commands = MappingProxyType(dict(self.commands))
+        for slash_command in self.slash_commands:
+            slash_slack_request = _help_request(slash_command)
+            for visible_in_channel in (False, True):
+                self._global_help_body(slash_slack_request, visible_in_channel)
+                for command in self.commands.values():
+                    command._help_body(slash_slack_request, visible_in_channel)
+        self.frozen = True
+
+    def _validate_command(self, command: SlashSlackCommand):
+        """
+        Raises an `InvalidCommandException` if the command can not be routed to, or a global flag shadows one of its flags.
+        """
+        name = command.command
+        if (
+            not name
+            or name != name.strip()
+            or " " in name
+            or name.startswith("--")
+            or name.lower() == "help"
+        ):
+            raise InvalidCommandException(
+                f"The command ({name!r}) must be a single word which is not `help` and does not start with `--`."
+            )
+        for flag_name, _, _ in command.flags:
+            if flag_name in self.global_flags:
+                raise InvalidCommandException(
+                    f"The flag {flag_name} of the command {name} is a global flag ({', '.join(sorted(self.global_flags))})."
+                )
+
+    def _register_watchdog_functions(self):
+        for name, command in self.commands.items():
+            self.watchdog.register(f"command {name}", command.func)
+        for func in self.before_request_functions:
+            self.watchdog.register(f"before request function {func.name}", func.func)
+        for phase, middlewares in self.middlewares.items():
+            for func in middlewares:
+                self.watchdog.register(
+                    f"{phase} middleware {getattr(func, '__name__', func)}", func
+                )
+
+    def _check_not_frozen(self, what: str):
+        if self.frozen:
+            raise AppFrozenException(
+                f"Unable to register {what} after the app was frozen (when it started)."
+            )
+
+    async def _warmup(self):
+        """
+        Calls the warmup hook of each command after the pools and app scoped dependencies were created.
+        A hook which raises is logged, it does not stop the app from starting.
+        """
+        if any(not func.is_async for func in self.before_request_functions):
+            # Starts a thread of the thread pool which runs sync before request functions.
+            # Sync commands are not run in the thread pool, they run on the event loop.
+            await run_in_threadpool(lambda: None)
+        for name, command in self.commands.items():
+            if command.warmup is None:
+                continue
+            start = perf_counter()
+            try:
+                await command._warmup()
+            except Exception as e:
+                logger.error(f"The warmup of the command {name} failed: {e!r}")
+                continue
+            logger.info(
+                f"Warmed up the command {name} in {(perf_counter() - start) * 1000:.1f}ms."
+            )
+
+    async def _drain(self):
+        """
+        Waits for the in-flight executions to finish and logs the ones which were abandoned.
+        """
+        in_flight = len(self._executions)
+        abandoned = await self._executions.drain(self.drain_timeout)
+        if in_flight:
+            logger.info(
+                f"Drained {in_flight - len(abandoned)} of {in_flight} in-flight executions."
+            )
+        for execution in abandoned:
+            report = execution.report()
+            logger.warning(
+                f"Abandoned {report['command']} for {report['user_id']} while {report['stage']} after {report['age']:.1f}s."
+            )
+
+    def _use_shared_resources(
+        self,
+        http_client: HttpClient,
+        page_cache: PageCache,
+        dependency_container: _DependencyContainer,
+    ):
+        """
+        Replaces the HTTP client, page cache and dependency container of this app and its commands with ones shared with other apps.
+        The app scoped dependencies already registered are moved to the shared dependency container.
+        """
+        dependency_container.register(self._dependencies.app_dependencies.values())
+        self.http_client = http_client
+        self.page_cache = page_cache
+        self._dependencies = dependency_container
+        for command in self.commands.values():
+            command.http_client = http_client
+            command.page_cache = page_cache
+            command.dependency_container = dependency_container
+
+    def _is_admin_request(self, request: Request, admin_token: Optional[str]) -> bool:
+        """
+        Admin endpoints require the header `Authorization: Bearer <admin_token>` unless running in dev mode.
+        """
+        if self.dev:
+            return True
+        if admin_token is None:
+            return False
+        return hmac.compare_digest(
+            request.headers.get("authorization", ""), f"Bearer {admin_token}"
+        )
+
+    async def _read_verified_body(self, request: Request, trace_span: Any) -> bytes:
+        """
+        Reads the request body and verifies its signature unless running in dev mode.
+        Requests without valid signature headers are rejected before the body is read.
+        """
+        tracer = self._tracer
+        request_hash = None
+        if not self.dev:
+            with _trace(tracer, "signature_verification", trace_span):
                 if self.signature_verifier is None:
                     raise HTTPException(
                         status_code=500, detail="Internal Service Error"
                     )
-                if not self.signature_verifier.is_valid_request(
-                    request_body,
-                    {key: value for key, value in request.headers.items()},
+                timestamp = request.headers.get("x-slack-request-timestamp")
+                signature = request.headers.get("x-slack-signature")
+                if (
+                    not timestamp
+                    or not signature
+                    or not self.signature_verifier.is_valid_timestamp(timestamp)
                 ):
                     raise HTTPException(
                         status_code=403,
                         detail="Unable to verify request signature.",
                     )
-            try:
+                request_hash = self.signature_verifier.new_hash(timestamp)
+        with _trace(tracer, "read_body", trace_span):
+            request_body = await _read_body(request, self.max_body_size, request_hash)
+        if request_hash is not None:
+            with _trace(tracer, "signature_digest", trace_span):
+                if not self.signature_verifier.is_valid_hash(request_hash, signature):
+                    raise HTTPException(
+                        status_code=403,
+                        detail="Unable to verify request signature.",
+                    )
+        return request_body
+
+    async def _acknowledge(
+        self, request: Request, background_tasks: BackgroundTasks, trace_span: Any
+    ):
+        """
+        Verifies, parses and routes the request. Returns the immediate response to the slash command
+        and schedules the command execution in the background.
+        """
+        arrival = time()
+        if self._executions.draining:
+            _set_attributes(self._tracer, trace_span, {"outcome": "draining"})
+            return _json_response(self._ephemeral_message.render(_restarting()))
+        request_body = await self._read_verified_body(request, trace_span)
+        if self.traffic_recorder is not None:
+            self.traffic_recorder.record(arrival, request.headers, request_body)
+        tracer = self._tracer
+        try:
+            with _trace(tracer, "form_decode", trace_span):
                 request_form_data = dict(parse_qsl(request_body.decode()))
-                if request_form_data.get("ssl_check") == 1:
-                    return Response(status_code=200)
+            if request_form_data.get("ssl_check") == 1:
+                _set_attributes(tracer, trace_span, {"outcome": "ssl_check"})
+                return Response(status_code=200)
+            with _trace(tracer, "model_validation", trace_span):
                 try:
                     slash_slack_request = SlashSlackRequest(**request_form_data)
                 except ValidationError as e:
@@ -113,64 +537,223 @@ class SlashSlack:
                     raise HTTPException(
                         status_code=422, detail="Validation of request body failed."
                     )
-                for fn in self.before_request_functions:
-                    background_tasks.add_task(fn, slash_slack_request)
-                command, args, flags = _parse_command_text(
-                    slash_slack_request.text.strip()
+            _set_attributes(
+                tracer,
+                trace_span,
+                {
+                    "slash_command": slash_slack_request.command,
+                    "user_id": slash_slack_request.user_id,
+                    "team_id": slash_slack_request.team_id,
+                },
+            )
+            context = AckContext(slash_slack_request, background_tasks, trace_span)
+            if self._ack_middleware is None:
+                return await self._route(context)
+            _set_attributes(tracer, trace_span, {"outcome": "middleware"})
+            return self._middleware_response(await self._ack_middleware(context))
+        except Exception as e:
+            logger.error(e)
+            _set_attributes(tracer, trace_span, {"outcome": "error"})
+            return _json_response(self._unable_to_respond_body)
+
+    async def _interact(
+        self, request: Request, background_tasks: BackgroundTasks, trace_span: Any
+    ):
+        """
+        Verifies and handles an interactivity request. Clicks on the page buttons of a `Paginated` result
+        replace the message with the requested page from the `page_cache` without running the command again.
+        Other interactions are acknowledged and ignored.
+        """
+        request_body = await self._read_verified_body(request, trace_span)
+        tracer = self._tracer
+        with _trace(tracer, "form_decode", trace_span):
+            try:
+                payload = json.loads(
+                    dict(parse_qsl(request_body.decode())).get("payload", "")
                 )
-                if command.lower() == "help" or (command == "" and "help" in flags):
-                    return self._global_help(
-                        slash_slack_request, visible_in_channel="visible" in flags
-                    )
+            except ValueError:
+                raise HTTPException(
+                    status_code=400, detail="Invalid interactivity payload."
+                )
+        page_action = _parse_page_action(payload) if isinstance(payload, dict) else None
+        if page_action is None or not payload.get("response_url"):
+            _set_attributes(tracer, trace_span, {"outcome": "ignored"})
+            return Response(status_code=200)
+        token, page = page_action
+        cached: Optional[_CachedPages] = self.page_cache.get(token)
+        if cached is None:
+            _set_attributes(tracer, trace_span, {"outcome": "page_expired"})
+            message = _make_block_message(
+                "This result has expired. Run the command again to see more.",
+                visible_in_channel=False,
+            )
+            message["replace_original"] = False
+        else:
+            _set_attributes(tracer, trace_span, {"outcome": "page", "page": page})
+            message = _make_page_message(
+                cached.paginated, page, token, cached.visible_in_channel
+            )
+            message["replace_original"] = True
+        background_tasks.add_task(
+            self._executions.run,
+            _Execution(
+                "interactivity", str(payload.get("user", {}).get("id")), DELIVERING
+            ),
+            self._post_message,
+            payload["response_url"],
+            self.json_encoder(message),
+            trace_span,
+        )
+        return Response(status_code=200)
 
-                if command not in self.commands:
-                    return _make_block_message(
-                        _command_not_found(slash_slack_request),
-                        visible_in_channel=False,
-                    )
-                global_flags = flags.intersection(self.global_flags)
-                if "help" in global_flags:
-                    return self.commands[command]._help(
-                        slash_slack_request=slash_slack_request,
-                        visible_in_channel="visible" in global_flags,
-                    )
-                parsed_args = self.commands[command].parse_args(args)
-                if parsed_args is None:
-                    return _make_block_message(
-                        _invalid_args(
-                            slash_slack_request=slash_slack_request, command=command
-                        ),
-                        visible_in_channel=False,
-                    )
+    async def _post_message(self, response_url: str, body: bytes, trace_span: Any):
+        """
+        Posts an already serialized message to a `response_url`.
+        """
+        with _trace(self._tracer, "response_url_post", trace_span):
+            async with self.http_client.session() as session:
+                async with session.post(
+                    response_url,
+                    data=body,
+                    headers={"Content-Type": "application/json"},
+                ) as resp:
+                    if resp.status != 200:
+                        logger.error(
+                            f"Received an error when sending request to callback ({resp.status}): {await resp.text()}"
+                        )
 
-                background_tasks.add_task(
-                    self.commands[command].execute,
-                    parsed_args,
-                    flags.difference(self.global_flags),
-                    global_flags,
-                    slash_slack_request,
+    async def _route(self, context: AckContext) -> Response:
+        """
+        Routes a valid request to the global help, command help, or command execution.
+        This is the innermost handler of the `ack` middleware chain.
+        """
+        tracer = self._tracer
+        slash_slack_request = context.slash_slack_request
+        background_tasks = context.background_tasks
+        trace_span = context.trace_span
+        if self._before_request_functions[BEFORE_ACK]:
+            await _run_before_request_functions(
+                self._before_request_functions[BEFORE_ACK],
+                slash_slack_request,
+                tracer,
+                trace_span,
+            )
+        if self._before_request_functions[AFTER_ACK]:
+            background_tasks.add_task(
+                _run_before_request_functions,
+                self._before_request_functions[AFTER_ACK],
+                slash_slack_request,
+                tracer,
+                trace_span,
+            )
+        with _trace(tracer, "parse_command_text", trace_span):
+            command, text = _split_command(
+                slash_slack_request.text.strip(), self._option_names
+            )
+            args, flags = _split_flags(text)
+        _set_attributes(tracer, trace_span, {"command": command})
+        if command.lower() == "help" or (command == "" and "help" in flags):
+            _set_attributes(tracer, trace_span, {"outcome": "help"})
+            return _json_response(
+                self._global_help_body(
+                    slash_slack_request, visible_in_channel="visible" in flags
                 )
+            )
 
-                return self.make_success_acknowledge_response(command)
-            except Exception as e:
-                logger.error(e)
-                return _make_block_message(
-                    self._unable_to_respond(), visible_in_channel=False
+        slash_command = self.commands.get(command)
+        if slash_command is None:
+            _set_attributes(tracer, trace_span, {"outcome": "command_not_found"})
+            return _json_response(
+                self._ephemeral_message.render(_command_not_found(slash_slack_request))
+            )
+        options: Optional[List[Any]] = None
+        if slash_command.options:
+            with _trace(tracer, "extract_options", trace_span, {"command": command}):
+                text, options = slash_command.extract_options(text)
+                args, flags = _split_flags(text)
+        global_flags = flags.intersection(self.global_flags)
+        if "profile" in global_flags and not self.profiler.is_authorized(
+            slash_slack_request.user_id
+        ):
+            logger.warning(
+                f"User {slash_slack_request.user_id} is not allowed to profile commands."
+            )
+            global_flags.discard("profile")
+        if "help" in global_flags:
+            _set_attributes(tracer, trace_span, {"outcome": "command_help"})
+            return _json_response(
+                slash_command._help_body(
+                    slash_slack_request=slash_slack_request,
+                    visible_in_channel="visible" in global_flags,
                 )
+            )
+        with _trace(tracer, "parse_args", trace_span, {"command": command}):
+            parsed_args = None
+            if not slash_command.options or options is not None:
+                parsed_args = slash_command.parse_args(args, options)
+        if parsed_args is None:
+            _set_attributes(tracer, trace_span, {"outcome": "invalid_args"})
+            return _json_response(
+                self._ephemeral_message.render(
+                    _invalid_args(
+                        slash_slack_request=slash_slack_request,
+                        command=command,
+                    )
+                )
+            )
+
+        background_tasks.add_task(
+            self._executions.run,
+            _Execution(command, slash_slack_request.user_id),
+            slash_command.execute,
+            parsed_args,
+            flags.difference(self.global_flags),
+            global_flags,
+            slash_slack_request,
+            trace_parent=trace_span,
+            before_execute_functions=self._before_request_functions[BEFORE_EXECUTE],
+            execute_middleware=self._execute_middleware,
+            scheduler=self.scheduler,
+        )
+        _set_attributes(
+            tracer,
+            trace_span,
+            {"outcome": "scheduled", "priority": slash_command.priority},
+        )
+
+        return self.make_success_acknowledge_response(command)
+
+    def _middleware_response(self, result: Any) -> Response:
+        """
+        Converts the result of the `ack` middleware chain into a response.
+        Middlewares which short circuit can return a Response, or content for `blocks._make_block_message` which is sent as an ephemeral message.
+        """
+        if isinstance(result, Response):
+            return result
+        if result is None:
+            return Response(status_code=201)
+        return _json_response(
+            self.json_encoder(_make_block_message(result, visible_in_channel=False))
+        )
 
     def make_success_acknowledge_response(self, command: str):
-        kwargs: dict = {"status_code": 200}
-        if self.acknowledge_response is not None:
-            kwargs["content"] = self.acknowledge_response
+        if self._acknowledge_bodies is not None:
+            body = self._acknowledge_bodies.get(
+                command, self._acknowledge_response_body
+            )
+            if body is None:
+                return Response(status_code=201)
+            return _json_response(body)
+        body = self._acknowledge_response_body
         if (
             command in self.commands
-            and self.commands[command].acknowledge_response is not None
+            and self.commands[command]._acknowledge_response_body is not None
         ):
-            kwargs["content"] = self.commands[command].acknowledge_response
+            body = self.commands[command]._acknowledge_response_body
 
-        if "content" not in kwargs:
+        if body is None:
             return Response(status_code=201)
-        return JSONResponse(**kwargs)
+        return _json_response(body)
 
     def get_fast_api(self):
         """
@@ -181,14 +764,82 @@ class SlashSlack:
     def add_before_request_function(
         self,
         func: Callable[[SlashSlackRequest], Union[None, Coroutine[Any, Any, None]]],
+        phase: str = AFTER_ACK,
+        timeout: Optional[float] = None,
     ):
         """
         Register a function that will be called for every valid request.
 
         This function should take one argument of the type `SlashSlackRequest` and return None.
 
+        phase   (str): When the function is called.
+            `before_ack`: Before the request is acknowledged. Adds to the acknowledgement latency.
+            `after_ack`: In the background after the request is acknowledged. (default)
+            `before_execute`: In the background before the command function is executed. Only called for requests which execute a command.
+        timeout (float): The time budget in seconds. Functions which take longer are abandoned.
+
+        Async functions in the same phase run concurrently, sync functions are run in the thread pool.
+        """
+        self._check_not_frozen("a before request function")
+        if phase not in PHASES:
+            raise InvalidBeforeRequestFunctionPhaseException(
+                f"Invalid phase ({phase}) for before request function. Must be one of {PHASES}."
+            )
+        before_request_function = BeforeRequestFunction(
+            func, phase=phase, timeout=timeout
+        )
+        self.before_request_functions.append(before_request_function)
+        self._before_request_functions[phase] = self._before_request_functions[
+            phase
+        ] + (before_request_function,)
+
+    def add_middleware(self, func: Middleware, phase: str = ACK):
         """
-        self.before_request_functions.append(func)
+        Register an async middleware. Middlewares are called in the order they are registered.
+
+        phase (str): What the middleware wraps.
+            `ack`: The handling of every valid request. Called as `await func(context: AckContext, call_next)`.
+                Returns the response to the slash command. To short circuit return a Response or
+                content for `blocks._make_block_message` (sent as an ephemeral message) without calling `call_next`.
+            `execute`: The execution of the command function. Called as `await func(context: ExecutionContext, call_next)`.
+                Returns the command result which is sent to slack. To short circuit return a result without calling `call_next`.
+
+        The middlewares are compiled into a single pre-bound call chain.
+        """
+        self._check_not_frozen("a middleware")
+        if phase not in MIDDLEWARE_PHASES:
+            raise InvalidMiddlewareException(
+                f"Invalid phase ({phase}) for middleware. Must be one of {MIDDLEWARE_PHASES}."
+            )
+        if not inspect.iscoroutinefunction(func):
+            raise InvalidMiddlewareException(
+                f"Middleware {getattr(func, '__name__', func)} must be an async function."
+            )
+        self.middlewares[phase].append(func)
+        self._compile_middleware()
+
+    def middleware(self, phase: str = ACK):
+        """
+        Decorator for registering a middleware. See `add_middleware`.
+        """
+
+        def decorator_middleware(func: Middleware):
+            self.add_middleware(func, phase=phase)
+            return func
+
+        return decorator_middleware
+
+    def _compile_middleware(self):
+        self._ack_middleware = _compile_middleware(self.middlewares[ACK], self._route)
+        self._execute_middleware = _compile_middleware(
+            self.middlewares[EXECUTE], _call_command
+        )
+
+    def before_request_function_stats(self) -> List[dict]:
+        """
+        Returns the call count, error count, timeout count, and durations of each before request function.
+        """
+        return [func.stats() for func in self.before_request_functions]
 
     def command(
         self,
@@ -196,6 +847,8 @@ class SlashSlack:
         help: Optional[str] = None,
         summary: Optional[str] = None,
         acknowledge_response: Union[None, str, dict] = None,
+        warmup: Optional[Callable[[], Any]] = None,
+        priority: str = NORMAL,
     ):
         """
         Decorator for defining a command within a SlashSlack app.
@@ -203,16 +856,27 @@ class SlashSlack:
         command (str): The first word used for routing between commands within a SlashSlack app.
         help    (str): The help content for this command.
         summary (str): The summary/title for this command.
+        warmup  (Callable): A sync or async function without arguments called once when the app starts,
+            after the pools and app scoped dependencies were created. EX: to load a model or fill a cache.
+        priority (str): The priority class of the command executions in the `scheduler`, `high`, `normal` or `low`.
+            EX: `high` for cheap interactive lookups and `low` for heavy reports.
 
         /slash-slack command
         """
 
         def decorator_command(func: Callable):
+            self._check_not_frozen(f"the command {command}")
+            if priority not in PRIORITIES:
+                raise InvalidPriorityException(
+                    f"Invalid priority ({priority}) for the command {command}. Must be one of {PRIORITIES}."
+                )
             if command in self.commands:
                 raise DuplicateCommandException(
                     f"The command {command} has already been registered."
                 )
             params, flags, request_arg = _parse_func_params(func)
+            dependencies = _parse_func_dependencies(func)
+            self._dependencies.register(d for _, d, _ in dependencies)
             is_async = inspect.iscoroutinefunction(func)
             self.commands[command] = SlashSlackCommand(
                 command=command,
@@ -224,7 +888,19 @@ class SlashSlack:
                 summary=summary,
                 is_async=is_async,
                 acknowledge_response=acknowledge_response,
+                json_encoder=self.json_encoder,
+                tracer=self._tracer,
+                profiler=self.profiler,
+                memory_tracker=self.memory_tracker,
+                dependencies=dependencies,
+                dependency_container=self._dependencies,
+                page_cache=self.page_cache,
+                http_client=self.http_client,
+                warmup=warmup,
+                priority=priority,
             )
+            self._option_names.update(self.commands[command]._option_slots)
+            self._global_help_cache.clear()
             return func
 
         return decorator_command
@@ -249,13 +925,31 @@ To view this message run `{slash_slack_request.command} help`
         """.strip()
         return _make_block_message(_GLOBAL_HELP, visible_in_channel=visible_in_channel)
 
+    def _global_help_body(
+        self, slash_slack_request: SlashSlackRequest, visible_in_channel: bool = False
+    ) -> bytes:
+        """
+        Returns the serialized global help. The help only depends on the slash command name and visibility,
+        so it is serialized once and cached.
+        """
+        key = (slash_slack_request.command, visible_in_channel)
+        body = self._global_help_cache.get(key)
+        if body is None:
+            body = self.json_encoder(
+                self._global_help(
+                    slash_slack_request, visible_in_channel=visible_in_channel
+                )
+            )
+            self._global_help_cache[key] = body
+        return body
+
     def _generate_command_signatures(self, slash_slack_request: SlashSlackRequest):
         signature_help_contents = []
         for command_text, command in self.commands.items():
             signature_help_contents.append(
                 f"""
 {f"> {command.summary}" if command.summary else ""}
-> `{slash_slack_request.command}` {command._generate_command_signature()}
+> `{slash_slack_request.command}` {command._static_help()[0]}
             """.strip()
             )
         return "\n\n".join(signature_help_contents)
@@ -267,23 +961,112 @@ I was unable to respond to your request due to an internal error. Please contact
     """.strip()
 
 
-_FLAG_REGEXP = re.compile(r"""(?:^|(?<= ))--(?P<flag>\S+?)(?:$| )""")
+def _help_request(command: str) -> SlashSlackRequest:
+    """
+    Returns a placeholder request of the slash command `command` to prebuild its help, which only depends on the command.
+    """
+    return SlashSlackRequest(
+        token="",
+        team_id="",
+        team_domain="",
+        channel_id="",
+        channel_name="",
+        user_id="",
+        user_name="",
+        command=command,
+        text="",
+        response_url="",
+        trigger_id="",
+        api_app_id="",
+    )
+
+
+async def _read_body(
+    request: Request, max_body_size: Optional[int], request_hash: Any = None
+) -> bytes:
+    """
+    Reads the request body from the ASGI receive stream, adding each chunk to `request_hash` as it arrives.
+    Raises a 413 as soon as the body is known to be larger than `max_body_size`, without reading the rest of it.
+    """
+    if max_body_size is not None:
+        content_length = request.headers.get("content-length")
+        if content_length is not None and content_length.isdigit():
+            if int(content_length) > max_body_size:
+                raise HTTPException(status_code=413, detail="Request body too large.")
+    chunks = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if max_body_size is not None and size > max_body_size:
+            raise HTTPException(status_code=413, detail="Request body too large.")
+        if request_hash is not None:
+            request_hash.update(chunk)
+        chunks.append(chunk)
+    return b"".join(chunks)
 
 
-def _parse_command_text(text: str) -> Tuple[str, str, Set[str]]:
-    flags = set(_FLAG_REGEXP.findall(text))
-    text = _FLAG_REGEXP.sub("", text).strip()
-    split_text = text.split(" ")
-    command = split_text[0]
-    args = " ".join([arg for arg in split_text[1:] if arg != ""])
+def _parse_command_text(
+    text: str, option_names: AbstractSet[str] = frozenset()
+) -> Tuple[str, str, Set[str]]:
+    """
+    Splits the command text into the command name, the args and the flags (see `_split_command` and `_split_flags`).
+    """
+    command, text = _split_command(text, option_names)
+    args, flags = _split_flags(text)
     return command, args, flags
 
 
+def _split_command(
+    text: str, option_names: AbstractSet[str] = frozenset()
+) -> Tuple[str, str]:
+    """
+    Returns the command name and the rest of the command text.
+
+    The text is tokenized first (see `_tokenize`) so quoted args are never split or taken as flags.
+    The command is the first arg which is not a flag (an unquoted arg starting with `--`) nor the value of an option
+    given before it (EX: `5` in `--limit 5 search foo`) whose name is in `option_names`.
+    The rest is the source text of the other args joined by a space, quotes included, so it tokenizes the same way
+    again when the options, flags and args are parsed.
+    """
+    command = None
+    rest: List[str] = []
+    option_value = False
+    for value, start, end in _tokenize_spans(text):
+        raw = text[start:end]
+        if command is not None:
+            rest.append(raw)
+        elif raw.startswith("--") and len(raw) > 2:
+            rest.append(raw)
+            option_value = raw[2:] in option_names
+        elif option_value:
+            rest.append(raw)
+            option_value = False
+        else:
+            command = value
+    return command or "", " ".join(rest)
+
+
+def _split_flags(text: str) -> Tuple[str, Set[str]]:
+    """
+    Returns the args and the flags of the text. Flags are the unquoted args starting with `--`,
+    the args are the source text of the other args joined by a space.
+    """
+    args: List[str] = []
+    flags: Set[str] = set()
+    for _, start, end in _tokenize_spans(text):
+        raw = text[start:end]
+        if raw.startswith("--") and len(raw) > 2:
+            flags.add(raw[2:])
+        else:
+            args.append(raw)
+    return " ".join(args), flags
+
+
 def _parse_func_params(func: Callable):
     has_encountered_unknown_length_list = False
     sig = inspect.signature(func)
     params: List[Tuple[str, BaseArgType, int]] = []
-    flags: List[Tuple[str, FlagType, int]] = []
+    flags: List[Tuple[str, Union[FlagType, OptionType], int]] = []
     request_arg: Optional[Tuple[str, int]] = None
     for index, param in enumerate(sig.parameters.values()):
         name = param.name
@@ -298,7 +1081,10 @@ def _parse_func_params(func: Callable):
             request_arg = (name, index)
             continue
 
-        if isinstance(default, FlagType):
+        if isinstance(default, Dependency):
+            continue
+
+        if isinstance(default, (FlagType, OptionType)):
             flags.append((name, default, index))
             continue
 
@@ -343,6 +1129,21 @@ def _parse_func_params(func: Callable):
     return params, flags, request_arg
 
 
+def _parse_func_dependencies(func: Callable) -> List[Tuple[str, Dependency, int]]:
+    """
+    Returns the parameters of the function which are provided by a `Depends` provider.
+    """
+    return [
+        (param.name, param.default, index)
+        for index, param in enumerate(inspect.signature(func).parameters.values())
+        if isinstance(param.default, Dependency)
+    ]
+
+
+def _restarting() -> str:
+    return "The bot is restarting. Please try again in a few seconds."
+
+
 def _command_not_found(slack_slash_request: SlashSlackRequest) -> str:
     return f"""
 The command `{slack_slash_request.command} {slack_slash_request.text}` did not match any commands I know. Please try again.
@@ -1,18 +1,42 @@
+import inspect
+import itertools
 import logging
-from typing import Any, Callable, List, Optional, Set, Tuple, Union
+from contextlib import AsyncExitStack
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
 
-import aiohttp
+from fastapi.concurrency import run_in_threadpool
 
 from slash_slack.arg_types import (
     BaseArgType,
     FlagType,
+    OptionType,
     StringType,
     UnknownLengthListType,
 )
-from slash_slack.blocks import _make_block_message
+from slash_slack.blocks import _iter_block_messages, _make_block_message
+from slash_slack.dependencies import Dependency, _DependencyContainer
+from slash_slack.drain import DELIVERING, _set_stage
+from slash_slack.hooks import BeforeRequestFunction, _run_before_request_functions
+from slash_slack.http_client import HttpClient
+from slash_slack.memory import MemoryTracker
+from slash_slack.middleware import ExecutionContext
+from slash_slack.pagination import (
+    PageCache,
+    Paginated,
+    _CachedPages,
+    _make_page_message,
+)
+from slash_slack.profiling import Profiler, _ProfiledPaginated
+from slash_slack.scheduler import NORMAL, PriorityScheduler
+from slash_slack.serialization import JSONEncoder, _get_default_json_encoder
 from slash_slack.slash_slack_request import SlashSlackRequest
+from slash_slack.tokenizer import _QUOTES, _tokenize, _tokenize_spans
+from slash_slack.tracing import Tracer, _trace
 
 _NL = "\n"
+# A response_url can be used to respond up to 5 times.
+# https://api.slack.com/interactivity/handling#message_responses
+_MAX_RESPONSE_URL_MESSAGES = 5
 
 logger = logging.getLogger("slash_slack")
 
@@ -26,62 +50,191 @@ class SlashSlackCommand:
     help: Optional[str] = None
     summary: Optional[str] = None
     func: Callable
-    flags: List[Tuple[str, FlagType, int]]
+    flags: List[Tuple[str, Union[FlagType, OptionType], int]]
+    options: List[Tuple[str, OptionType, int]]
     args_type: List[Tuple[str, BaseArgType, int]]
     request_arg: Optional[Tuple[str, int]] = None
+    dependencies: List[Tuple[str, Dependency, int]]
     is_async: bool
     acknowledge_response: Optional[dict] = None
+    json_encoder: JSONEncoder
+    tracer: Optional[Tracer] = None
+    profiler: Optional[Profiler] = None
+    memory_tracker: Optional[MemoryTracker] = None
+    page_cache: PageCache
+    http_client: HttpClient
+    warmup: Optional[Callable] = None
+    priority: str = NORMAL
 
     def __init__(
         self,
         command: str,
         func: Callable,
-        flags: List[Tuple[str, FlagType, int]],
+        flags: List[Tuple[str, Union[FlagType, OptionType], int]],
         args_type: List[Tuple[str, BaseArgType, int]],
         request_arg: Optional[Tuple[str, int]],
         help: Optional[str] = None,
         summary: Optional[str] = None,
         is_async: bool = False,
         acknowledge_response: Union[None, str, dict] = None,
+        json_encoder: Optional[JSONEncoder] = None,
+        tracer: Optional[Tracer] = None,
+        profiler: Optional[Profiler] = None,
+        memory_tracker: Optional[MemoryTracker] = None,
+        dependencies: Optional[List[Tuple[str, Dependency, int]]] = None,
+        dependency_container: Optional[_DependencyContainer] = None,
+        page_cache: Optional[PageCache] = None,
+        http_client: Optional[HttpClient] = None,
+        warmup: Optional[Callable] = None,
+        priority: str = NORMAL,
     ):
         self.command = command
         self.func = func
         self.flags = flags
+        self.options = [flag for flag in flags if isinstance(flag[1], OptionType)]
+        # Option name -> position of the option value in `options`, looked up once per `--` token.
+        self._option_slots: Dict[str, int] = {
+            name: slot for slot, (name, _, _) in enumerate(self.options)
+        }
+        self._option_defaults = [option.default for _, option, _ in self.options]
         self.args_type = args_type
         self.request_arg = request_arg
+        self.dependencies = dependencies if dependencies is not None else []
+        self.dependency_container = (
+            dependency_container
+            if dependency_container is not None
+            else _DependencyContainer()
+        )
+        self.page_cache = page_cache if page_cache is not None else PageCache()
+        self.http_client = http_client if http_client is not None else HttpClient()
         self.help = help
         self.summary = summary
         self.is_async = is_async
+        self.tracer = tracer
+        self.profiler = profiler
+        self.memory_tracker = memory_tracker
+        self.json_encoder = (
+            json_encoder if json_encoder is not None else _get_default_json_encoder()
+        )
+        self._acknowledge_response_body: Optional[bytes] = None
         if acknowledge_response is not None:
             self.acknowledge_response = _make_block_message(
                 acknowledge_response, visible_in_channel=False
             )
+            self._acknowledge_response_body = self.json_encoder(
+                self.acknowledge_response
+            )
+        self._help_cache: Dict[Tuple[str, bool], bytes] = {}
+        self.warmup = warmup
+        self.priority = priority
+        # The signature, parameter help and flag help, generated once when the app is frozen.
+        self._static_help_parts: Optional[Tuple[str, str, str]] = None
 
-    def parse_args(self, args: str):
+    def freeze(self):
+        """
+        Generates the parts of the help which do not depend on the request. Called when the app is frozen.
+        """
+        self._static_help_parts = (
+            self._generate_command_signature(),
+            self._generate_parameter_help(),
+            self._generate_flag_help(),
+        )
+
+    async def _warmup(self):
+        """
+        Calls the warmup hook of this command. Sync hooks are run in the thread pool.
+        """
+        if self.warmup is None:
+            return
+        if inspect.iscoroutinefunction(self.warmup):
+            await self.warmup()
+        else:
+            await run_in_threadpool(self.warmup)
+
+    def extract_options(self, text: str) -> Tuple[str, Optional[List[Any]]]:
+        """
+        Removes the options (`--name=value` or `--name value`) of this command from the command text.
+        Returns the remaining text and the parsed option values (in the order of `options`, defaulted when not given),
+        or None for the values if an option value is invalid.
+
+        The text is tokenized first, so quoted args are never taken as options. The remaining text is the source text
+        of the other args joined by a space.
+        """
+        values = list(self._option_defaults)
+        valid = True
+        remaining: List[str] = []
+        tokens = _tokenize_spans(text)
+        i = 0
+        while i < len(tokens):
+            token_value, start, end = tokens[i]
+            raw = text[start:end]
+            i += 1
+            slot = None
+            if raw.startswith("--"):
+                name, equals, value = raw[2:].partition("=")
+                slot = self._option_slots.get(name)
+            if slot is None:
+                remaining.append(raw)
+                continue
+            if equals:
+                # The value without the quotes, an empty value (`--name=`) is missing.
+                value = token_value[len(name) + 3 :] if value else None
+            elif i < len(tokens) and not text.startswith("--", tokens[i][1]):
+                value = tokens[i][0]
+                i += 1
+            else:
+                value = None
+            if value is not None:
+                value = self.options[slot][1].arg_type.parse(value)
+            if value is None:
+                valid = False
+            values[slot] = value
+        remaining_text = " ".join(remaining)
+        if not valid:
+            return remaining_text, None
+        return remaining_text, values
+
+    def parse_args(self, args: str, options: Optional[List[Any]] = None):
         """
         Parse input text for this command utilizing this commands flag and arg schema.
+
+        The option values from `extract_options` (or the defaults) are appended after the args.
+        A lone `String` arg gets the whole args text, unquoted when it is a single quoted arg.
         """
+        if options is None:
+            options = self._option_defaults
         if len(self.args_type) == 1 and isinstance(self.args_type[0][1], StringType):
+            if args[:1] in _QUOTES:
+                # A body which is a single quoted arg is unquoted like any other arg.
+                tokens = _tokenize_spans(args)
+                if len(tokens) == 1:
+                    args = tokens[0][0]
             p = self.args_type[0][1].parse(args)
             if p is None:
                 return None
-            return [p]
+            return [p, *options]
 
-        split_args = [arg for arg in args.split(" ") if arg != ""]
+        split_args = _tokenize(args)
 
         l = []
         for i, value in enumerate(split_args):
             if i >= len(self.args_type):
                 return None
-            if isinstance(self.args_type[i][1], UnknownLengthListType):
-                l.append(self.args_type[i][1].parse(split_args[i:]))
+            arg_type = self.args_type[i][1]
+            if isinstance(arg_type, UnknownLengthListType):
+                parsed = arg_type.parse(split_args[i:])
+            else:
+                parsed = arg_type.parse(value)
+            # Checked by identity, an array parsed UnknownLengthList does not support `None in l`.
+            if parsed is None:
+                return None
+            l.append(parsed)
+            if isinstance(arg_type, UnknownLengthListType):
                 break
-            l.append(self.args_type[i][1].parse(value))
 
         if len(self.args_type) != len(l):
             return None
-        if None in l:
-            return None
+        l.extend(options)
         return l
 
     def _hydrate_func_args(
@@ -95,10 +248,15 @@ class SlashSlackCommand:
             _, i = self.request_arg
             f_args[i] = slash_slack_request
 
+        args_count = len(self.args_type)
         for i, value in enumerate(args):
-            f_args[self.args_type[i][2]] = value
-        for name, _, i in self.flags:
-            f_args[i] = name in flags
+            if i < args_count:
+                f_args[self.args_type[i][2]] = value
+            else:
+                f_args[self.options[i - args_count][2]] = value
+        for name, flag, i in self.flags:
+            if isinstance(flag, FlagType):
+                f_args[i] = name in flags
         return f_args
 
     async def execute(
@@ -107,26 +265,218 @@ class SlashSlackCommand:
         flags: Set[str],
         global_flags: Set[str],
         slash_slack_request: SlashSlackRequest,
+        trace_parent: Any = None,
+        before_execute_functions: Sequence[BeforeRequestFunction] = (),
+        execute_middleware: Optional[Callable] = None,
+        scheduler: Optional[PriorityScheduler] = None,
     ):
         """
         Executes this command given already parsed args, flags, and global_flags.
+
+        `trace_parent` is the span of the acknowledgement which scheduled this execution.
+        `before_execute_functions` are run before the command function.
+        `execute_middleware` is the compiled `execute` middleware chain which wraps the command function.
+        `scheduler` is waited on for a slot in the `priority` class of this command before anything is run.
+        """
+        with _trace(
+            self.tracer, "slash_slack.execute", trace_parent, {"command": self.command}
+        ) as trace_span:
+            if scheduler is None:
+                await self._measure(
+                    args,
+                    flags,
+                    global_flags,
+                    slash_slack_request,
+                    trace_span,
+                    before_execute_functions,
+                    execute_middleware,
+                )
+                return
+            with _trace(
+                self.tracer, "queue_wait", trace_span, {"priority": self.priority}
+            ):
+                await scheduler.acquire(self.priority)
+            try:
+                await self._measure(
+                    args,
+                    flags,
+                    global_flags,
+                    slash_slack_request,
+                    trace_span,
+                    before_execute_functions,
+                    execute_middleware,
+                )
+            finally:
+                scheduler.release()
+
+    async def _measure(
+        self,
+        args: List[Any],
+        flags: Set[str],
+        global_flags: Set[str],
+        slash_slack_request: SlashSlackRequest,
+        trace_span: Any,
+        before_execute_functions: Sequence[BeforeRequestFunction],
+        execute_middleware: Optional[Callable],
+    ):
+        """
+        Executes this command, measuring its memory when there is a `memory_tracker`.
         """
+        memory_state = None
+        if self.memory_tracker is not None:
+            memory_state = self.memory_tracker.before_execution()
+        try:
+            await self._execute(
+                args,
+                flags,
+                global_flags,
+                slash_slack_request,
+                trace_span,
+                before_execute_functions,
+                execute_middleware,
+            )
+        finally:
+            if self.memory_tracker is not None:
+                self.memory_tracker.after_execution(self.command, memory_state)
+
+    async def _execute(
+        self,
+        args: List[Any],
+        flags: Set[str],
+        global_flags: Set[str],
+        slash_slack_request: SlashSlackRequest,
+        trace_span: Any,
+        before_execute_functions: Sequence[BeforeRequestFunction],
+        execute_middleware: Optional[Callable],
+    ):
+        tracer = self.tracer
+        if before_execute_functions:
+            await _run_before_request_functions(
+                before_execute_functions, slash_slack_request, tracer, trace_span
+            )
+        # Request scoped dependencies stay open until the response was delivered,
+        # a generator response is only consumed while it is delivered.
+        async with AsyncExitStack() as exit_stack:
+            with _trace(tracer, "function_execution", trace_span):
+                if execute_middleware is None:
+                    response = await self._call(
+                        args, flags, global_flags, slash_slack_request, exit_stack
+                    )
+                else:
+                    response = await execute_middleware(
+                        ExecutionContext(
+                            self,
+                            args,
+                            flags,
+                            global_flags,
+                            slash_slack_request,
+                            exit_stack,
+                        )
+                    )
+            _set_stage(DELIVERING)
+            with _trace(tracer, "delivery", trace_span) as delivery_span:
+                await self._deliver(
+                    response,
+                    slash_slack_request,
+                    visible_in_channel="visible" in global_flags,
+                    trace_span=delivery_span,
+                )
+
+    async def _call(
+        self,
+        args: List[Any],
+        flags: Set[str],
+        global_flags: Set[str],
+        slash_slack_request: SlashSlackRequest,
+        exit_stack: Optional[AsyncExitStack] = None,
+    ):
+        """
+        Calls the command function and returns its result.
+
+        The values of request scoped dependencies are closed by `exit_stack`, or after the command function returns
+        when there is none.
+        """
+        if self.dependencies and exit_stack is None:
+            async with AsyncExitStack() as exit_stack:
+                return await self._call(
+                    args, flags, global_flags, slash_slack_request, exit_stack
+                )
         f_args = self._hydrate_func_args(args, flags, slash_slack_request)
+        if self.dependencies:
+            cache: Dict[Callable, Any] = {}
+            for _, dependency, i in self.dependencies:
+                f_args[i] = await self.dependency_container.resolve(
+                    dependency, slash_slack_request, cache, exit_stack
+                )
+        return await self._call_func(f_args, global_flags, slash_slack_request)
+
+    async def _call_func(
+        self,
+        f_args: List[Any],
+        global_flags: Set[str],
+        slash_slack_request: SlashSlackRequest,
+    ):
+        if self.profiler is not None and "profile" in global_flags:
+            return await self.profiler.run(
+                self.command,
+                self.func,
+                self.is_async,
+                f_args,
+                slash_slack_request.user_id,
+            )
         if self.is_async:
-            response = await self.func(*f_args)
-        else:
-            response = self.func(*f_args)
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                slash_slack_request.response_url,
-                json=_make_block_message(
-                    response, visible_in_channel="visible" in global_flags
-                ),
-            ) as resp:
-                if resp.status != 200:
-                    logger.error(
-                        f"Received an error when sending request to callback ({resp.status}): {await resp.text()}"
+            return await self.func(*f_args)
+        return self.func(*f_args)
+
+    async def _deliver(
+        self,
+        response: Any,
+        slash_slack_request: SlashSlackRequest,
+        visible_in_channel: bool,
+        trace_span: Any = None,
+    ):
+        """
+        Posts the command response to the `response_url` of the request, split into as many messages as are needed.
+        """
+        async with self.http_client.session() as session:
+            for i, message in enumerate(
+                self._iter_messages(response, visible_in_channel=visible_in_channel)
+            ):
+                if i == _MAX_RESPONSE_URL_MESSAGES:
+                    logger.warning(
+                        f"The response to {self.command} exceeded {_MAX_RESPONSE_URL_MESSAGES} messages and was truncated."
                     )
+                    break
+                with _trace(self.tracer, "response_url_post", trace_span):
+                    async with session.post(
+                        slash_slack_request.response_url,
+                        data=self.json_encoder(message),
+                        headers={"Content-Type": "application/json"},
+                    ) as resp:
+                        if resp.status != 200:
+                            logger.error(
+                                f"Received an error when sending request to callback ({resp.status}): {await resp.text()}"
+                            )
+                            break
+
+    def _iter_messages(self, response: Any, visible_in_channel: bool):
+        """
+        Generates the messages of the command response.
+        A `Paginated` response is cached in the `page_cache` and only its first page is sent.
+        """
+        if isinstance(response, _ProfiledPaginated):
+            return itertools.chain(
+                self._iter_messages(response.paginated, visible_in_channel),
+                _iter_block_messages(
+                    response.summary_blocks, visible_in_channel=visible_in_channel
+                ),
+            )
+        if not isinstance(response, Paginated):
+            return _iter_block_messages(response, visible_in_channel=visible_in_channel)
+        token = None
+        if response.page_count > 1:
+            token = self.page_cache.put(_CachedPages(response, visible_in_channel))
+        return iter((_make_page_message(response, 1, token, visible_in_channel),))
 
     def _help(
         self, slash_slack_request: SlashSlackRequest, visible_in_channel: bool = False
@@ -134,16 +484,17 @@ class SlashSlackCommand:
         """
         Generates the help text response for this command. Returns Slack Block Kit.
         """
+        signature, parameter_help, flag_help = self._static_help()
         _HELP = f"""
 `{slash_slack_request.command}` `{self.command}` help.
 To view this message run `{slash_slack_request.command} {self.command} --help`
 {f"*{self.summary}*" if self.summary else ""}
 {f"> {self.help}" if self.help else ""}
-`{slash_slack_request.command}` {self._generate_command_signature()}
+`{slash_slack_request.command}` {signature}
 Parameters:
-{self._generate_parameter_help()}
+{parameter_help}
 {"Flags:" if len(self.flags) > 0 else ""}
-{self._generate_flag_help()}
+{flag_help}
         """.strip()
 
         return _make_block_message(
@@ -151,6 +502,33 @@ Parameters:
             visible_in_channel=visible_in_channel,
         )
 
+    def _help_body(
+        self, slash_slack_request: SlashSlackRequest, visible_in_channel: bool = False
+    ) -> bytes:
+        """
+        Returns the serialized help for this command, cached by slash command name and visibility.
+        """
+        key = (slash_slack_request.command, visible_in_channel)
+        body = self._help_cache.get(key)
+        if body is None:
+            body = self.json_encoder(
+                self._help(slash_slack_request, visible_in_channel=visible_in_channel)
+            )
+            self._help_cache[key] = body
+        return body
+
+    def _static_help(self) -> Tuple[str, str, str]:
+        """
+        Returns the signature, parameter help and flag help of this command.
+        """
+        if self._static_help_parts is not None:
+            return self._static_help_parts
+        return (
+            self._generate_command_signature(),
+            self._generate_parameter_help(),
+            self._generate_flag_help(),
+        )
+
     def _generate_command_signature(self) -> str:
         return f"""
 `{self.command}` {" ".join(f"`{t.global_help_repr(name)}`" for name, t, _ in self.args_type + self.flags)}
@@ -170,6 +548,13 @@ Parameters:
     def _generate_flag_help(self) -> str:
         flag_help_contents = []
         for name, flag, index in self.flags:
+            if isinstance(flag, OptionType):
+                flag_help_contents.append(
+                    f"""
+> `--{name}=<{flag.arg_type.help_repr()}>` {flag.help if flag.help else ''}{f" (default: `{flag.default}`)" if flag.default is not None else ""}
+            """.strip()
+                )
+                continue
             flag_help_contents.append(
                 f"""
 > `--{name}` {flag.help if flag.help else ''}
@@ -177,3 +562,16 @@ Parameters:
             )
 
         return _NL.join(flag_help_contents)
+
+
+async def _call_command(context: ExecutionContext):
+    """
+    The innermost handler of the `execute` middleware chain.
+    """
+    return await context.command._call(
+        context.args,
+        context.flags,
+        context.global_flags,
+        context.slash_slack_request,
+        context.exit_stack,
+    )
@@ -0,0 +1,144 @@
+import re
+from typing import Dict, List, Tuple
+
+# Opening quote -> closing quote. Slack clients may send smart quotes.
+_QUOTES = {
+    '"': '"',
+    "'": "'",
+    "“": "”",
+    "‘": "’",
+}
+_ESCAPABLE = "".join(sorted(set(_QUOTES) | set(_QUOTES.values()) | {"\\"}))
+_QUOTE_AFTER_SEPARATOR = re.compile(f"[\\s=][{re.escape(''.join(_QUOTES))}]")
+# The name of an option whose value is quoted, EX: `--sort=` of `--sort="most recent"`.
+_QUOTED_OPTION_NAME = re.compile(f"--[^\\s=]+=(?=[{re.escape(''.join(_QUOTES))}])")
+_WHITESPACE = re.compile(r"\s")
+_NON_WHITESPACE = re.compile(r"\S")
+_NON_WHITESPACE_RUN = re.compile(r"\S+")
+_QUOTED_ESCAPE = re.compile(f"\\\\([{re.escape(_ESCAPABLE)}])")
+_UNQUOTED_ESCAPE = re.compile(f"\\\\([{re.escape(_ESCAPABLE)}]|\\s)")
+
+
+# An arg of the text: its value (unquoted and unescaped) and its start and end positions in the text.
+_Token = Tuple[str, int, int]
+
+
+def _tokenize(text: str) -> List[str]:
+    """
+    Splits the text into args on whitespace. Args can be quoted with double or single quotes
+    (or smart quotes) to include whitespace, EX: `a "b c" 'd'` -> ['a', 'b c', 'd'].
+
+    - A quote only opens at the start of an arg and only closes at the end of an arg,
+      so apostrophes within words (EX: don't) are kept as is.
+    - A backslash escapes a following quote, backslash, or (outside of quotes) whitespace. Any other backslash is kept.
+    - A quote which is never closed is kept as a literal character.
+    - The value of an option can be quoted as well, EX: `--sort="most recent"` -> ['--sort=most recent'].
+
+    Text without backslashes or args starting with a quote is split with `str.split`. Otherwise see `_tokenize_spans`.
+    """
+    if _is_plain(text):
+        return text.split()
+    return [value for value, _, _ in _tokenize_spans(text)]
+
+
+def _tokenize_spans(text: str) -> List[_Token]:
+    """
+    Same as `_tokenize` but also returns where each arg is in the text.
+
+    The text is scanned once: the closing quote found for an arg is remembered, so when a quote is never closed
+    the following args do not search the rest of the text again (see `_find_closing_quote`).
+    """
+    if _is_plain(text):
+        return [
+            (match.group(), match.start(), match.end())
+            for match in _NON_WHITESPACE_RUN.finditer(text)
+        ]
+
+    tokens: List[_Token] = []
+    closing_quotes: Dict[str, int] = {}
+    length = len(text)
+    start_match = _NON_WHITESPACE.search(text)
+    while start_match is not None:
+        i = start_match.start()
+        quote = i
+        if text.startswith("--", i):
+            option_match = _QUOTED_OPTION_NAME.match(text, i)
+            if option_match is not None:
+                quote = option_match.end()
+        closing_quote = _QUOTES.get(text[quote])
+        end = -1
+        if closing_quote is not None:
+            end = _find_closing_quote(text, quote + 1, closing_quote, closing_quotes)
+        if end != -1:
+            value = text[quote + 1 : end]
+            if "\\" in value:
+                value = _QUOTED_ESCAPE.sub(r"\1", value)
+            value = text[i:quote] + value
+            end += 1
+        else:
+            end = _find_unquoted_end(text, i)
+            value = text[i:end]
+            if "\\" in value:
+                value = _UNQUOTED_ESCAPE.sub(r"\1", value)
+        tokens.append((value, i, end))
+        if end >= length:
+            break
+        start_match = _NON_WHITESPACE.search(text, end)
+    return tokens
+
+
+def _is_plain(text: str) -> bool:
+    """
+    Whether the text has no backslashes and no args (or option values) starting with a quote,
+    so it can be split on whitespace.
+    """
+    return (
+        "\\" not in text
+        and text[:1] not in _QUOTES
+        and _QUOTE_AFTER_SEPARATOR.search(text) is None
+    )
+
+
+def _is_escaped(text: str, i: int, start: int) -> bool:
+    """
+    Whether the character at `i` is preceded by an odd number of backslashes (after `start`).
+    """
+    backslashes = 0
+    while i - backslashes - 1 >= start and text[i - backslashes - 1] == "\\":
+        backslashes += 1
+    return backslashes % 2 == 1
+
+
+def _find_closing_quote(
+    text: str, start: int, closing_quote: str, found: Dict[str, int]
+) -> int:
+    """
+    Returns the position of the first unescaped closing quote after `start` which is followed by whitespace
+    or the end of the text, or -1.
+
+    `found` holds the last result for each closing quote. As `start` only increases while a text is tokenized,
+    a result is reused until it is passed and -1 is final, so the text is searched at most once per closing quote.
+    """
+    end = found.get(closing_quote)
+    if end is not None and (end == -1 or end >= start):
+        return end
+    length = len(text)
+    end = text.find(closing_quote, start)
+    while end != -1:
+        if (end + 1 == length or text[end + 1].isspace()) and (
+            text[end - 1] != "\\" or not _is_escaped(text, end, start)
+        ):
+            break
+        end = text.find(closing_quote, end + 1)
+    found[closing_quote] = end
+    return end
+
+
+def _find_unquoted_end(text: str, start: int) -> int:
+    """
+    Returns the position of the first unescaped whitespace after `start`, or the length of the text.
+    """
+    match = _WHITESPACE.search(text, start)
+    while match is not None and _is_escaped(text, match.start(), start):
+        match = _WHITESPACE.search(text, match.start() + 1)
+    return len(text) if match is None else match.start()
@@ -0,0 +1,251 @@
+from abc import ABC, abstractmethod
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Sequence
+
+
+class Tracer(ABC):
+    """
+    Interface for tracing the stages of a SlashSlack request.
+
+    `start_span` is called when a stage starts and returns a span handle which is later passed to `end_span`.
+    `parent` is the span handle of the enclosing stage (or None for a root span).
+    `set_attributes` adds attributes to a started span (EX: the command and outcome of a request).
+    The span handle of a request's acknowledge span is passed into the background execution
+    so that the acknowledgement and the command execution are linked in the same trace.
+    """
+
+    @abstractmethod
+    def start_span(
+        self,
+        name: str,
+        parent: Any = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        pass
+
+    @abstractmethod
+    def end_span(self, span: Any, error: Optional[BaseException] = None) -> None:
+        pass
+
+    def set_attributes(self, span: Any, attributes: Dict[str, Any]) -> None:
+        pass
+
+
+class _MultiTracer(Tracer):
+    """
+    Reports spans to multiple tracers. The span handle is a tuple of the span handles of each tracer.
+    """
+
+    tracers: Sequence[Tracer]
+
+    def __init__(self, tracers: Sequence[Tracer]):
+        self.tracers = tracers
+
+    def start_span(
+        self,
+        name: str,
+        parent: Any = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> tuple:
+        if parent is None:
+            return tuple(
+                tracer.start_span(name, attributes=attributes)
+                for tracer in self.tracers
+            )
+        return tuple(
+            tracer.start_span(name, parent=p, attributes=attributes)
+            for tracer, p in zip(self.tracers, parent)
+        )
+
+    def end_span(self, span: tuple, error: Optional[BaseException] = None):
+        for tracer, s in zip(self.tracers, span):
+            tracer.end_span(s, error=error)
+
+    def set_attributes(self, span: tuple, attributes: Dict[str, Any]):
+        for tracer, s in zip(self.tracers, span):
+            tracer.set_attributes(s, attributes)
+
+
+def _combine_tracers(*tracers: Optional[Tracer]) -> Optional[Tracer]:
+    """
+    Returns a single tracer reporting to all of the given tracers, or None if there are none.
+    """
+    enabled = [tracer for tracer in tracers if tracer is not None]
+    if len(enabled) == 0:
+        return None
+    if len(enabled) == 1:
+        return enabled[0]
+    return _MultiTracer(enabled)
+
+
+class _NoopSpan:
+    """
+    Context manager used when tracing is disabled. A single instance is shared so disabled tracing allocates nothing.
+    """
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Span:
+    """
+    Context manager which starts a span on enter and ends it on exit, recording any raised exception.
+    """
+
+    __slots__ = ("tracer", "name", "parent", "attributes", "span")
+
+    def __init__(
+        self,
+        tracer: Tracer,
+        name: str,
+        parent: Any,
+        attributes: Optional[Dict[str, Any]],
+    ):
+        self.tracer = tracer
+        self.name = name
+        self.parent = parent
+        self.attributes = attributes
+
+    def __enter__(self):
+        self.span = self.tracer.start_span(
+            self.name, parent=self.parent, attributes=self.attributes
+        )
+        return self.span
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.tracer.end_span(self.span, error=exc_value)
+        return False
+
+
+def _trace(
+    tracer: Optional[Tracer],
+    name: str,
+    parent: Any = None,
+    attributes: Optional[Dict[str, Any]] = None,
+):
+    """
+    Returns a context manager tracing the named stage, or a shared no-op context manager if tracing is disabled.
+    """
+    if tracer is None:
+        return _NOOP_SPAN
+    return _Span(tracer, name, parent, attributes)
+
+
+def _set_attributes(tracer: Optional[Tracer], span: Any, attributes: Dict[str, Any]):
+    if tracer is not None:
+        tracer.set_attributes(span, attributes)
+
+
+class RecordedSpan:
+    """
+    A span recorded by the InMemoryTracer.
+    """
+
+    name: str
+    parent: Optional["RecordedSpan"]
+    attributes: Dict[str, Any]
+    start: float
+    end: Optional[float] = None
+    error: Optional[BaseException] = None
+
+    def __init__(
+        self,
+        name: str,
+        parent: Optional["RecordedSpan"],
+        attributes: Optional[Dict[str, Any]],
+    ):
+        self.name = name
+        self.parent = parent
+        self.attributes = attributes if attributes is not None else {}
+        self.start = perf_counter()
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.end is None:
+            return None
+        return self.end - self.start
+
+    def __repr__(self) -> str:
+        return f"RecordedSpan(name={self.name!r}, duration={self.duration})"
+
+
+class InMemoryTracer(Tracer):
+    """
+    Records all spans in memory. Intended for tests.
+    """
+
+    spans: List[RecordedSpan]
+
+    def __init__(self):
+        self.spans = []
+
+    def start_span(
+        self,
+        name: str,
+        parent: Any = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> RecordedSpan:
+        span = RecordedSpan(name, parent, attributes)
+        self.spans.append(span)
+        return span
+
+    def end_span(self, span: RecordedSpan, error: Optional[BaseException] = None):
+        span.end = perf_counter()
+        span.error = error
+
+    def set_attributes(self, span: RecordedSpan, attributes: Dict[str, Any]):
+        span.attributes.update(attributes)
+
+    def span_names(self) -> List[str]:
+        return [span.name for span in self.spans]
+
+    def get_spans(self, name: str) -> List[RecordedSpan]:
+        return [span for span in self.spans if span.name == name]
+
+    def clear(self):
+        self.spans = []
+
+
+class OpenTelemetryTracer(Tracer):
+    """
+    Reports spans to OpenTelemetry. Requires the `opentelemetry-api` package.
+
+    If no tracer is given, the tracer is retrieved from the globally configured tracer provider.
+    """
+
+    def __init__(self, tracer: Any = None):
+        try:
+            from opentelemetry import trace
+        except ImportError as e:
+            raise ImportError(
+                "The opentelemetry-api package is required to use the OpenTelemetryTracer."
+            ) from e
+
+        self._trace = trace
+        self.tracer = tracer if tracer is not None else trace.get_tracer("slash_slack")
+
+    def start_span(
+        self,
+        name: str,
+        parent: Any = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        context = None
+        if parent is not None:
+            context = self._trace.set_span_in_context(parent)
+        return self.tracer.start_span(name, context=context, attributes=attributes)
+
+    def end_span(self, span: Any, error: Optional[BaseException] = None):
+        if error is not None:
+            span.record_exception(error)
+            span.set_status(self._trace.Status(self._trace.StatusCode.ERROR))
+        span.end()
+
+    def set_attributes(self, span: Any, attributes: Dict[str, Any]):
+        span.set_attributes(attributes)
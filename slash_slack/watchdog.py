@@ -0,0 +1,171 @@
+import asyncio
+import inspect
+import logging
+import sys
+import threading
+import traceback
+from time import monotonic
+from types import CodeType, FrameType
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("slash_slack")
+
+UNKNOWN = "unknown"
+
+
+class StallStats:
+    """
+    The event loop stalls attributed to a single command or function. Durations are in seconds.
+    """
+
+    stalls: int
+    total_duration: float
+    max_duration: float
+    last_stack: List[str]
+
+    def __init__(self):
+        self.stalls = 0
+        self.total_duration = 0.0
+        self.max_duration = 0.0
+        self.last_stack = []
+
+    def record(self, duration: float, stack: List[str]):
+        self.stalls += 1
+        self.total_duration += duration
+        if duration > self.max_duration:
+            self.max_duration = duration
+        self.last_stack = stack
+
+    def to_dict(self) -> dict:
+        return {
+            "stalls": self.stalls,
+            "total_duration": self.total_duration,
+            "avg_duration": self.total_duration / self.stalls if self.stalls else 0.0,
+            "max_duration": self.max_duration,
+            "last_stack": self.last_stack,
+        }
+
+
+class LoopWatchdog:
+    """
+    Detects the event loop being blocked (EX: by a sync command function, which runs on the event loop) and attributes
+    each stall to the command, before request function, or middleware which was running.
+
+    A callback on the event loop records a heartbeat every `interval` seconds (by default `threshold / 4`).
+    A monitor thread checks the heartbeat, and when it is more than `threshold` seconds late captures the stack of the
+    event loop thread and logs it as a warning. The innermost frame of a registered function in the stack is blamed,
+    or `unknown` when there is none. The stack is sampled again every `interval` until the loop recovers, so one stall
+    spanning several functions is split between them. The duration blamed on each one is recorded in `stats`.
+
+    The functions are registered when the app is frozen. Running the watchdog costs one callback per `interval` on the
+    event loop and one thread which wakes up every `interval` seconds.
+    """
+
+    threshold: float
+    interval: float
+    stack_limit: int
+    stats: Dict[str, StallStats]
+
+    def __init__(
+        self,
+        threshold: float = 0.1,
+        interval: Optional[float] = None,
+        stack_limit: int = 30,
+    ):
+        self.threshold = threshold
+        self.interval = interval if interval is not None else threshold / 4
+        self.stack_limit = stack_limit
+        self.stats = {}
+        self._labels: Dict[CodeType, str] = {}
+        self._beat = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat_handle: Optional[asyncio.TimerHandle] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def register(self, label: str, func: Callable):
+        """
+        Attributes the stalls which happen while `func` is running to `label`.
+        """
+        code = getattr(inspect.unwrap(func), "__code__", None)
+        if code is not None:
+            self._labels.setdefault(code, label)
+
+    async def start(self):
+        if self._thread is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stopped.clear()
+        self._heartbeat()
+        self._thread = threading.Thread(
+            target=self._monitor, name="slash_slack_watchdog", daemon=True
+        )
+        self._thread.start()
+
+    async def stop(self):
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._stopped.set()
+        if self._heartbeat_handle is not None:
+            self._heartbeat_handle.cancel()
+            self._heartbeat_handle = None
+        thread.join()
+
+    def report(self) -> Dict[str, dict]:
+        """
+        Returns the stall stats of each command or function which blocked the event loop.
+        """
+        return {label: stats.to_dict() for label, stats in list(self.stats.items())}
+
+    def _heartbeat(self):
+        self._beat = monotonic()
+        self._heartbeat_handle = self._loop.call_later(self.interval, self._heartbeat)
+
+    def _monitor(self):
+        # (heartbeat, label, stack, start) of the stall in progress.
+        stall: Optional[Tuple[float, str, List[str], float]] = None
+        while not self._stopped.wait(self.interval):
+            beat = self._beat
+            if stall is not None and beat != stall[0]:
+                self._record(stall[1], beat - stall[3], stall[2])
+                stall = None
+            now = monotonic()
+            late = now - beat - self.interval
+            if late <= self.threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            label, stack = self._attribute(frame)
+            if stall is not None and label == stall[1]:
+                continue
+            if stall is None:
+                stall = (beat, label, stack, beat + self.interval)
+            else:
+                # The loop is still blocked, by the next function.
+                self._record(stall[1], now - stall[3], stall[2])
+                stall = (beat, label, stack, now)
+            logger.warning(
+                f"The event loop has been blocked for {late:.3f}s by {label}:\n{''.join(stack)}"
+            )
+
+    def _record(self, label: str, duration: float, stack: List[str]):
+        self.stats.setdefault(label, StallStats()).record(max(duration, 0.0), stack)
+        logger.warning(f"The event loop was blocked for {duration:.3f}s by {label}.")
+
+    def _attribute(self, frame: Optional[FrameType]) -> Tuple[str, List[str]]:
+        """
+        Returns the label of the innermost registered function in the stack of `frame`, and the formatted stack.
+        """
+        if frame is None:
+            return UNKNOWN, []
+        label = UNKNOWN
+        current: Optional[FrameType] = frame
+        while current is not None:
+            found = self._labels.get(current.f_code)
+            if found is not None:
+                label = found
+                break
+            current = current.f_back
+        return label, traceback.format_stack(frame, limit=self.stack_limit)
@@ -0,0 +1,95 @@
+"""
+Fixtures shared by the test scripts. Each test script is run from this directory, so they import it as `helpers`.
+"""
+import asyncio
+from typing import Any, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from fastapi import BackgroundTasks, Request, Response
+
+from slash_slack import SlashSlack
+
+REQUEST_PARAMS = {
+    "token": "test",
+    "team_id": "T123",
+    "team_domain": "123",
+    "channel_id": "1234",
+    "channel_name": "test",
+    "user_id": "U1",
+    "user_name": "John Doe",
+    "command": "/command",
+    "response_url": "https://hooks.slack.com/commands/1",
+    "trigger_id": "1239873",
+    "api_app_id": "2134",
+}
+
+
+def _make_request(
+    text: str,
+    headers: Optional[List[Tuple[bytes, bytes]]] = None,
+    path: str = "/slash_slack",
+    **params: str,
+) -> Request:
+    """
+    Returns a slash command request for `text`. `params` override the values of `REQUEST_PARAMS`.
+    """
+    body = urlencode({**REQUEST_PARAMS, **params, "text": text}).encode()
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return Request(
+        {
+            "type": "http",
+            "method": "POST",
+            "headers": headers if headers is not None else [],
+            "path": path,
+        },
+        receive,
+    )
+
+
+def _endpoint(slash: SlashSlack):
+    """
+    Returns the FastAPI endpoint function of the slash command route.
+    """
+    for route in slash.get_fast_api().routes:
+        if getattr(route, "path", None) == slash.url_path:
+            return route.endpoint
+
+
+def _send(
+    slash: SlashSlack,
+    text: str,
+    headers: Optional[List[Tuple[bytes, bytes]]] = None,
+    **params: str,
+) -> Response:
+    """
+    Sends a slash command request for `text` to the endpoint and runs its background tasks, as the server would.
+    `headers` and `params` are passed to `_make_request`. Returns the acknowledge response.
+    """
+
+    async def run():
+        background_tasks = BackgroundTasks()
+        response = await _endpoint(slash)(
+            _make_request(text, headers, **params), background_tasks
+        )
+        await background_tasks()
+        return response
+
+    return asyncio.run(run())
+
+
+def _capture_deliveries(slash: SlashSlack, visibility: bool = False) -> List[Any]:
+    """
+    Replaces the delivery of every command of the app so nothing is posted, and returns the list the responses
+    are appended to. When `visibility` is True (response, visible_in_channel) pairs are appended instead.
+    """
+    delivered: List[Any] = []
+
+    async def deliver(response, slash_slack_request, visible_in_channel, **kwargs):
+        delivered.append((response, visible_in_channel) if visibility else response)
+
+    for command in slash.commands.values():
+        command._deliver = deliver
+    return delivered
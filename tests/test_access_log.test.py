@@ -0,0 +1,176 @@
+import asyncio
+import json
+import logging
+from unittest import TestCase, main
+
+from fastapi import BackgroundTasks, Request
+
+from slash_slack import SlashSlack
+from slash_slack.access_log import AccessLog
+from slash_slack.scheduler import PriorityScheduler
+from slash_slack.tracing import InMemoryTracer
+
+from helpers import _capture_deliveries, _endpoint, _make_request, _send
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record: logging.LogRecord):
+        self.records.append(json.loads(record.getMessage()))
+
+
+def _make_logged_app(access_log: AccessLog, tracer=None) -> SlashSlack:
+    slash = SlashSlack(dev=True, access_log=access_log, tracer=tracer)
+
+    @slash.command("echo")
+    def echo(s: str):
+        return s
+
+    _capture_deliveries(slash)
+    return slash
+
+
+class TestAccessLog(TestCase):
+    def test_executed_command(self):
+        handler = ListHandler()
+        access_log = AccessLog(handler=handler, logger_name="test_executed")
+        access_log.start()
+        slash = _make_logged_app(access_log)
+        _send(slash, "echo hello")
+        access_log.stop()
+        self.assertEqual(1, len(handler.records))
+        record = handler.records[0]
+        self.assertEqual("echo", record["command"])
+        self.assertEqual("/command", record["slash_command"])
+        self.assertEqual("U1", record["user_id"])
+        self.assertEqual("T123", record["team_id"])
+        self.assertEqual("scheduled", record["outcome"])
+        for key in ["request_id", "ack_ms", "execute_ms", "execution_ms"]:
+            self.assertIn(key, record)
+        for stage in ["form_decode", "model_validation", "parse_args", "delivery"]:
+            self.assertIn(stage, record["stages"])
+
+    def test_not_executed(self):
+        handler = ListHandler()
+        access_log = AccessLog(handler=handler, logger_name="test_not_executed")
+        access_log.start()
+        slash = _make_logged_app(access_log)
+        _send(slash, "unknown command")
+        _send(slash, "help")
+        access_log.stop()
+        self.assertEqual(
+            ["command_not_found", "help"], [r["outcome"] for r in handler.records]
+        )
+        self.assertNotEqual(
+            handler.records[0]["request_id"], handler.records[1]["request_id"]
+        )
+
+    def test_sampling(self):
+        handler = ListHandler()
+        access_log = AccessLog(
+            handler=handler,
+            logger_name="test_sampling",
+            sample_rates={"echo": 0.0},
+        )
+        access_log.start()
+        slash = _make_logged_app(access_log)
+        _send(slash, "echo hello")
+        _send(slash, "unknown")
+        access_log.stop()
+        self.assertEqual(["unknown"], [r["command"] for r in handler.records])
+
+    def test_with_tracer(self):
+        handler = ListHandler()
+        access_log = AccessLog(handler=handler, logger_name="test_with_tracer")
+        access_log.start()
+        tracer = InMemoryTracer()
+        slash = _make_logged_app(access_log, tracer=tracer)
+        _send(slash, "echo hello")
+        access_log.stop()
+        self.assertEqual(1, len(handler.records))
+        self.assertEqual("echo", tracer.spans[0].attributes["command"])
+        self.assertEqual(1, len(tracer.get_spans("slash_slack.execute")))
+
+    def test_private_loggers(self):
+        a_handler, b_handler = ListHandler(), ListHandler()
+        a = AccessLog(handler=a_handler)
+        b = AccessLog(handler=b_handler)
+        self.assertIsNot(a.logger, b.logger)
+        self.assertFalse(a._listener_started)
+        a.start()
+        b.start()
+        _send(_make_logged_app(a), "unknown")
+        a.stop()
+        b.stop()
+        self.assertEqual(1, len(a_handler.records))
+        self.assertEqual([], b_handler.records)
+
+    def test_interactivity(self):
+        handler = ListHandler()
+        access_log = AccessLog(handler=handler)
+        access_log.start()
+        slash = _make_logged_app(access_log)
+        body = b"payload=%7B%7D"
+
+        async def receive():
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def run():
+            request = Request(
+                {
+                    "type": "http",
+                    "method": "POST",
+                    "headers": [],
+                    "path": "/slash_slack/interactivity",
+                },
+                receive,
+            )
+            for route in slash.get_fast_api().routes:
+                if getattr(route, "path", None) == request.url.path:
+                    await route.endpoint(request, BackgroundTasks())
+
+        asyncio.run(run())
+        access_log.stop()
+        self.assertEqual(["ignored"], [r["outcome"] for r in handler.records])
+        self.assertIn("ack_ms", handler.records[0])
+
+    def test_cancelled_while_queued(self):
+        handler = ListHandler()
+        access_log = AccessLog(handler=handler)
+        access_log.start()
+        slash = SlashSlack(
+            dev=True, access_log=access_log, scheduler=PriorityScheduler(concurrency=1)
+        )
+
+        @slash.command("sleep")
+        async def sleep_command():
+            await asyncio.sleep(10)
+
+        async def run():
+            tasks = []
+            for _ in range(2):
+                background_tasks = BackgroundTasks()
+                await _endpoint(slash)(_make_request("sleep"), background_tasks)
+                tasks.append(asyncio.ensure_future(background_tasks()))
+                await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            self.assertEqual(1, sum(slash.scheduler.queued().values()))
+            await slash._executions.drain(0)
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        asyncio.run(run())
+        access_log.stop()
+        self.assertEqual(2, len(handler.records))
+        for record in handler.records:
+            self.assertEqual("sleep", record["command"])
+            self.assertIn("CancelledError", record["error"])
+        self.assertEqual(
+            1, len([r for r in handler.records if "function_execution" in r["stages"]])
+        )
+
+
+if __name__ == "__main__":
+    main()
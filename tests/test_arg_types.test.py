@@ -1,12 +1,27 @@
+import array
+import re
+import sys
 from unittest import TestCase, main
 
 from slash_slack.arg_types import (
     EnumType,
     FloatType,
     IntType,
+    RegexType,
     StringType,
     UnknownLengthListType,
 )
+from slash_slack.exceptions import InvalidArrayArgTypeException
+
+
+class CountingIntType(IntType):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def parse(self, value):
+        self.calls += 1
+        return super().parse(value)
 
 
 class TestFloatType(TestCase):
@@ -155,6 +170,54 @@ class TestEnumType(TestCase):
         self.assertEqual("test", parsed)
 
 
+class TestStringTypeRegex(TestCase):
+    def test_regex(self):
+        v = StringType(regex=r"[0-9a-f]{7,40}")
+        self.assertEqual("deadbee", v.parse("deadbee"))
+        self.assertEqual(None, v.parse("deadbeeX"))
+        self.assertEqual(None, v.parse("xdeadbee"))
+        self.assertEqual(None, v.parse("dead"))
+
+    def test_regex_and_length(self):
+        v = StringType(regex=r"[a-z]+", maximum_length=3)
+        self.assertEqual("abc", v.parse("abc"))
+        self.assertEqual(None, v.parse("abcd"))
+
+    def test_help(self):
+        v = StringType(regex=r"[a-z]+")
+        self.assertEqual("string (matches `[a-z]+`)", v.help_repr())
+
+
+class TestRegexType(TestCase):
+    def test_match(self):
+        v = RegexType(r"[A-Z]+-[0-9]+")
+        self.assertEqual("ABC-123", v.parse("ABC-123"))
+        self.assertEqual(None, v.parse("ABC-123x"))
+        self.assertEqual(None, v.parse("abc-123"))
+        self.assertEqual(None, v.parse(None))
+        self.assertEqual(None, v.parse(["ABC-123"]))
+
+    def test_groups(self):
+        v = RegexType(r"(?P<project>[A-Z]+)-(?P<number>[0-9]+)", groups=True)
+        self.assertEqual({"project": "ABC", "number": "123"}, v.parse("ABC-123"))
+        self.assertEqual(None, v.parse("ABC"))
+
+    def test_flags(self):
+        v = RegexType(r"[a-z]+", flags=re.IGNORECASE)
+        self.assertEqual("AbC", v.parse("AbC"))
+
+    def test_flags_with_compiled_pattern(self):
+        with self.assertRaises(ValueError):
+            RegexType(re.compile(r"[a-z]+"), flags=re.IGNORECASE)
+
+    def test_compiled_once(self):
+        self.assertIs(
+            RegexType(r"[a-z]+[0-9]").regex, StringType(regex=r"[a-z]+[0-9]").regex
+        )
+        pattern = re.compile(r"[0-9]+")
+        self.assertIs(pattern, RegexType(pattern).regex)
+
+
 class TestUnknownLengthListType(TestCase):
     def test_empty(self):
         v = UnknownLengthListType(arg_type=StringType())
@@ -190,6 +253,66 @@ class TestUnknownLengthListType(TestCase):
         parsed = v.parse(["asf", "200"])
         self.assertEqual(None, parsed)
 
+    def test_early_exit(self):
+        arg_type = CountingIntType()
+        v = UnknownLengthListType(arg_type=arg_type)
+        parsed = v.parse(["bad"] + [str(i) for i in range(1000)])
+        self.assertEqual(None, parsed)
+        self.assertEqual(1, arg_type.calls)
+
+
+class TestUnknownLengthListTypeArray(TestCase):
+    def _without_numpy(self, func):
+        numpy = sys.modules.get("numpy")
+        sys.modules["numpy"] = None
+        try:
+            return func()
+        finally:
+            if numpy is None:
+                del sys.modules["numpy"]
+            else:
+                sys.modules["numpy"] = numpy
+
+    def test_int(self):
+        v = UnknownLengthListType(arg_type=IntType(), array=True)
+        parsed = v.parse("1 2  -3")
+        self.assertEqual([1, 2, -3], [int(x) for x in parsed])
+        self.assertEqual([], list(v.parse([])))
+        self.assertEqual(None, v.parse(["1", "1.5"]))
+        self.assertEqual(None, v.parse(["1", "a"]))
+        self.assertEqual(None, v.parse(["99999999999999999999999"]))
+
+    def test_float(self):
+        v = UnknownLengthListType(arg_type=FloatType(), array=True)
+        parsed = v.parse(["1.5", "200", "-1e3"])
+        self.assertEqual([1.5, 200.0, -1000.0], [float(x) for x in parsed])
+        self.assertEqual(None, v.parse(["1", "asf"]))
+
+    def test_bounds(self):
+        v = UnknownLengthListType(arg_type=IntType(minimum=0, maximum=10), array=True)
+        self.assertEqual([0, 10], [int(x) for x in v.parse(["0", "10"])])
+        self.assertEqual(None, v.parse(["0", "11"]))
+        self.assertEqual(None, v.parse(["-1", "10"]))
+
+    def test_stdlib_array(self):
+        v = self._without_numpy(
+            lambda: UnknownLengthListType(arg_type=IntType(maximum=5), array=True)
+        )
+        parsed = v.parse(["1", "2", "3"])
+        self.assertIsInstance(parsed, array.array)
+        self.assertEqual(array.array("q", [1, 2, 3]), parsed)
+        self.assertEqual(None, v.parse(["1", "6"]))
+        self.assertEqual(None, v.parse(["1", "x"]))
+
+        v = self._without_numpy(
+            lambda: UnknownLengthListType(arg_type=FloatType(), array=True)
+        )
+        self.assertEqual(array.array("d", [1.5, 2.0]), v.parse(["1.5", "2"]))
+
+    def test_non_numeric(self):
+        with self.assertRaises(InvalidArrayArgTypeException):
+            UnknownLengthListType(arg_type=StringType(), array=True)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,114 @@
+from unittest import TestCase, main
+
+from slash_slack.blocks import (
+    _MAX_BLOCKS_PER_MESSAGE,
+    _MAX_SECTION_TEXT_LENGTH,
+    _iter_block_messages,
+    _make_block_message,
+    _make_mrkdown_block,
+    _split_mrkdown,
+)
+
+
+class TestMakeBlockMessage(TestCase):
+    def test_empty(self):
+        self.assertEqual({}, _make_block_message(None))
+        self.assertEqual({}, _make_block_message(""))
+
+    def test_str(self):
+        message = _make_block_message("test", visible_in_channel=False)
+        self.assertEqual(
+            {"blocks": [_make_mrkdown_block("test")], "response_type": "ephemeral"},
+            message,
+        )
+
+    def test_list(self):
+        block = {"type": "divider"}
+        message = _make_block_message(["a", block])
+        self.assertEqual([_make_mrkdown_block("a"), block], message["blocks"])
+        self.assertEqual("in_channel", message["response_type"])
+
+    def test_generator(self):
+        message = _make_block_message(str(i) for i in range(3))
+        self.assertEqual(
+            [_make_mrkdown_block(str(i)) for i in range(3)], message["blocks"]
+        )
+
+    def test_long_str(self):
+        message = _make_block_message("a" * (_MAX_SECTION_TEXT_LENGTH * 2 + 1))
+        self.assertEqual(3, len(message["blocks"]))
+
+
+class TestSplitMrkdown(TestCase):
+    def test_short(self):
+        self.assertEqual(["test"], list(_split_mrkdown("test")))
+        self.assertEqual([""], list(_split_mrkdown("")))
+
+    def test_split_on_newline(self):
+        line = "a" * 100
+        text = "\n".join([line] * 100)
+        chunks = list(_split_mrkdown(text))
+        self.assertTrue(len(chunks) > 1)
+        for chunk in chunks:
+            self.assertTrue(len(chunk) <= _MAX_SECTION_TEXT_LENGTH)
+            self.assertEqual("", chunk.replace(line, "").replace("\n", ""))
+        self.assertEqual(text.count("a"), sum(chunk.count("a") for chunk in chunks))
+
+    def test_split_on_space(self):
+        word = "a" * 99
+        text = " ".join([word] * 100)
+        chunks = list(_split_mrkdown(text))
+        self.assertTrue(len(chunks) > 1)
+        for chunk in chunks:
+            self.assertTrue(len(chunk) <= _MAX_SECTION_TEXT_LENGTH)
+            self.assertFalse(chunk.startswith(" "))
+        self.assertEqual(text.split(" "), " ".join(chunks).split(" "))
+
+    def test_split_without_whitespace(self):
+        chunks = list(_split_mrkdown("a" * (_MAX_SECTION_TEXT_LENGTH + 1)))
+        self.assertEqual(["a" * _MAX_SECTION_TEXT_LENGTH, "a"], chunks)
+
+
+class TestIterBlockMessages(TestCase):
+    def test_empty(self):
+        self.assertEqual([{}], list(_iter_block_messages(None)))
+        self.assertEqual(
+            [{"blocks": [], "response_type": "in_channel"}],
+            list(_iter_block_messages([])),
+        )
+
+    def test_single_message(self):
+        self.assertEqual(
+            [_make_block_message("test", visible_in_channel=False)],
+            list(_iter_block_messages("test", visible_in_channel=False)),
+        )
+
+    def test_multiple_messages(self):
+        messages = list(_iter_block_messages([str(i) for i in range(120)]))
+        self.assertEqual(3, len(messages))
+        self.assertEqual(_MAX_BLOCKS_PER_MESSAGE, len(messages[0]["blocks"]))
+        self.assertEqual(20, len(messages[2]["blocks"]))
+        self.assertEqual(_make_mrkdown_block("119"), messages[2]["blocks"][-1])
+
+    def test_header(self):
+        messages = list(
+            _iter_block_messages(["a"] * _MAX_BLOCKS_PER_MESSAGE, header="header")
+        )
+        self.assertEqual(2, len(messages))
+        self.assertEqual("header", messages[0]["blocks"][0]["type"])
+
+    def test_lazy(self):
+        consumed = []
+
+        def generate():
+            for i in range(_MAX_BLOCKS_PER_MESSAGE * 3):
+                consumed.append(i)
+                yield str(i)
+
+        messages = _iter_block_messages(generate())
+        next(messages)
+        self.assertTrue(len(consumed) <= _MAX_BLOCKS_PER_MESSAGE + 1)
+
+
+if __name__ == "__main__":
+    main()
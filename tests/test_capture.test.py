@@ -0,0 +1,95 @@
+import asyncio
+import os
+import tempfile
+from unittest import TestCase, main
+from urllib.parse import urlencode
+
+from slash_slack import SlashSlack
+from slash_slack.capture import REDACTED, TrafficRecorder, _read_capture
+
+from helpers import _capture_deliveries, _send
+
+HEADERS = [
+    (b"content-type", b"application/x-www-form-urlencoded"),
+    (b"x-slack-signature", b"v0=abcdef"),
+    (b"x-slack-request-timestamp", b"1700000000"),
+]
+SECRET_PARAMS = {
+    "token": "secret-token",
+    "response_url": "https://hooks.slack.com/commands/T123/secret",
+}
+
+
+class TestCapture(TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".jsonl")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_records_redacted_requests(self):
+        recorder = TrafficRecorder(self.path)
+        recorder.start()
+        slash = SlashSlack(dev=True, traffic_recorder=recorder)
+
+        @slash.command("echo")
+        def echo(s: str):
+            return s
+
+        _capture_deliveries(slash)
+        for text in ["echo one", "help"]:
+            _send(slash, text, HEADERS, **SECRET_PARAMS)
+        recorder.stop()
+
+        captured = list(_read_capture(self.path))
+        self.assertEqual(2, len(captured))
+        self.assertLessEqual(captured[0].timestamp, captured[1].timestamp)
+        params = captured[0].params
+        self.assertEqual("echo one", params["text"])
+        self.assertEqual("U1", params["user_id"])
+        self.assertEqual(REDACTED, params["token"])
+        self.assertEqual(REDACTED, params["response_url"])
+        self.assertEqual("help", captured[1].params["text"])
+        headers = captured[0].headers
+        self.assertEqual(REDACTED, headers["x-slack-signature"])
+        self.assertEqual("1700000000", headers["x-slack-request-timestamp"])
+        with open(self.path) as f:
+            contents = f.read()
+        self.assertNotIn("secret", contents)
+        self.assertNotIn("abcdef", contents)
+
+    def test_appends(self):
+        for text in ["a", "b"]:
+            recorder = TrafficRecorder(self.path, redact_fields=())
+            recorder.start()
+            recorder.record(1.0, {}, urlencode({"text": text}).encode())
+            recorder.stop()
+        self.assertEqual(
+            ["a", "b"], [r.params["text"] for r in _read_capture(self.path)]
+        )
+
+    def test_drops_when_full(self):
+        recorder = TrafficRecorder(self.path, max_queue_size=1)
+        recorder.record(1.0, {}, b"text=a")
+        recorder.record(2.0, {}, b"text=b")
+        self.assertEqual(1, recorder.dropped)
+        recorder.start()
+        recorder.stop()
+        self.assertEqual(["a"], [r.params["text"] for r in _read_capture(self.path)])
+
+    def test_started_by_the_app(self):
+        recorder = TrafficRecorder(self.path)
+        self.assertIsNone(recorder._thread)
+        slash = SlashSlack(dev=True, traffic_recorder=recorder)
+
+        async def run():
+            async with slash._lifespan(slash.app):
+                self.assertIsNotNone(recorder._thread)
+
+        asyncio.run(run())
+        self.assertIsNone(recorder._thread)
+
+
+if __name__ == "__main__":
+    main()
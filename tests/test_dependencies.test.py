@@ -0,0 +1,201 @@
+import asyncio
+from contextlib import AsyncExitStack
+from unittest import TestCase, main
+
+from fastapi import BackgroundTasks
+
+from slash_slack import Depends, SlashSlack, SlashSlackRequest
+from slash_slack.dependencies import APP, Dependency, _DependencyContainer
+from slash_slack.exceptions import InvalidDependencyException
+from slash_slack.slash_slack import _parse_func_dependencies, _parse_func_params
+
+from helpers import _capture_deliveries, _make_request
+
+
+class Pool:
+    def __init__(self):
+        self.closed = False
+
+
+class TestDependencies(TestCase):
+    def test_parse_func_params(self):
+        def provider():
+            return 1
+
+        def t(s: str, db: Pool = Depends(provider), i: int = 1):
+            pass
+
+        params, flags, request_arg = _parse_func_params(t)
+        self.assertEqual(["s", "i"], [p[0] for p in params])
+        dependencies = _parse_func_dependencies(t)
+        self.assertEqual(1, len(dependencies))
+        name, dependency, index = dependencies[0]
+        self.assertEqual(("db", provider, 1), (name, dependency.provider, index))
+
+    def test_invalid_dependencies(self):
+        def request_scoped():
+            return 1
+
+        def takes_request(slash_slack_request: SlashSlackRequest):
+            return 1
+
+        def takes_value(value):
+            return value
+
+        self.assertRaises(InvalidDependencyException, Depends, request_scoped, "user")
+        self.assertRaises(InvalidDependencyException, Depends, takes_value)
+        self.assertRaises(InvalidDependencyException, Depends, takes_request, APP)
+
+        def app_scoped(value=Depends(request_scoped)):
+            return value
+
+        self.assertRaises(InvalidDependencyException, Depends, app_scoped, APP)
+
+    def test_app_and_request_scopes(self):
+        events = []
+
+        async def get_pool():
+            pool = Pool()
+            events.append("pool open")
+            yield pool
+            pool.closed = True
+            events.append("pool close")
+
+        def get_session(
+            slash_slack_request: SlashSlackRequest,
+            pool: Pool = Depends(get_pool, scope=APP),
+        ):
+            events.append(f"session open {slash_slack_request.text}")
+            yield (pool, slash_slack_request.user_id)
+            events.append("session close")
+
+        def get_repository(session=Depends(get_session)):
+            return session
+
+        slash = SlashSlack(dev=True)
+        results = []
+
+        @slash.command("echo")
+        async def echo(
+            s: str,
+            session=Depends(get_session),
+            repository=Depends(get_repository),
+            pool: Pool = Depends(get_pool, scope=APP),
+        ):
+            events.append("echo")
+            results.append((s, session, repository, pool))
+            return s
+
+        _capture_deliveries(slash)
+
+        async def run():
+            async with slash._lifespan(slash.app):
+                self.assertEqual(["pool open"], events)
+                for text in ["echo a", "echo b"]:
+                    background_tasks = BackgroundTasks()
+                    await slash._acknowledge(
+                        _make_request(text), background_tasks, None
+                    )
+                    await background_tasks()
+
+        asyncio.run(run())
+        self.assertEqual(
+            [
+                "pool open",
+                "session open echo a",
+                "echo",
+                "session close",
+                "session open echo b",
+                "echo",
+                "session close",
+                "pool close",
+            ],
+            events,
+        )
+        self.assertEqual(2, len(results))
+        (s, session, repository, pool), second = results
+        self.assertEqual("a", s)
+        self.assertIs(session, repository)
+        self.assertIs(pool, session[0])
+        self.assertIs(pool, second[3])
+        self.assertIsNot(session, second[1])
+        self.assertTrue(pool.closed)
+
+    def test_request_scope_open_during_delivery(self):
+        events = []
+
+        def get_connection():
+            events.append("open")
+            yield "conn"
+            events.append("close")
+
+        slash = SlashSlack(dev=True)
+
+        @slash.command("rows")
+        def rows(connection=Depends(get_connection)):
+            for i in range(2):
+                events.append(f"row{i} using {connection}")
+                yield f"row{i}"
+
+        command = slash.commands["rows"]
+
+        async def deliver(response, *args, **kwargs):
+            list(command._iter_messages(response, visible_in_channel=False))
+            events.append("delivered")
+
+        command._deliver = deliver
+
+        async def run():
+            background_tasks = BackgroundTasks()
+            await slash._acknowledge(_make_request("rows"), background_tasks, None)
+            await background_tasks()
+
+        asyncio.run(run())
+        self.assertEqual(
+            ["open", "row0 using conn", "row1 using conn", "delivered", "close"],
+            events,
+        )
+
+    def test_request_scope_closed_on_error(self):
+        events = []
+
+        def get_resource():
+            try:
+                yield 1
+            finally:
+                events.append("closed")
+
+        async def run():
+            container = _DependencyContainer()
+            dependency = Dependency(get_resource)
+            with self.assertRaises(ValueError):
+                async with AsyncExitStack() as exit_stack:
+                    await container.resolve(dependency, None, {}, exit_stack)
+                    raise ValueError()
+
+        asyncio.run(run())
+        self.assertEqual(["closed"], events)
+
+    def test_app_scope_created_on_first_use(self):
+        calls = []
+
+        def get_client():
+            calls.append(1)
+            return object()
+
+        async def run():
+            container = _DependencyContainer()
+            dependency = Dependency(get_client, scope=APP)
+            values = await asyncio.gather(
+                *(container.resolve(dependency, None, {}, None) for _ in range(5))
+            )
+            await container.stop()
+            return values
+
+        values = asyncio.run(run())
+        self.assertEqual(1, len(calls))
+        self.assertEqual(1, len({id(v) for v in values}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import asyncio
+import json
+from unittest import TestCase, main
+
+from fastapi import BackgroundTasks
+
+from slash_slack import SlashSlack
+from slash_slack.drain import DELIVERING, _Execution, _ExecutionTracker
+
+from helpers import _capture_deliveries, _endpoint, _make_request
+
+
+def _make_sleep_app(drain_timeout: float, sleep: float):
+    slash = SlashSlack(dev=True, drain_timeout=drain_timeout)
+
+    @slash.command("sleep")
+    async def sleep_command():
+        await asyncio.sleep(sleep)
+        return "done"
+
+    return slash, _capture_deliveries(slash)
+
+
+async def _send_in_background(slash: SlashSlack, text: str):
+    """
+    Acknowledges the request and runs its background tasks in a separate task, as the server would.
+    """
+    background_tasks = BackgroundTasks()
+    response = await _endpoint(slash)(_make_request(text), background_tasks)
+    return response, asyncio.ensure_future(background_tasks())
+
+
+class TestDrain(TestCase):
+    def test_tracker(self):
+        async def run():
+            tracker = _ExecutionTracker()
+            cancelled = []
+
+            async def work(duration):
+                try:
+                    await asyncio.sleep(duration)
+                except asyncio.CancelledError:
+                    cancelled.append(duration)
+                    raise
+
+            fast = asyncio.ensure_future(tracker.run(_Execution("fast", "U1"), work, 0))
+            slow = asyncio.ensure_future(
+                tracker.run(_Execution("slow", "U2", DELIVERING), work, 10)
+            )
+            await asyncio.sleep(0)
+            self.assertEqual(2, len(tracker))
+            abandoned = await tracker.drain(0.1)
+            await asyncio.gather(fast, slow, return_exceptions=True)
+            return tracker, abandoned, cancelled
+
+        tracker, abandoned, cancelled = asyncio.run(run())
+        self.assertTrue(tracker.draining)
+        self.assertEqual(0, len(tracker))
+        self.assertEqual(["slow"], [e.command for e in abandoned])
+        self.assertEqual(DELIVERING, abandoned[0].report()["stage"])
+        self.assertEqual([10], cancelled)
+
+    def test_shutdown_drains_executions(self):
+        slash, delivered = _make_sleep_app(drain_timeout=5, sleep=0.1)
+
+        async def run():
+            async with slash._lifespan(slash.app):
+                _, task = await _send_in_background(slash, "sleep")
+                await asyncio.sleep(0)
+                self.assertEqual(1, len(slash._executions))
+                # The server cancels the request, the execution keeps running until it is drained.
+                task.cancel()
+            self.assertEqual(["done"], delivered)
+            response, task = await _send_in_background(slash, "sleep")
+            await task
+            return response
+
+        response = asyncio.run(run())
+        self.assertEqual(["done"], delivered)
+        self.assertIn(b"restarting", response.body)
+        self.assertEqual("ephemeral", json.loads(response.body)["response_type"])
+
+    def test_shutdown_reports_abandoned(self):
+        slash, delivered = _make_sleep_app(drain_timeout=0.05, sleep=10)
+
+        async def run():
+            async with slash._lifespan(slash.app):
+                _, task = await _send_in_background(slash, "sleep")
+                await asyncio.sleep(0)
+            await asyncio.gather(task, return_exceptions=True)
+
+        with self.assertLogs("slash_slack", level="WARNING") as logs:
+            asyncio.run(run())
+        self.assertEqual([], delivered)
+        self.assertIn("Abandoned sleep for U1 while executing", "\n".join(logs.output))
+
+
+if __name__ == "__main__":
+    main()
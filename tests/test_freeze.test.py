@@ -0,0 +1,123 @@
+import asyncio
+import json
+from unittest import TestCase, main
+
+from slash_slack import Flag, SlashSlack
+from slash_slack.exceptions import AppFrozenException, InvalidCommandException
+
+
+def _make_hello_app(**kwargs) -> SlashSlack:
+    slash = SlashSlack(dev=True, **kwargs)
+
+    @slash.command("hello", summary="Says hello", acknowledge_response="On it.")
+    def hello(name: str):
+        return f"Hello {name}"
+
+    @slash.command("quiet")
+    def quiet():
+        return "..."
+
+    return slash
+
+
+class TestFreeze(TestCase):
+    def test_freeze(self):
+        slash = _make_hello_app(slash_commands=["/command"])
+        slash.freeze()
+        self.assertTrue(slash.frozen)
+        self.assertEqual(
+            {("/command", False), ("/command", True)},
+            set(slash._global_help_cache),
+        )
+        self.assertEqual(2, len(slash.commands["hello"]._help_cache))
+        self.assertIn(
+            "`hello` `name:text`", slash.commands["hello"]._static_help_parts[0]
+        )
+        self.assertEqual(
+            "On it.",
+            json.loads(slash.make_success_acknowledge_response("hello").body)["blocks"][
+                0
+            ]["text"]["text"],
+        )
+        self.assertEqual(
+            201, slash.make_success_acknowledge_response("quiet").status_code
+        )
+        with self.assertRaises(TypeError):
+            slash.commands["other"] = slash.commands["hello"]
+        with self.assertRaises(AppFrozenException):
+
+            @slash.command("other")
+            def other():
+                pass
+
+        with self.assertRaises(AppFrozenException):
+
+            @slash.middleware()
+            async def middleware(context, call_next):
+                return await call_next(context)
+
+        self.assertRaises(AppFrozenException, slash.add_before_request_function, print)
+        commands = slash.commands
+        slash.freeze()
+        self.assertIs(commands, slash.commands)
+
+    def test_invalid_command(self):
+        slash = SlashSlack(dev=True)
+
+        @slash.command("list items")
+        def list_items():
+            pass
+
+        self.assertRaises(InvalidCommandException, slash.freeze)
+        self.assertFalse(slash.frozen)
+
+    def test_global_flag_shadowed(self):
+        slash = SlashSlack(dev=True)
+
+        @slash.command("echo")
+        def echo(text: str, visible: bool = Flag()):
+            pass
+
+        self.assertRaises(InvalidCommandException, slash.freeze)
+
+    def test_warmup_on_startup(self):
+        slash = SlashSlack(dev=True)
+        events = []
+
+        def load():
+            events.append("load")
+
+        async def connect():
+            events.append("connect")
+
+        def broken():
+            raise ValueError("missing model")
+
+        @slash.command("a", warmup=load)
+        def a():
+            pass
+
+        @slash.command("b", warmup=broken)
+        def b():
+            pass
+
+        @slash.command("c", warmup=connect)
+        async def c():
+            pass
+
+        async def run():
+            async with slash._lifespan(slash.app):
+                events.append("started")
+
+        with self.assertLogs("slash_slack", level="ERROR") as logs:
+            asyncio.run(run())
+        self.assertEqual(["load", "connect", "started"], events)
+        self.assertTrue(slash.frozen)
+        self.assertIn(
+            "The warmup of the command b failed: ValueError('missing model')",
+            "\n".join(logs.output),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import asyncio
+import json
+import time
+from unittest import TestCase, main
+
+from slash_slack import SlashSlack
+from slash_slack.drain import _Execution
+from slash_slack.health import HealthCheck
+
+
+async def _get(app, path: str):
+    """
+    Calls the ASGI app with a GET request and returns the response status and JSON body.
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("127.0.0.1", 1),
+        "server": ("127.0.0.1", 80),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    status = next(m["status"] for m in messages if m["type"] == "http.response.start")
+    body = b"".join(
+        m.get("body", b"") for m in messages if m["type"] == "http.response.body"
+    )
+    return status, json.loads(body)
+
+
+class TestHealth(TestCase):
+    def test_ready(self):
+        slash = SlashSlack(dev=True, health_check=HealthCheck())
+
+        async def run():
+            async with slash._lifespan(slash.app):
+                return (
+                    await _get(slash.app, "/slash_slack/health/live"),
+                    await _get(slash.app, "/slash_slack/health/ready"),
+                )
+
+        live, ready = asyncio.run(run())
+        self.assertEqual((200, {"live": True}), live)
+        status, report = ready
+        self.assertEqual(200, status)
+        self.assertTrue(report["ready"])
+        self.assertEqual([], report["reasons"])
+        self.assertEqual(0, report["executing"])
+
+    def test_not_ready_with_loop_lag(self):
+        slash = SlashSlack(
+            dev=True, health_check=HealthCheck(max_loop_lag=0.05, interval=0.01)
+        )
+
+        async def run():
+            async with slash._lifespan(slash.app):
+                await asyncio.sleep(0.02)
+                # Blocks the event loop.
+                time.sleep(0.1)
+                await asyncio.sleep(0.02)
+                return await _get(slash.app, "/slash_slack/health/ready")
+
+        status, report = asyncio.run(run())
+        self.assertEqual(503, status)
+        self.assertFalse(report["ready"])
+        self.assertGreaterEqual(report["loop_lag"], 0.05)
+        self.assertIn("event loop lag", report["reasons"][0])
+
+    def test_not_ready_when_saturated_or_shutting_down(self):
+        health_check = HealthCheck(max_in_flight=1, max_delivery_backlog=0)
+        slash = SlashSlack(dev=True, health_check=health_check)
+
+        async def run():
+            tracker = slash._executions
+            tasks = [
+                asyncio.ensure_future(
+                    tracker.run(_Execution(str(i), "U1"), asyncio.sleep, 10)
+                )
+                for i in range(2)
+            ]
+            await asyncio.sleep(0)
+            saturated = health_check.check(tracker)
+            await tracker.drain(0)
+            await asyncio.gather(*tasks, return_exceptions=True)
+            return saturated, health_check.check(tracker)
+
+        (ready, report), (ready_after, report_after) = asyncio.run(run())
+        self.assertFalse(ready)
+        self.assertEqual(["2 commands executing > 1"], report["reasons"])
+        self.assertFalse(ready_after)
+        self.assertEqual(["shutting down"], report_after["reasons"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import asyncio
+import threading
+from time import perf_counter, sleep
+from unittest import TestCase, main
+
+from fastapi import BackgroundTasks
+
+from slash_slack import SlashSlack, SlashSlackRequest
+from slash_slack.exceptions import InvalidBeforeRequestFunctionPhaseException
+from slash_slack.hooks import BeforeRequestFunction, _run_before_request_functions
+
+from helpers import REQUEST_PARAMS, _capture_deliveries, _make_request
+
+SLASH_SLACK_REQUEST = SlashSlackRequest(**REQUEST_PARAMS, text="")
+
+
+class TestBeforeRequestFunction(TestCase):
+    def test_classification(self):
+        async def a(r):
+            pass
+
+        def b(r):
+            pass
+
+        self.assertTrue(BeforeRequestFunction(a, "after_ack").is_async)
+        self.assertFalse(BeforeRequestFunction(b, "after_ack").is_async)
+
+    def test_async_concurrent(self):
+        async def slow(r):
+            await asyncio.sleep(0.2)
+
+        functions = [BeforeRequestFunction(slow, "after_ack") for _ in range(5)]
+        start = perf_counter()
+        asyncio.run(_run_before_request_functions(functions, SLASH_SLACK_REQUEST))
+        self.assertTrue(perf_counter() - start < 0.5)
+        for func in functions:
+            self.assertEqual(1, func.calls)
+            self.assertTrue(func.max_duration >= 0.2)
+
+    def test_sync_in_thread(self):
+        threads = []
+
+        def hook(r):
+            threads.append(threading.get_ident())
+
+        asyncio.run(
+            _run_before_request_functions(
+                [BeforeRequestFunction(hook, "after_ack")], SLASH_SLACK_REQUEST
+            )
+        )
+        self.assertNotEqual(threading.get_ident(), threads[0])
+
+    def test_error(self):
+        def hook(r):
+            raise ValueError()
+
+        func = BeforeRequestFunction(hook, "after_ack")
+        asyncio.run(_run_before_request_functions([func], SLASH_SLACK_REQUEST))
+        self.assertEqual(1, func.errors)
+        self.assertEqual(1, func.stats()["calls"])
+
+    def test_timeout(self):
+        async def slow(r):
+            await asyncio.sleep(1)
+
+        def slow_sync(r):
+            sleep(0.3)
+
+        functions = [
+            BeforeRequestFunction(slow, "after_ack", timeout=0.05),
+            BeforeRequestFunction(slow_sync, "after_ack", timeout=0.05),
+        ]
+        start = perf_counter()
+        asyncio.run(_run_before_request_functions(functions, SLASH_SLACK_REQUEST))
+        self.assertTrue(perf_counter() - start < 0.9)
+        for func in functions:
+            self.assertEqual(1, func.timeouts)
+
+
+class TestBeforeRequestFunctionPhases(TestCase):
+    def test_invalid_phase(self):
+        slash = SlashSlack(dev=True)
+        self.assertRaises(
+            InvalidBeforeRequestFunctionPhaseException,
+            slash.add_before_request_function,
+            lambda r: None,
+            "invalid",
+        )
+
+    def test_phases(self):
+        slash = SlashSlack(dev=True)
+        calls = []
+        slash.add_before_request_function(
+            lambda r: calls.append("before_ack"), phase="before_ack"
+        )
+        slash.add_before_request_function(lambda r: calls.append("after_ack"))
+        slash.add_before_request_function(
+            lambda r: calls.append("before_execute"), phase="before_execute"
+        )
+
+        @slash.command("echo")
+        def echo(s: str):
+            calls.append("echo")
+
+        _capture_deliveries(slash)
+
+        async def run(text):
+            background_tasks = BackgroundTasks()
+            await slash._acknowledge(_make_request(text), background_tasks, None)
+            calls.append("ack")
+            await background_tasks()
+
+        asyncio.run(run("echo hi"))
+        self.assertEqual(
+            ["before_ack", "ack", "after_ack", "before_execute", "echo"], calls
+        )
+        calls.clear()
+        asyncio.run(run("help"))
+        self.assertEqual(["before_ack", "ack", "after_ack"], calls)
+        self.assertEqual(
+            [2, 2, 1],
+            [stats["calls"] for stats in slash.before_request_function_stats()],
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import asyncio
+import json
+from time import time
+from unittest import TestCase, main
+from urllib.parse import urlencode
+
+from slash_slack import Depends, SlashSlack
+from slash_slack.exceptions import DuplicateUrlPathException
+from slash_slack.host import SlashSlackHost
+from slash_slack.signature_verifier import SignatureVerifier
+
+from helpers import REQUEST_PARAMS, _capture_deliveries
+
+
+async def _call(app, path: str, body: bytes = b"", secret: str = "", method="POST"):
+    """
+    Calls the ASGI app and returns the response status and body.
+    """
+    headers = [(b"content-type", b"application/x-www-form-urlencoded")]
+    if secret:
+        timestamp = str(int(time()))
+        signature = SignatureVerifier(secret).generate_signature(
+            timestamp=timestamp, body=body
+        )
+        headers += [
+            (b"x-slack-request-timestamp", timestamp.encode()),
+            (b"x-slack-signature", signature.encode()),
+        ]
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": headers,
+        "client": ("127.0.0.1", 1),
+        "server": ("127.0.0.1", 80),
+    }
+    received = False
+    messages = []
+
+    async def receive():
+        nonlocal received
+        if received:
+            return {"type": "http.disconnect"}
+        received = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    status = next(m["status"] for m in messages if m["type"] == "http.response.start")
+    response_body = b"".join(
+        m.get("body", b"") for m in messages if m["type"] == "http.response.body"
+    )
+    return status, response_body
+
+
+def _make_host_app(name: str, url_path: str, secret: str, events: list, get_pool):
+    slash = SlashSlack(signing_secret=secret, url_path=url_path, description=name)
+
+    @slash.command("whoami")
+    def whoami(pool=Depends(get_pool, scope="app")):
+        events.append((name, pool))
+        return name
+
+    return slash
+
+
+class TestHost(TestCase):
+    def test_routes_by_path_with_shared_resources(self):
+        events = []
+        pools = []
+
+        async def get_pool():
+            pool = object()
+            pools.append(pool)
+            yield pool
+            events.append("pool closed")
+
+        a = _make_host_app("a", "/a", "secret-a", events, get_pool)
+        b = _make_host_app("b", "/b", "secret-b", events, get_pool)
+        host = SlashSlackHost([a, b])
+        self.assertIs(a.http_client, b.http_client)
+        self.assertIs(a.page_cache, b.page_cache)
+        self.assertIs(a.commands["whoami"].http_client, host.http_client)
+        self.assertIs(b.commands["whoami"].dependency_container, a._dependencies)
+
+        _capture_deliveries(a)
+        _capture_deliveries(b)
+
+        async def run():
+            app = host.get_fast_api()
+            results = {}
+            async with host._lifespan(app):
+                self.assertIsNotNone(host.http_client._session)
+                body = urlencode({**REQUEST_PARAMS, "text": "help"}).encode()
+                results["a help"] = await _call(app, "/a", body, "secret-a")
+                results["b help"] = await _call(app, "/b", body, "secret-b")
+                results["a wrong secret"] = await _call(app, "/a", body, "secret-b")
+                results["unknown"] = await _call(app, "/c", body, "secret-a")
+                body = urlencode({**REQUEST_PARAMS, "text": "whoami"}).encode()
+                results["a whoami"] = await _call(app, "/a", body, "secret-a")
+                results["b whoami"] = await _call(app, "/b", body, "secret-b")
+                results["b interactivity"] = await _call(
+                    app, "/b/interactivity", b"payload=%7B%7D", "secret-b"
+                )
+            self.assertIsNone(host.http_client._session)
+            return results
+
+        results = asyncio.run(run())
+        self.assertEqual(200, results["a help"][0])
+        self.assertIn("whoami", json.dumps(json.loads(results["a help"][1])))
+        self.assertEqual(200, results["b help"][0])
+        self.assertEqual(403, results["a wrong secret"][0])
+        self.assertEqual(404, results["unknown"][0])
+        self.assertEqual(201, results["a whoami"][0])
+        self.assertEqual(200, results["b interactivity"][0])
+        self.assertEqual(1, len(pools))
+        self.assertEqual(
+            [("a", pools[0]), ("b", pools[0]), "pool closed"],
+            events,
+        )
+
+    def test_duplicate_path(self):
+        host = SlashSlackHost([SlashSlack(dev=True, url_path="/a")])
+        self.assertRaises(
+            DuplicateUrlPathException,
+            host.add,
+            SlashSlack(dev=True, url_path="/a"),
+        )
+        host.add(SlashSlack(dev=True, url_path="/b"))
+        self.assertEqual(2, len(host.apps))
+
+
+if __name__ == "__main__":
+    main()
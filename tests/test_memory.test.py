@@ -0,0 +1,118 @@
+import asyncio
+import tracemalloc
+from unittest import TestCase, main
+
+from fastapi import Request
+
+from slash_slack import SlashSlack
+from slash_slack.arg_types import IntType
+from slash_slack.memory import MemoryTracker
+from slash_slack.slash_slack_command import SlashSlackCommand
+
+LEAK = []
+
+
+def leak(n: int):
+    LEAK.append(bytearray(n))
+
+
+def _make_admin_request(authorization: str = "") -> Request:
+    headers = []
+    if authorization:
+        headers.append((b"authorization", authorization.encode()))
+    return Request({"type": "http", "method": "GET", "headers": headers})
+
+
+class TestMemoryTracker(TestCase):
+    def tearDown(self):
+        LEAK.clear()
+
+    def test_not_tracing(self):
+        tracker = MemoryTracker()
+        self.assertIsNone(tracker.before_execution())
+        tracker.after_execution("test", None)
+        self.assertEqual({}, tracker.commands)
+
+    def test_execute(self):
+        tracker = MemoryTracker(top_n=1, snapshots=True)
+        tracker.start()
+        try:
+            command = SlashSlackCommand(
+                command="leak",
+                func=leak,
+                flags=[],
+                args_type=[("n", IntType(), 0)],
+                request_arg=None,
+                memory_tracker=tracker,
+            )
+
+            async def deliver(*args, **kwargs):
+                pass
+
+            command._deliver = deliver
+            asyncio.run(command.execute([1_000_000], set(), set(), None))
+            stats = tracker.commands["leak"]
+            self.assertEqual(1, stats.invocations)
+            self.assertTrue(stats.retained[0] >= 1_000_000)
+            self.assertTrue(stats.peaks[0] >= stats.retained[0])
+            self.assertEqual(1, len(stats.top_allocation_sites))
+            self.assertTrue(stats.top_allocation_sites[0]["size_diff"] >= 1_000_000)
+
+            report = tracker.report()
+            self.assertTrue(report["tracing"])
+            self.assertEqual(1, report["commands"]["leak"]["invocations"])
+            self.assertEqual(1, len(report["top_allocation_sites"]))
+
+            report = asyncio.run(tracker.report_async())
+            self.assertEqual(1, report["commands"]["leak"]["invocations"])
+            self.assertEqual(1, len(report["top_allocation_sites"]))
+        finally:
+            tracker.stop()
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_one_measurement_at_a_time(self):
+        tracker = MemoryTracker()
+        self.assertFalse(tracker.snapshots)
+        tracker.start()
+        try:
+            first = tracker.before_execution()
+            self.assertIsNone(first[1])
+            self.assertIsNone(tracker.before_execution())
+            tracker.after_execution("b", None)
+            tracker.after_execution("a", first)
+            self.assertIsNotNone(tracker.before_execution())
+        finally:
+            tracker.stop()
+        self.assertEqual(1, tracker.skipped)
+        self.assertEqual(["a"], list(tracker.commands))
+        self.assertEqual(1, tracker.report()["skipped"])
+
+    def test_window(self):
+        tracker = MemoryTracker(window=2)
+        tracker.start()
+        try:
+            for _ in range(3):
+                tracker.after_execution("test", tracker.before_execution())
+        finally:
+            tracker.stop()
+        self.assertEqual(3, tracker.commands["test"].invocations)
+        self.assertEqual(2, len(tracker.commands["test"].peaks))
+
+    def test_admin_authorization(self):
+        slash = SlashSlack(
+            signing_secret="secret", memory_tracker=MemoryTracker(admin_token="token")
+        )
+        self.assertTrue(
+            slash._is_admin_request(_make_admin_request("Bearer token"), "token")
+        )
+        self.assertFalse(
+            slash._is_admin_request(_make_admin_request("Bearer x"), "token")
+        )
+        self.assertFalse(slash._is_admin_request(_make_admin_request(), "token"))
+        self.assertFalse(slash._is_admin_request(_make_admin_request("Bearer "), None))
+        dev_slash = SlashSlack(dev=True)
+        self.assertTrue(dev_slash._is_admin_request(_make_admin_request(), None))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import asyncio
+import json
+from unittest import TestCase, main
+
+from slash_slack import SlashSlack
+from slash_slack.exceptions import InvalidMiddlewareException
+from slash_slack.middleware import _compile_middleware
+
+from helpers import _capture_deliveries, _send
+
+
+def _make_echo_app():
+    slash = SlashSlack(dev=True)
+
+    @slash.command("echo")
+    def echo(s: str):
+        return s
+
+    return slash, _capture_deliveries(slash)
+
+
+class TestCompileMiddleware(TestCase):
+    def test_empty(self):
+        async def handler(context):
+            return context
+
+        self.assertIsNone(_compile_middleware([], handler))
+
+    def test_order(self):
+        calls = []
+
+        def make(name):
+            async def middleware(context, call_next):
+                calls.append(name)
+                return await call_next(context + [name])
+
+            return middleware
+
+        async def handler(context):
+            return context
+
+        chain = _compile_middleware([make("a"), make("b")], handler)
+        self.assertEqual(["a", "b"], asyncio.run(chain([])))
+        self.assertEqual(["a", "b"], calls)
+
+
+class TestMiddleware(TestCase):
+    def test_not_async(self):
+        slash = SlashSlack(dev=True)
+        self.assertRaises(
+            InvalidMiddlewareException,
+            slash.add_middleware,
+            lambda context, call_next: None,
+        )
+
+    def test_invalid_phase(self):
+        slash = SlashSlack(dev=True)
+
+        async def middleware(context, call_next):
+            pass
+
+        self.assertRaises(
+            InvalidMiddlewareException, slash.add_middleware, middleware, "invalid"
+        )
+
+    def test_ack_short_circuit(self):
+        slash, delivered = _make_echo_app()
+
+        @slash.middleware()
+        async def allowlist(context, call_next):
+            if context.slash_slack_request.user_id != "U1":
+                return "You are not allowed to use this command."
+            return await call_next(context)
+
+        _send(slash, "echo hello", user_id="U1")
+        self.assertEqual(["hello"], delivered)
+
+        response = _send(slash, "echo hello", user_id="U2")
+        self.assertEqual(["hello"], delivered)
+        self.assertEqual(
+            "You are not allowed to use this command.",
+            json.loads(response.body)["blocks"][0]["text"]["text"],
+        )
+
+    def test_execute_middleware(self):
+        slash, delivered = _make_echo_app()
+        cache = {}
+
+        @slash.middleware(phase="execute")
+        async def caching(context, call_next):
+            key = (context.command.command, tuple(context.args))
+            if key not in cache:
+                cache[key] = await call_next(context)
+            return cache[key]
+
+        @slash.middleware(phase="execute")
+        async def upper(context, call_next):
+            return (await call_next(context)).upper()
+
+        _send(slash, "echo hello")
+        cache[("echo", ("hello",))] = "cached"
+        _send(slash, "echo hello")
+        self.assertEqual(["HELLO", "cached"], delivered)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+import asyncio
+import io
+import json
+import os
+import random
+import tempfile
+from argparse import ArgumentTypeError, Namespace
+from time import perf_counter
+from unittest import TestCase, main
+from urllib.parse import parse_qs
+
+import aiohttp
+from aiohttp import web
+
+from slash_slack.mock_slack import (
+    _bench,
+    _CallbackServer,
+    _headless,
+    _parse_args,
+    _parse_fault,
+    _parse_latency,
+    _percentile,
+    _replay,
+)
+from slash_slack.signature_verifier import SignatureVerifier
+
+SECRET = "sekret"
+
+
+class FakeSlashSlack:
+    """
+        Acknowledges every correctly signed request and posts the response to its response_url.
+    Requests for `help` are answered immediately.
+    """
+
+    def __init__(self):
+        self.verifier = SignatureVerifier(SECRET)
+        self.texts = []
+        self.tasks = set()
+
+    async def handle(self, request: web.Request) -> web.Response:
+        body = await request.text()
+        if not self.verifier.is_valid_request(body, request.headers):
+            return web.Response(status=403)
+        params = parse_qs(body, keep_blank_values=True)
+        self.texts.append(params["text"][0])
+        if params["text"][0] == "help":
+            return web.json_response({"text": "help"})
+        task = asyncio.create_task(self.deliver(params["response_url"][0]))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return web.Response(status=200)
+
+    async def deliver(self, response_url: str):
+        async with aiohttp.ClientSession() as session:
+            async with session.post(response_url, json={"text": "done"}) as resp:
+                await resp.read()
+
+
+async def _run_load(run, secret: str, **kwargs) -> tuple:
+    fake = FakeSlashSlack()
+    app = web.Application()
+    app.router.add_post("/slash_slack", fake.handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "localhost", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    args = Namespace(
+        **{
+            "host": "localhost",
+            "port": port,
+            "path": "/slash_slack",
+            "corpus": None,
+            "text": ["echo a", "echo b"],
+            "requests": 20,
+            "concurrency": 5,
+            "rate": 0,
+            "secret": secret,
+            "callback_host": "localhost",
+            "callback_port": 0,
+            "callback_timeout": 5,
+            "callback_idle_timeout": 1,
+            "callback_latency": [],
+            "callback_fault": [],
+            "callback_retry_after": 1,
+            "callback_hang": 60,
+            "callback_seed": None,
+            "json": True,
+            **kwargs,
+        }
+    )
+    try:
+        report = await run(args)
+    finally:
+        await runner.cleanup()
+    return report, fake
+
+
+class TestMockSlack(TestCase):
+    def test_percentile(self):
+        values = [float(i) for i in range(1, 101)]
+        self.assertEqual(_percentile(values, 50), 50.0)
+        self.assertEqual(_percentile(values, 95), 95.0)
+        self.assertEqual(_percentile(values, 99), 99.0)
+        self.assertEqual(_percentile(values, 100), 100.0)
+        self.assertEqual(_percentile([3.0], 50), 3.0)
+        self.assertIsNone(_percentile([], 50))
+
+    def test_parse_args(self):
+        args = _parse_args(["--port", "1"])
+        self.assertIsNone(args.mode)
+        self.assertEqual(args.port, 1)
+
+        args = _parse_args(
+            ["bench", "--text", "a", "--text", "b", "-n", "5", "--port", "2"]
+        )
+        self.assertEqual(args.mode, "bench")
+        self.assertEqual(args.text, ["a", "b"])
+        self.assertEqual(args.requests, 5)
+        self.assertEqual(args.port, 2)
+        self.assertEqual(args.path, "/slash_slack")
+
+    def test_bench(self):
+        report, fake = asyncio.run(_run_load(_bench, SECRET))
+        self.assertEqual(report["requests"], 20)
+        self.assertEqual(report["errors"], 0)
+        self.assertEqual(report["statuses"], {200: 20})
+        self.assertEqual(report["ack_latency"]["count"], 20)
+        self.assertEqual(report["callbacks_received"], 20)
+        self.assertEqual(report["end_to_end_latency"]["count"], 20)
+        self.assertEqual(sorted(set(fake.texts)), ["echo a", "echo b"])
+        self.assertEqual(fake.texts.count("echo a"), 10)
+
+    def test_bench_rejected_signature(self):
+        report, fake = asyncio.run(_run_load(_bench, "wrong", requests=5))
+        self.assertEqual(report["statuses"], {403: 5})
+        self.assertEqual(report["callbacks_received"], 0)
+        self.assertEqual(report["end_to_end_latency"]["p50_ms"], None)
+        self.assertEqual(fake.texts, [])
+
+    def test_replay(self):
+        fd, path = tempfile.mkstemp(suffix=".jsonl")
+        with os.fdopen(fd, "w") as f:
+            for timestamp, text in [(100.4, "echo b"), (100.0, "echo a"), (100.2, "")]:
+                body = f"token=REDACTED&text={text}&response_url=REDACTED"
+                f.write(json.dumps({"ts": timestamp, "headers": {}, "body": body}))
+                f.write("\n")
+        try:
+            report, fake = asyncio.run(
+                _run_load(_replay, SECRET, capture=path, speed=2.0)
+            )
+            self.assertEqual(["echo a", "", "echo b"], fake.texts)
+            self.assertEqual(report["statuses"], {200: 3})
+            self.assertEqual(report["callbacks_received"], 3)
+            self.assertEqual(report["send_lag"]["count"], 3)
+            self.assertGreaterEqual(report["duration_s"], 0.2)
+
+            report, fake = asyncio.run(
+                _run_load(_replay, SECRET, capture=path, speed=0)
+            )
+            self.assertEqual(report["send_lag"]["count"], 0)
+            self.assertEqual(report["callbacks_received"], 3)
+        finally:
+            os.remove(path)
+
+    def test_headless(self):
+        stdout = io.StringIO()
+        stdin = io.StringIO("echo a\n\nhelp\necho b\n")
+        start = perf_counter()
+        deliveries, fake = asyncio.run(
+            _run_load(lambda args: _headless(args, stdin=stdin, stdout=stdout), SECRET)
+        )
+        self.assertLess(perf_counter() - start, 4)
+        self.assertEqual(["echo a", "echo b", "help"], sorted(fake.texts))
+        self.assertEqual(["0", "2"], sorted(deliveries))
+        records = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        acks = {r["request_id"]: r for r in records if r["type"] == "ack"}
+        self.assertEqual(["0", "1", "2"], sorted(acks))
+        self.assertEqual("help", acks["1"]["text"])
+        self.assertEqual({"text": "help"}, acks["1"]["payload"])
+        self.assertIsNone(acks["0"]["payload"])
+        delivered = [r for r in records if r["type"] == "delivery"]
+        self.assertEqual(["0", "2"], sorted(r["request_id"] for r in delivered))
+        self.assertEqual({"text": "done"}, delivered[0]["payload"])
+
+    def test_parse_latency(self):
+        latency = _parse_latency("fixed:50")
+        self.assertIsNone(latency.path)
+        self.assertEqual(0.05, latency.sample(None))
+        latency = _parse_latency("uniform:10:20@/callback/1*")
+        self.assertEqual("/callback/1*", latency.path)
+        r = random.Random(0)
+        for _ in range(100):
+            self.assertTrue(0.01 <= latency.sample(r) <= 0.02)
+        self.assertGreaterEqual(_parse_latency("normal:0:100").sample(r), 0)
+        self.assertGreaterEqual(_parse_latency("exp:10").sample(r), 0)
+        for spec in ["fixed", "uniform:10", "gamma:1", "fixed:a"]:
+            with self.assertRaises(ArgumentTypeError):
+                _parse_latency(spec)
+
+    def test_parse_fault(self):
+        fault = _parse_fault("429:10")
+        self.assertEqual(
+            ("429", 0.1, None), (fault.kind, fault.probability, fault.path)
+        )
+        fault = _parse_fault("reset:100@/callback/2")
+        self.assertEqual(
+            ("reset", 1.0, "/callback/2"), (fault.kind, fault.probability, fault.path)
+        )
+        for spec in ["boom:10", "42:10", "500", "500:x"]:
+            with self.assertRaises(ArgumentTypeError):
+                _parse_fault(spec)
+
+        args = _parse_args(
+            ["bench", "--callback-fault", "500:5", "--callback-fault", "reset:1"]
+        )
+        self.assertEqual(["500", "reset"], [f.kind for f in args.callback_fault])
+
+    def test_callback_faults(self):
+        async def run():
+            stream = io.StringIO()
+            server = _CallbackServer(
+                stream=stream,
+                latencies=[_parse_latency("fixed:100@/callback/slow")],
+                faults=[
+                    _parse_fault("429:100@/callback/limited"),
+                    _parse_fault("503:100@/callback/unavailable"),
+                    _parse_fault("reset:100@/callback/reset"),
+                    _parse_fault("timeout:100@/callback/timeout"),
+                ],
+                retry_after=7,
+                hang=0.1,
+            )
+            await server.start()
+            results = {}
+            try:
+                async with aiohttp.ClientSession() as session:
+                    for request_id in ["ok", "slow", "limited", "unavailable"]:
+                        start = perf_counter()
+                        async with session.post(
+                            server.response_url(request_id), json={}
+                        ) as resp:
+                            results[request_id] = (
+                                resp.status,
+                                resp.headers.get("Retry-After"),
+                                perf_counter() - start,
+                            )
+                    for request_id in ["reset", "timeout"]:
+                        with self.assertRaises(aiohttp.ClientError):
+                            async with session.post(
+                                server.response_url(request_id), json={}
+                            ) as resp:
+                                await resp.read()
+            finally:
+                await server.stop()
+            return server, results, stream
+
+        server, results, stream = asyncio.run(run())
+        self.assertEqual(200, results["ok"][0])
+        self.assertLess(results["ok"][2], 0.1)
+        self.assertEqual(200, results["slow"][0])
+        self.assertGreaterEqual(results["slow"][2], 0.1)
+        self.assertEqual((429, "7"), results["limited"][:2])
+        self.assertEqual((503, None), results["unavailable"][:2])
+        self.assertEqual(["ok", "slow"], sorted(server.deliveries))
+        self.assertEqual(
+            {"429": 1, "503": 1, "reset": 1, "timeout": 1}, server.faults_injected
+        )
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(
+            ["429", "503", "reset", "timeout"],
+            [r["fault"] for r in records if r["type"] == "fault"],
+        )
+
+    def test_bench_with_faults(self):
+        report, _ = asyncio.run(
+            _run_load(
+                _bench,
+                SECRET,
+                callback_fault=[_parse_fault("500:50")],
+                callback_seed=1,
+            )
+        )
+        self.assertEqual(
+            20, report["callbacks_received"] + report["callback_faults"]["500"]
+        )
+        self.assertGreater(report["callback_faults"]["500"], 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+import asyncio
+import json
+from time import time
+from unittest import TestCase, main
+from urllib.parse import urlencode
+
+from fastapi import BackgroundTasks, HTTPException, Request
+
+from slash_slack import SlashSlack
+from slash_slack.exceptions import InvalidPageSizeException
+from slash_slack.pagination import (
+    NEXT_PAGE_ACTION_ID,
+    PREVIOUS_PAGE_ACTION_ID,
+    PageCache,
+    Paginated,
+    _make_page_message,
+    _parse_page_action,
+)
+from slash_slack.signature_verifier import SignatureVerifier
+
+from helpers import REQUEST_PARAMS
+
+
+def _make_raw_request(path: str, body: bytes, headers=None) -> Request:
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return Request(
+        {
+            "type": "http",
+            "method": "POST",
+            "headers": [(k.encode(), v.encode()) for k, v in (headers or {}).items()],
+            "path": path,
+        },
+        receive,
+    )
+
+
+def _interactivity_body(value: str, action_id: str = NEXT_PAGE_ACTION_ID) -> bytes:
+    payload = {
+        "type": "block_actions",
+        "user": {"id": "U1"},
+        "response_url": "https://hooks.slack.com/actions/1",
+        "actions": [{"action_id": action_id, "value": value}],
+    }
+    return urlencode({"payload": json.dumps(payload)}).encode()
+
+
+def _button_values(message: dict) -> dict:
+    (actions,) = [b for b in message["blocks"] if b["type"] == "actions"]
+    return {e["action_id"]: e["value"] for e in actions["elements"]}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestPagination(TestCase):
+    def test_paginated(self):
+        paginated = Paginated((f"item {i}" for i in range(25)), page_size=10)
+        self.assertEqual(3, paginated.page_count)
+        self.assertEqual(
+            ["item 20", "item 21", "item 22", "item 23", "item 24"], paginated.page(3)
+        )
+        self.assertEqual(1, Paginated([]).page_count)
+        self.assertRaises(InvalidPageSizeException, Paginated, [], page_size=0)
+        self.assertRaises(InvalidPageSizeException, Paginated, [], page_size=48)
+
+    def test_page_cache(self):
+        clock = FakeClock()
+        cache = PageCache(max_size=2, ttl=10, clock=clock)
+        a = cache.put("a")
+        clock.now = 5
+        b = cache.put("b")
+        self.assertEqual("a", cache.get(a))
+        clock.now = 8
+        c = cache.put("c")
+        self.assertEqual(2, len(cache))
+        self.assertIsNone(cache.get(a))
+        self.assertEqual("b", cache.get(b))
+        clock.now = 15
+        self.assertIsNone(cache.get(b))
+        self.assertEqual("c", cache.get(c))
+        clock.now = 20
+        cache.put("d")
+        self.assertEqual(1, len(cache))
+        self.assertIsNone(cache.get("unknown"))
+
+    def test_page_message(self):
+        paginated = Paginated(
+            [f"item {i}" for i in range(25)], page_size=10, header="Items"
+        )
+        message = _make_page_message(paginated, 1, "abc", visible_in_channel=False)
+        self.assertEqual("ephemeral", message["response_type"])
+        self.assertEqual("header", message["blocks"][0]["type"])
+        self.assertEqual(
+            10, len([b for b in message["blocks"] if b["type"] == "section"])
+        )
+        self.assertEqual({NEXT_PAGE_ACTION_ID: "abc:2"}, _button_values(message))
+
+        message = _make_page_message(paginated, 2, "abc", visible_in_channel=True)
+        self.assertEqual(
+            {PREVIOUS_PAGE_ACTION_ID: "abc:1", NEXT_PAGE_ACTION_ID: "abc:3"},
+            _button_values(message),
+        )
+        message = _make_page_message(paginated, 9, "abc", visible_in_channel=True)
+        self.assertEqual({PREVIOUS_PAGE_ACTION_ID: "abc:2"}, _button_values(message))
+
+        message = _make_page_message(Paginated(["a"]), 1, None, visible_in_channel=True)
+        self.assertEqual(["section"], [b["type"] for b in message["blocks"]])
+
+        long_items = ["a" * 6000] * 10
+        message = _make_page_message(Paginated(long_items), 1, "abc", False)
+        self.assertLessEqual(len(message["blocks"]), 50)
+
+    def test_parse_page_action(self):
+        self.assertIsNone(_parse_page_action({}))
+        self.assertIsNone(_parse_page_action({"type": "view_submission"}))
+        self.assertEqual(
+            ("abc", 2),
+            _parse_page_action(
+                {
+                    "type": "block_actions",
+                    "actions": [{"action_id": NEXT_PAGE_ACTION_ID, "value": "abc:2"}],
+                }
+            ),
+        )
+        self.assertIsNone(
+            _parse_page_action(
+                {
+                    "type": "block_actions",
+                    "actions": [{"action_id": "other", "value": "abc:2"}],
+                }
+            )
+        )
+
+    def test_pages_served_from_cache(self):
+        slash = SlashSlack(dev=True)
+        calls = []
+        delivered = []
+        posted = []
+
+        @slash.command("list")
+        def list_items():
+            calls.append(1)
+            return Paginated([f"item {i}" for i in range(25)], page_size=10)
+
+        command = slash.commands["list"]
+
+        async def deliver(response, slash_slack_request, visible_in_channel, **kwargs):
+            delivered.extend(command._iter_messages(response, visible_in_channel))
+
+        async def post_message(response_url, body, trace_span):
+            posted.append((response_url, json.loads(body)))
+
+        command._deliver = deliver
+        slash._post_message = post_message
+
+        async def send(path: str, body: bytes):
+            background_tasks = BackgroundTasks()
+            if path == slash.url_path:
+                response = await slash._acknowledge(
+                    _make_raw_request(path, body), background_tasks, None
+                )
+            else:
+                response = await slash._interact(
+                    _make_raw_request(path, body), background_tasks, None
+                )
+            await background_tasks()
+            return response
+
+        async def run():
+            await send(
+                slash.url_path,
+                urlencode({**REQUEST_PARAMS, "text": "list"}).encode(),
+            )
+            (message,) = delivered
+            next_value = _button_values(message)[NEXT_PAGE_ACTION_ID]
+            response = await send(
+                f"{slash.url_path}/interactivity", _interactivity_body(next_value)
+            )
+            self.assertEqual(200, response.status_code)
+            response = await send(
+                f"{slash.url_path}/interactivity",
+                _interactivity_body("expired:2"),
+            )
+            self.assertEqual(200, response.status_code)
+            response = await send(
+                f"{slash.url_path}/interactivity",
+                _interactivity_body("abc:2", action_id="other"),
+            )
+            self.assertEqual(200, response.status_code)
+
+        asyncio.run(run())
+        self.assertEqual(1, len(calls))
+        self.assertEqual(1, len(slash.page_cache))
+        self.assertEqual(2, len(posted))
+        url, page = posted[0]
+        self.assertEqual("https://hooks.slack.com/actions/1", url)
+        self.assertTrue(page["replace_original"])
+        self.assertEqual("item 10", page["blocks"][0]["text"]["text"])
+        self.assertFalse(posted[1][1]["replace_original"])
+        self.assertIn("expired", posted[1][1]["blocks"][0]["text"]["text"])
+
+    def test_interactivity_signature(self):
+        slash = SlashSlack(signing_secret="secret")
+        body = _interactivity_body("abc:2")
+        timestamp = str(int(time()))
+
+        async def run(headers):
+            background_tasks = BackgroundTasks()
+            return await slash._interact(
+                _make_raw_request(f"{slash.url_path}/interactivity", body, headers),
+                background_tasks,
+                None,
+            )
+
+        with self.assertRaises(HTTPException) as e:
+            asyncio.run(run({}))
+        self.assertEqual(403, e.exception.status_code)
+
+        signature = SignatureVerifier("secret").generate_signature(
+            timestamp=timestamp, body=body
+        )
+        response = asyncio.run(
+            run(
+                {
+                    "x-slack-request-timestamp": timestamp,
+                    "x-slack-signature": signature,
+                }
+            )
+        )
+        self.assertEqual(200, response.status_code)
+
+
+if __name__ == "__main__":
+    main()
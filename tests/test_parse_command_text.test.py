@@ -1,6 +1,23 @@
 from unittest import TestCase, main
 
-from slash_slack.slash_slack import _parse_command_text
+from slash_slack import Int, Option, SlashSlack
+from slash_slack.slash_slack import _parse_command_text, _split_command
+
+from helpers import _capture_deliveries, _send
+
+
+def _make_quoting_app():
+    slash = SlashSlack(dev=True)
+
+    @slash.command("echo")
+    def echo(a: str, b: str):
+        return f"{a}|{b}"
+
+    @slash.command("lim")
+    def lim(q: str, limit=Option(Int(), default=10)):
+        return f"{q}|{limit}"
+
+    return slash, _capture_deliveries(slash, visibility=True)
 
 
 class TestParseCommandText(TestCase):
@@ -108,6 +125,98 @@ class TestParseCommandText(TestCase):
         self.assertSetEqual({"help", "test"}, flags)
         pass
 
+    def test_quoted(self):
+        command, args, flags = _parse_command_text('command "a  b" c')
+        self.assertEqual("command", command)
+        self.assertEqual('"a  b" c', args)
+        self.assertSetEqual(set(), flags)
+
+        command, args, flags = _parse_command_text(
+            "command \"hi --visible there\" --help '--x'"
+        )
+        self.assertEqual("command", command)
+        self.assertEqual("\"hi --visible there\" '--x'", args)
+        self.assertSetEqual({"help"}, flags)
+
+        command, args, flags = _parse_command_text('--visible "a command" b')
+        self.assertEqual("a command", command)
+        self.assertEqual("b", args)
+        self.assertSetEqual({"visible"}, flags)
+
+
+class TestQuotedCommandText(TestCase):
+    def test_spacing_kept(self):
+        slash, delivered = _make_quoting_app()
+        _send(slash, 'echo "a  b" c')
+        self.assertEqual([("a  b|c", False)], delivered)
+
+    def test_quoted_flags_are_args(self):
+        slash, delivered = _make_quoting_app()
+        _send(slash, 'echo "hi --visible there" c')
+        self.assertEqual([("hi --visible there|c", False)], delivered)
+
+        slash, delivered = _make_quoting_app()
+        _send(slash, 'echo "x --help" y')
+        self.assertEqual([("x --help|y", False)], delivered)
+
+    def test_unquoted_flags(self):
+        slash, delivered = _make_quoting_app()
+        _send(slash, 'echo "a b" --visible c')
+        self.assertEqual([("a b|c", True)], delivered)
+
+
+class TestOptionsBeforeCommand(TestCase):
+    def test_split_command(self):
+        self.assertEqual(
+            ("lim", '--limit 5 "foo bar"'),
+            _split_command('--limit 5 lim "foo bar"', {"limit"}),
+        )
+        self.assertEqual(
+            ("lim", "--visible --limit 5 foo"),
+            _split_command("--visible --limit 5 lim foo", {"limit"}),
+        )
+        # Without the option names the value is the command.
+        self.assertEqual(("5", "--limit lim foo"), _split_command("--limit 5 lim foo"))
+
+    def test_parse(self):
+        command, args, flags = _parse_command_text("--limit 5 lim foo", {"limit"})
+        self.assertEqual("lim", command)
+        self.assertEqual("5 foo", args)
+        self.assertSetEqual({"limit"}, flags)
+
+        command, args, _ = _parse_command_text("lim --limit 5 foo", {"limit"})
+        self.assertEqual("lim", command)
+        self.assertEqual("5 foo", args)
+
+    def test_options_anywhere(self):
+        for text in (
+            "--limit 5 lim foo",
+            "--limit=5 lim foo",
+            "lim --limit 5 foo",
+            'lim foo --limit "5"',
+        ):
+            slash, delivered = _make_quoting_app()
+            _send(slash, text)
+            self.assertEqual([("foo|5", False)], delivered, text)
+
+        slash, delivered = _make_quoting_app()
+        _send(slash, '--limit 5 lim "foo bar"')
+        self.assertEqual([("foo bar|5", False)], delivered)
+
+        slash, delivered = _make_quoting_app()
+        _send(slash, "--visible --limit 5 lim foo")
+        self.assertEqual([("foo|5", True)], delivered)
+
+    def test_lone_string_quoted(self):
+        slash, delivered = _make_quoting_app()
+        _send(slash, 'lim "x y" --limit 5')
+        self.assertEqual([("x y|5", False)], delivered)
+
+    def test_quoted_option(self):
+        slash, delivered = _make_quoting_app()
+        _send(slash, 'lim "--limit 5"')
+        self.assertEqual([("--limit 5|10", False)], delivered)
+
 
 if __name__ == "__main__":
     main()
@@ -1,11 +1,20 @@
 from typing import List
 from unittest import TestCase, main
 
-from slash_slack import Flag, Float, Int, SlashSlackRequest, String, UnknownLengthList
+from slash_slack import (
+    Flag,
+    Float,
+    Int,
+    Option,
+    SlashSlackRequest,
+    String,
+    UnknownLengthList,
+)
 from slash_slack.arg_types import (
     FlagType,
     FloatType,
     IntType,
+    OptionType,
     StringType,
     UnknownLengthListType,
 )
@@ -214,6 +223,20 @@ class TestParseFuncParams(TestCase):
         self.assertTrue(isinstance(flags[0][1], FlagType))
         self.assertIsNone(request_arg)
 
+    def test_option(self):
+        def t(s: str, limit=Option(Int(), default=10), f=Flag()):
+            pass
+
+        params, flags, request_arg = _parse_func_params(t)
+        self.assertEqual(1, len(params))
+        self.assertEqual(2, len(flags))
+        self.assertEqual("limit", flags[0][0])
+        self.assertTrue(isinstance(flags[0][1], OptionType))
+        self.assertTrue(isinstance(flags[0][1].arg_type, IntType))
+        self.assertEqual(10, flags[0][1].default)
+        self.assertEqual(1, flags[0][2])
+        self.assertTrue(isinstance(flags[1][1], FlagType))
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,98 @@
+import asyncio
+import os
+import tempfile
+from unittest import TestCase, main
+
+from slash_slack import SlashSlack
+from slash_slack.pagination import Paginated
+from slash_slack.profiling import Profiler, _ProfiledPaginated
+
+
+def fib(n: int) -> int:
+    if n < 2:
+        return n
+    return fib(n - 1) + fib(n - 2)
+
+
+def sync_fn(n: int):
+    return str(fib(n))
+
+
+async def async_fn(n: int):
+    await asyncio.sleep(0)
+    return str(fib(n))
+
+
+def generator_fn(n: int):
+    for i in range(n):
+        yield str(fib(i))
+
+
+class TestProfiler(TestCase):
+    def test_is_authorized(self):
+        profiler = Profiler(user_ids=["U1"])
+        self.assertTrue(profiler.is_authorized("U1"))
+        self.assertFalse(profiler.is_authorized("U2"))
+
+    def test_sync(self):
+        profiler = Profiler(user_ids=["U1"])
+        response = list(asyncio.run(profiler.run("fib", sync_fn, False, [15], "U1")))
+        self.assertEqual("610", response[0]["text"]["text"])
+        self.assertIn("fib", response[1]["text"]["text"])
+
+    def test_async(self):
+        profiler = Profiler(user_ids=["U1"])
+        response = list(asyncio.run(profiler.run("fib", async_fn, True, [15], "U1")))
+        self.assertEqual("610", response[0]["text"]["text"])
+        self.assertIn("fib", response[1]["text"]["text"])
+
+    def test_generator(self):
+        profiler = Profiler(user_ids=["U1"])
+        response = list(
+            asyncio.run(profiler.run("fib", generator_fn, False, [10], "U1"))
+        )
+        self.assertEqual(11, len(response))
+        self.assertIn("fib", response[-1]["text"]["text"])
+
+    def test_empty_response(self):
+        profiler = Profiler(user_ids=["U1"])
+        response = asyncio.run(profiler.run("e", lambda: None, False, [], "U1"))
+        self.assertEqual(1, len(response))
+
+    def test_directory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            profiler = Profiler(user_ids=["U1"], directory=directory, top_n=0)
+            response = list(asyncio.run(profiler.run("fib", sync_fn, False, [5], "U1")))
+            self.assertEqual(2, len(response))
+            files = os.listdir(directory)
+            self.assertEqual(1, len(files))
+            self.assertTrue(files[0].endswith(".pstats"))
+
+    def test_paginated(self):
+        slash = SlashSlack(dev=True, profiler=Profiler(user_ids=["U1"]))
+        paginated = Paginated([str(fib(i)) for i in range(5)], page_size=2)
+
+        @slash.command("pages")
+        def pages():
+            return paginated
+
+        command = slash.commands["pages"]
+        response = asyncio.run(slash.profiler.run("pages", pages, False, [], "U1"))
+        self.assertIsInstance(response, _ProfiledPaginated)
+        self.assertIs(paginated, response.paginated)
+
+        first_page, summary = list(command._iter_messages(response, False))
+        self.assertEqual(1, len(slash.page_cache))
+        self.assertEqual("0", first_page["blocks"][0]["text"]["text"])
+        self.assertEqual("actions", first_page["blocks"][-1]["type"])
+        self.assertIn("pages", summary["blocks"][0]["text"]["text"])
+
+    def test_global_flag(self):
+        self.assertNotIn("profile", SlashSlack(dev=True).global_flags)
+        slash = SlashSlack(dev=True, profiler=Profiler(user_ids=["U1"]))
+        self.assertIn("profile", slash.global_flags)
+        self.assertNotIn("profile", SlashSlack.global_flags)
+
+
+if __name__ == "__main__":
+    main()
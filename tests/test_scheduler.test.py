@@ -0,0 +1,119 @@
+import asyncio
+from unittest import TestCase, main
+
+from fastapi import BackgroundTasks
+
+from slash_slack import SlashSlack
+from slash_slack.drain import QUEUED, _Execution
+from slash_slack.exceptions import InvalidPriorityException
+from slash_slack.health import HealthCheck
+from slash_slack.scheduler import HIGH, LOW, NORMAL, PriorityScheduler
+
+from helpers import _capture_deliveries, _make_request
+
+
+class TestPriorityScheduler(TestCase):
+    def test_weighted_dequeue(self):
+        async def run():
+            scheduler = PriorityScheduler(concurrency=1)
+            order = []
+            release = asyncio.Event()
+
+            async def record(priority):
+                order.append(priority)
+
+            blocker = asyncio.ensure_future(scheduler.run(NORMAL, release.wait))
+            await asyncio.sleep(0)
+            tasks = [
+                asyncio.ensure_future(scheduler.run(priority, record, priority))
+                for priority in (LOW, NORMAL, HIGH)
+                for _ in range(10)
+            ]
+            await asyncio.sleep(0)
+            queued = scheduler.queued()
+            release.set()
+            await asyncio.gather(blocker, *tasks)
+            return scheduler, queued, order
+
+        scheduler, queued, order = asyncio.run(run())
+        self.assertEqual({HIGH: 10, NORMAL: 10, LOW: 10}, queued)
+        self.assertEqual(HIGH, order[0])
+        first = order[:10]
+        self.assertEqual(
+            (6, 3, 1), (first.count(HIGH), first.count(NORMAL), first.count(LOW))
+        )
+        self.assertEqual(0, scheduler.running)
+
+    def test_cancelled_waiter(self):
+        async def run():
+            scheduler = PriorityScheduler(concurrency=1)
+            release = asyncio.Event()
+            blocker = asyncio.ensure_future(scheduler.run(HIGH, release.wait))
+            await asyncio.sleep(0)
+            waiter = asyncio.ensure_future(scheduler.run(LOW, asyncio.sleep, 0))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+            release.set()
+            await blocker
+            return scheduler
+
+        scheduler = asyncio.run(run())
+        self.assertEqual(0, scheduler.running)
+        self.assertEqual({HIGH: 0, NORMAL: 0, LOW: 0}, scheduler.queued())
+
+    def test_invalid(self):
+        self.assertRaises(
+            InvalidPriorityException, PriorityScheduler, weights={HIGH: 1}
+        )
+        self.assertRaises(
+            InvalidPriorityException,
+            PriorityScheduler,
+            weights={HIGH: 2, NORMAL: 1, LOW: 0},
+        )
+        slash = SlashSlack(dev=True)
+        with self.assertRaises(InvalidPriorityException):
+
+            @slash.command("report", priority="urgent")
+            def report():
+                pass
+
+    def test_high_priority_command_skips_queue(self):
+        slash = SlashSlack(dev=True, scheduler=PriorityScheduler(concurrency=1))
+
+        @slash.command("report", priority=LOW)
+        async def report():
+            await asyncio.sleep(0.05)
+            return "report"
+
+        @slash.command("lookup", priority=HIGH)
+        async def lookup():
+            return "lookup"
+
+        delivered = _capture_deliveries(slash)
+
+        async def run():
+            tasks = []
+            for text in ("report", "report", "lookup"):
+                background_tasks = BackgroundTasks()
+                await slash._acknowledge(_make_request(text), background_tasks, None)
+                tasks.append(asyncio.ensure_future(background_tasks()))
+                await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            stages = sorted(e.stage for e in slash._executions._tasks.values())
+            ready, report = HealthCheck(max_queued=1).check(
+                slash._executions, slash.scheduler
+            )
+            await asyncio.gather(*tasks)
+            return stages, ready, report
+
+        stages, ready, report = asyncio.run(run())
+        self.assertEqual(["report", "lookup", "report"], delivered)
+        self.assertEqual(2, stages.count(QUEUED))
+        self.assertFalse(ready)
+        self.assertEqual({HIGH: 1, NORMAL: 0, LOW: 1}, report["queued"])
+        self.assertEqual(["2 commands queued > 1"], report["reasons"])
+
+
+if __name__ == "__main__":
+    main()
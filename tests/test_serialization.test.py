@@ -0,0 +1,106 @@
+import json
+from unittest import TestCase, main
+
+from slash_slack import SlashSlack, SlashSlackRequest
+from slash_slack.blocks import _make_block_message
+from slash_slack.serialization import (
+    PreSerializedMessage,
+    _get_default_json_encoder,
+    _stdlib_json_encoder,
+)
+
+SLASH_SLACK_REQUEST = SlashSlackRequest(
+    token="test",
+    team_id="123",
+    team_domain="123",
+    channel_id="1234",
+    channel_name="test",
+    user_id="1234",
+    user_name="John Doe",
+    command="/command",
+    text="a text",
+    response_url="google.com",
+    trigger_id="1239873",
+    api_app_id="2134",
+)
+
+
+class TestSerialization(TestCase):
+    def test_stdlib_json_encoder(self):
+        encoded = _stdlib_json_encoder({"a": [1, "b"]})
+        self.assertEqual(b'{"a":[1,"b"]}', encoded)
+
+    def test_default_json_encoder(self):
+        encoder = _get_default_json_encoder()
+        self.assertEqual({"a": "ü"}, json.loads(encoder({"a": "ü"})))
+
+    def test_pre_serialized_message(self):
+        message = PreSerializedMessage(_stdlib_json_encoder)
+        for text in ["plain", 'quotes " and \\ backslashes', "new\nline", "ü"]:
+            self.assertEqual(
+                _make_block_message(text, visible_in_channel=False),
+                json.loads(message.render(text)),
+            )
+
+    def test_pre_serialized_message_visible(self):
+        message = PreSerializedMessage(_stdlib_json_encoder, visible_in_channel=True)
+        self.assertEqual(
+            _make_block_message("text", visible_in_channel=True),
+            json.loads(message.render("text")),
+        )
+
+    def test_acknowledge_response(self):
+        slash = SlashSlack(dev=True, acknowledge_response="global")
+
+        @slash.command("a")
+        def a():
+            pass
+
+        @slash.command("b", acknowledge_response="command")
+        def b():
+            pass
+
+        self.assertEqual(
+            _make_block_message("global", visible_in_channel=False),
+            json.loads(slash.make_success_acknowledge_response("a").body),
+        )
+        self.assertEqual(
+            _make_block_message("command", visible_in_channel=False),
+            json.loads(slash.make_success_acknowledge_response("b").body),
+        )
+
+    def test_no_acknowledge_response(self):
+        slash = SlashSlack(dev=True)
+        self.assertEqual(201, slash.make_success_acknowledge_response("a").status_code)
+
+    def test_custom_json_encoder(self):
+        calls = []
+
+        def encoder(obj):
+            calls.append(obj)
+            return _stdlib_json_encoder(obj)
+
+        slash = SlashSlack(dev=True, acknowledge_response="ack", json_encoder=encoder)
+        self.assertTrue(
+            _make_block_message("ack", visible_in_channel=False) in calls,
+        )
+
+    def test_global_help_cache_invalidated(self):
+        slash = SlashSlack(dev=True)
+
+        @slash.command("a")
+        def a():
+            pass
+
+        body = slash._global_help_body(SLASH_SLACK_REQUEST)
+        self.assertIs(body, slash._global_help_body(SLASH_SLACK_REQUEST))
+
+        @slash.command("b")
+        def b():
+            pass
+
+        self.assertIn(b"`b`", slash._global_help_body(SLASH_SLACK_REQUEST))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,52 @@
+import asyncio
+from time import time
 from unittest import TestCase, main
+from urllib.parse import urlencode
 
-from fastapi import FastAPI
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Request
 
 from slash_slack import SlashSlack
 from slash_slack.exceptions import NoSigningSecretException
+from slash_slack.signature_verifier import SignatureVerifier
+
+from helpers import REQUEST_PARAMS
+
+
+def _make_chunked_request(chunks, headers) -> tuple:
+    """
+    Returns a request which receives the body in `chunks` and the list of chunks received so far.
+    """
+    received = []
+
+    async def receive():
+        chunk = chunks[len(received)]
+        received.append(chunk)
+        return {
+            "type": "http.request",
+            "body": chunk,
+            "more_body": len(received) < len(chunks),
+        }
+
+    request = Request(
+        {
+            "type": "http",
+            "method": "POST",
+            "headers": [(k.encode(), v.encode()) for k, v in headers.items()],
+            "path": "/slash_slack",
+        },
+        receive,
+    )
+    return request, received
+
+
+def _signed_headers(body: bytes, secret: str = "secret") -> dict:
+    timestamp = str(int(time()))
+    return {
+        "x-slack-request-timestamp": timestamp,
+        "x-slack-signature": SignatureVerifier(secret).generate_signature(
+            timestamp=timestamp, body=body
+        ),
+    }
 
 
 class TestSlashSlack(TestCase):
@@ -41,6 +84,68 @@ class TestSlashSlack(TestCase):
         slash = SlashSlack(dev=True)
         self.assertTrue(isinstance(slash.get_fast_api(), FastAPI))
 
+    def test_signed_chunked_body(self):
+        slash = SlashSlack(signing_secret="secret")
+
+        @slash.command("echo")
+        def echo(s: str):
+            return s
+
+        body = urlencode({**REQUEST_PARAMS, "text": "help"}).encode()
+        chunks = [body[:10], body[10:100], body[100:]]
+
+        async def run(headers):
+            request, received = _make_chunked_request(chunks, headers)
+            response = await slash._acknowledge(request, BackgroundTasks(), None)
+            return response, received
+
+        response, received = asyncio.run(run(_signed_headers(body)))
+        self.assertEqual(200, response.status_code)
+        self.assertIn(b"echo", response.body)
+        self.assertEqual(3, len(received))
+
+        headers = _signed_headers(body, secret="wrong")
+        with self.assertRaises(HTTPException) as e:
+            asyncio.run(run(headers))
+        self.assertEqual(403, e.exception.status_code)
+
+    def test_missing_signature_headers_not_read(self):
+        slash = SlashSlack(signing_secret="secret")
+        timestamp = str(int(time()))
+        for headers in [
+            {},
+            {"x-slack-request-timestamp": timestamp},
+            {"x-slack-signature": "v0=abc"},
+            {"x-slack-request-timestamp": "abc", "x-slack-signature": "v0=abc"},
+            {"x-slack-request-timestamp": "1000", "x-slack-signature": "v0=abc"},
+        ]:
+            request, received = _make_chunked_request([b"a=b"], headers)
+            with self.assertRaises(HTTPException) as e:
+                asyncio.run(slash._acknowledge(request, BackgroundTasks(), None))
+            self.assertEqual(403, e.exception.status_code)
+            self.assertEqual([], received)
+
+    def test_max_body_size(self):
+        slash = SlashSlack(dev=True, max_body_size=100)
+        request, received = _make_chunked_request([b"a" * 60] * 5, {})
+        with self.assertRaises(HTTPException) as e:
+            asyncio.run(slash._acknowledge(request, BackgroundTasks(), None))
+        self.assertEqual(413, e.exception.status_code)
+        self.assertEqual(2, len(received))
+
+        request, received = _make_chunked_request(
+            [b"a" * 60], {"content-length": "101"}
+        )
+        with self.assertRaises(HTTPException) as e:
+            asyncio.run(slash._acknowledge(request, BackgroundTasks(), None))
+        self.assertEqual(413, e.exception.status_code)
+        self.assertEqual([], received)
+
+        slash = SlashSlack(dev=True, max_body_size=None)
+        request, received = _make_chunked_request([b"a" * 60] * 5, {})
+        asyncio.run(slash._acknowledge(request, BackgroundTasks(), None))
+        self.assertEqual(5, len(received))
+
 
 if __name__ == "__main__":
     main()
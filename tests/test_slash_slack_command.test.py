@@ -1,6 +1,15 @@
 from unittest import TestCase, main
 
-from slash_slack import Flag, Float, Int, SlashSlackRequest, String, UnknownLengthList
+from slash_slack import (
+    Flag,
+    Float,
+    Int,
+    Option,
+    Regex,
+    SlashSlackRequest,
+    String,
+    UnknownLengthList,
+)
 from slash_slack.slash_slack_command import SlashSlackCommand
 
 
@@ -32,6 +41,10 @@ def g(s: str, fl=Flag(), i=Int()):
     pass
 
 
+def h(q: str, limit=Option(Int(), default=10), sort=Option(), verbose=Flag()):
+    pass
+
+
 SLASH_SLACK_REQUEST = SlashSlackRequest(
     token="test",
     team_id="123",
@@ -111,6 +124,66 @@ class TestSlashSlackCommand(TestCase):
         parsed_args = command.parse_args("a b")
         self.assertEqual(["a", ["b"]], parsed_args)
 
+    def test_parse_args_unknown_length_list_array(self):
+        command = SlashSlackCommand(
+            command="test",
+            func=d,
+            flags=[],
+            args_type=[
+                ("s", String(), 0),
+                ("u", UnknownLengthList(arg_type=Int(), array=True), 1),
+            ],
+            request_arg=None,
+        )
+        parsed_args = command.parse_args("test 1 2 3")
+        self.assertEqual("test", parsed_args[0])
+        self.assertEqual([1, 2, 3], [int(x) for x in parsed_args[1]])
+
+        parsed_args = command.parse_args("test 1 b 3")
+        self.assertEqual(None, parsed_args)
+
+    def test_parse_args_regex(self):
+        command = SlashSlackCommand(
+            command="test",
+            func=b,
+            flags=[],
+            args_type=[
+                ("s", Regex(r"(?P<project>[A-Z]+)-(?P<number>[0-9]+)", groups=True), 0),
+                ("i", String(regex=r"[a-z]+"), 1),
+                ("f", Float(), 2),
+            ],
+            request_arg=None,
+        )
+        parsed_args = command.parse_args("ABC-1 abc 2.0")
+        self.assertEqual([{"project": "ABC", "number": "1"}, "abc", 2.0], parsed_args)
+
+        self.assertEqual(None, command.parse_args("ABC abc 2.0"))
+        self.assertEqual(None, command.parse_args("ABC-1 ABC 2.0"))
+
+    def test_parse_args_quoted(self):
+        command = SlashSlackCommand(
+            command="test",
+            func=b,
+            flags=[],
+            args_type=[("s", String(), 0), ("i", Int(), 1), ("f", Float(), 2)],
+            request_arg=None,
+        )
+        parsed_args = command.parse_args("\"a multi word arg\" 1 '2.0'")
+        self.assertEqual(["a multi word arg", 1, 2.0], parsed_args)
+
+        command = SlashSlackCommand(
+            command="test",
+            func=d,
+            flags=[],
+            args_type=[
+                ("s", String(), 0),
+                ("u", UnknownLengthList(arg_type=String()), 1),
+            ],
+            request_arg=None,
+        )
+        parsed_args = command.parse_args("“first arg” b ‘c d’")
+        self.assertEqual(["first arg", ["b", "c d"]], parsed_args)
+
     def test_parse_args_empty(self):
         command = SlashSlackCommand(
             command="test",
@@ -197,6 +270,83 @@ class TestSlashSlackCommand(TestCase):
         _func_arg = command._hydrate_func_args(["test"], set(), SLASH_SLACK_REQUEST)
         self.assertEqual(["test", SLASH_SLACK_REQUEST], _func_arg)
 
+    def _option_command(self) -> SlashSlackCommand:
+        return SlashSlackCommand(
+            command="test",
+            func=h,
+            flags=[
+                ("limit", Option(Int(), default=10), 1),
+                ("sort", Option(), 2),
+                ("verbose", Flag(), 3),
+            ],
+            args_type=[("q", String(), 0)],
+            request_arg=None,
+        )
+
+    def test_extract_options(self):
+        command = self._option_command()
+        self.assertEqual(["limit", "sort"], [o[0] for o in command.options])
+
+        text, options = command.extract_options("foo --limit=50")
+        self.assertEqual("foo", text.strip())
+        self.assertEqual([50, None], options)
+
+        text, options = command.extract_options("--limit 5 foo --verbose")
+        self.assertEqual(["foo", "--verbose"], text.split())
+        self.assertEqual([5, None], options)
+
+        text, options = command.extract_options('foo --sort "most recent"')
+        self.assertEqual("foo", text.strip())
+        self.assertEqual([10, "most recent"], options)
+
+        text, options = command.extract_options('foo --sort="most recent"')
+        self.assertEqual("foo", text)
+        self.assertEqual([10, "most recent"], options)
+
+        text, options = command.extract_options('"--limit 5" foo')
+        self.assertEqual('"--limit 5" foo', text)
+        self.assertEqual([10, None], options)
+
+        text, options = command.extract_options("foo --other=1")
+        self.assertEqual("foo --other=1", text)
+        self.assertEqual([10, None], options)
+
+        self.assertIsNone(command.extract_options("foo --limit=abc")[1])
+        self.assertIsNone(command.extract_options("foo --limit")[1])
+        self.assertIsNone(command.extract_options("foo --limit --verbose")[1])
+
+    def test_parse_args_options(self):
+        command = self._option_command()
+        self.assertEqual(["foo", 10, None], command.parse_args("foo"))
+        self.assertEqual(["foo", 5, "new"], command.parse_args("foo", [5, "new"]))
+
+    def test_parse_args_lone_string_quoted(self):
+        command = self._option_command()
+        self.assertEqual(["x y", 10, None], command.parse_args('"x y"'))
+        self.assertEqual(['x "y"', 10, None], command.parse_args("'x \"y\"'"))
+        self.assertEqual(['"x" y', 10, None], command.parse_args('"x" y'))
+        self.assertEqual(['"x y', 10, None], command.parse_args('"x y'))
+
+    def test_hydrate_func_args_options(self):
+        command = self._option_command()
+        _func_arg = command._hydrate_func_args(
+            ["foo", 5, "new"], {"verbose"}, SLASH_SLACK_REQUEST
+        )
+        self.assertEqual(["foo", 5, "new", True], _func_arg)
+
+        _func_arg = command._hydrate_func_args(
+            ["foo", 10, None], set(), SLASH_SLACK_REQUEST
+        )
+        self.assertEqual(["foo", 10, None, False], _func_arg)
+
+    def test_option_help(self):
+        command = self._option_command()
+        self.assertIn("`[--limit=int]`", command._generate_command_signature())
+        flag_help = command._generate_flag_help()
+        self.assertIn("`--limit=<", flag_help)
+        self.assertIn("(default: `10`)", flag_help)
+        self.assertIn("`--verbose`", flag_help)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,64 @@
+import time
+from unittest import TestCase, main
+
+from slash_slack.tokenizer import _tokenize, _tokenize_spans
+
+
+class TestTokenize(TestCase):
+    def test_unquoted(self):
+        self.assertEqual([], _tokenize(""))
+        self.assertEqual([], _tokenize("   "))
+        self.assertEqual(["a", "b", "c"], _tokenize(" a b   c "))
+        self.assertEqual(["a", "b", "c"], _tokenize("a\nb\tc"))
+
+    def test_double_quotes(self):
+        self.assertEqual(["a", "b c", "d"], _tokenize('a "b c" d'))
+        self.assertEqual(["a", "", "b"], _tokenize('a "" b'))
+        self.assertEqual(["b  c"], _tokenize('"b  c"'))
+
+    def test_single_quotes(self):
+        self.assertEqual(["a", "b c"], _tokenize("a 'b c'"))
+        self.assertEqual(['say "hi"'], _tokenize("'say \"hi\"'"))
+
+    def test_smart_quotes(self):
+        self.assertEqual(["b c", "d"], _tokenize("“b c” d"))
+        self.assertEqual(["b c", "d"], _tokenize("‘b c’ d"))
+        self.assertEqual(["it’s", "a b"], _tokenize("it’s ‘a b’"))
+
+    def test_apostrophes(self):
+        self.assertEqual(["don't", "stop"], _tokenize("don't stop"))
+        self.assertEqual(["it's", "bob's"], _tokenize("it's bob's"))
+        self.assertEqual(["it's a", "b"], _tokenize("'it's a' b"))
+
+    def test_escapes(self):
+        self.assertEqual(["a b", "c"], _tokenize("a\\ b c"))
+        self.assertEqual(['"hi"'], _tokenize('\\"hi\\"'))
+        self.assertEqual(['a"b'], _tokenize('"a\\"b"'))
+        self.assertEqual(["a\\b"], _tokenize('"a\\\\b"'))
+        self.assertEqual(["C:\\path\\to"], _tokenize("C:\\path\\to"))
+
+    def test_unclosed_quote(self):
+        self.assertEqual(['"a', "b"], _tokenize('"a b'))
+        self.assertEqual(["x", "'a", "b c"], _tokenize('x \'a "b c"'))
+        self.assertEqual(['a"b c'], _tokenize('"a"b c"'))
+
+    def test_flags_are_args_when_quoted(self):
+        self.assertEqual(["--visible"], _tokenize('"--visible"'))
+
+    def test_spans(self):
+        self.assertEqual(
+            [("a", 0, 1), ("b c", 2, 7), ("d", 9, 10)],
+            _tokenize_spans('a "b c"  d'),
+        )
+        self.assertEqual([("a", 1, 2)], _tokenize_spans(" a "))
+
+    def test_unclosed_quotes_are_linear(self):
+        # Each arg opens a quote which is never closed, the text must not be rescanned for every arg.
+        text = '"x ' * 20000
+        start = time.perf_counter()
+        self.assertEqual(['"x'] * 20000, _tokenize(text))
+        self.assertLess(time.perf_counter() - start, 1)
+
+
+if __name__ == "__main__":
+    main()
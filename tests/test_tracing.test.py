@@ -0,0 +1,79 @@
+import asyncio
+from unittest import TestCase, main
+
+from fastapi import BackgroundTasks
+
+from slash_slack import SlashSlack
+from slash_slack.tracing import InMemoryTracer, _trace
+
+from helpers import _capture_deliveries, _make_request, _send
+
+
+class TestTracing(TestCase):
+    def test_noop_when_disabled(self):
+        self.assertIs(_trace(None, "a"), _trace(None, "b"))
+        with _trace(None, "a") as span:
+            self.assertIsNone(span)
+
+    def test_span_records_error(self):
+        tracer = InMemoryTracer()
+
+        def t():
+            with _trace(tracer, "a"):
+                raise ValueError()
+
+        self.assertRaises(ValueError, t)
+        self.assertTrue(isinstance(tracer.spans[0].error, ValueError))
+        self.assertIsNotNone(tracer.spans[0].duration)
+
+    def test_acknowledge_and_execute_spans(self):
+        tracer = InMemoryTracer()
+        slash = SlashSlack(dev=True, tracer=tracer)
+        hook_calls = []
+        slash.add_before_request_function(hook_calls.append)
+
+        @slash.command("echo")
+        def echo(s: str):
+            return s
+
+        delivered = _capture_deliveries(slash)
+        _send(slash, "echo hello")
+        self.assertEqual(["hello"], delivered)
+        self.assertEqual(1, len(hook_calls))
+        self.assertEqual(
+            [
+                "slash_slack.acknowledge",
+                "read_body",
+                "form_decode",
+                "model_validation",
+                "parse_command_text",
+                "parse_args",
+                "before_request_function",
+                "slash_slack.execute",
+                "queue_wait",
+                "function_execution",
+                "delivery",
+            ],
+            tracer.span_names(),
+        )
+        (acknowledge,) = tracer.get_spans("slash_slack.acknowledge")
+        (execute,) = tracer.get_spans("slash_slack.execute")
+        self.assertIs(acknowledge, execute.parent)
+        self.assertIs(execute, tracer.get_spans("function_execution")[0].parent)
+        for span in tracer.spans:
+            self.assertIsNotNone(span.end)
+
+    def test_signature_verification_span(self):
+        tracer = InMemoryTracer()
+        slash = SlashSlack(signing_secret="secret", tracer=tracer)
+
+        async def run():
+            await slash._acknowledge(_make_request("echo"), BackgroundTasks(), None)
+
+        self.assertRaises(Exception, asyncio.run, run())
+        (span,) = tracer.get_spans("signature_verification")
+        self.assertIsNotNone(span.error)
+
+
+if __name__ == "__main__":
+    main()
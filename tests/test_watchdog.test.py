@@ -0,0 +1,77 @@
+import asyncio
+import time
+from unittest import TestCase, main
+
+from fastapi import BackgroundTasks
+
+from slash_slack import SlashSlack
+from slash_slack.hooks import BEFORE_ACK
+from slash_slack.watchdog import UNKNOWN, LoopWatchdog
+
+from helpers import _capture_deliveries, _make_request
+
+
+def _make_blocking_app():
+    slash = SlashSlack(dev=True, watchdog=LoopWatchdog(threshold=0.05))
+
+    @slash.command("block")
+    def block():
+        time.sleep(0.2)
+        return "done"
+
+    @slash.command("fine")
+    async def fine():
+        await asyncio.sleep(0.2)
+        return "done"
+
+    async def check_user(slash_slack_request):
+        time.sleep(0.2)
+
+    slash.add_before_request_function(check_user, phase=BEFORE_ACK)
+
+    _capture_deliveries(slash)
+    return slash
+
+
+class TestWatchdog(TestCase):
+    def test_attributes_stalls(self):
+        slash = _make_blocking_app()
+
+        async def run():
+            async with slash._lifespan(slash.app):
+                for text in ("block", "fine"):
+                    background_tasks = BackgroundTasks()
+                    await slash._acknowledge(
+                        _make_request(text), background_tasks, None
+                    )
+                    await background_tasks()
+                    await asyncio.sleep(0.1)
+
+        with self.assertLogs("slash_slack", level="WARNING") as logs:
+            asyncio.run(run())
+        report = slash.watchdog.report()
+        self.assertEqual(
+            {"command block", "before request function check_user"}, set(report)
+        )
+        self.assertEqual(1, report["command block"]["stalls"])
+        self.assertEqual(2, report["before request function check_user"]["stalls"])
+        self.assertGreater(report["command block"]["max_duration"], 0.1)
+        self.assertIn("time.sleep(0.2)", "".join(report["command block"]["last_stack"]))
+        output = "\n".join(logs.output)
+        self.assertIn("The event loop has been blocked", output)
+        self.assertIn("by command block:", output)
+
+    def test_unknown(self):
+        watchdog = LoopWatchdog()
+        label, stack = watchdog._attribute(None)
+        self.assertEqual(UNKNOWN, label)
+        self.assertEqual([], stack)
+        import sys
+
+        label, stack = watchdog._attribute(sys._getframe())
+        self.assertEqual(UNKNOWN, label)
+        self.assertIn("test_unknown", "".join(stack))
+
+
+if __name__ == "__main__":
+    main()